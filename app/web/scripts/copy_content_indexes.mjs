@@ -11,7 +11,7 @@ fs.mkdirSync(dstDir, { recursive: true });
 
 const files = fs
   .readdirSync(srcDir)
-  .filter((name) => name.endsWith('.json'))
+  .filter((name) => name.endsWith('.json') || name.endsWith('.jsonl'))
   .filter((name) => {
     try {
       return fs.statSync(path.join(srcDir, name)).isFile();
@@ -11,6 +11,15 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.lib import content  # type: ignore
+from scripts.lib.audit_runner import (  # type: ignore
+    audit_changed_claims, default_jobs, latest_report, rules_version, run_audit, same_findings,
+)
+from scripts.lib.claims import claim_fingerprint, inherited_grade  # type: ignore
+from scripts.lib.phrase_matcher import PhraseMatcher, hit_in_window  # type: ignore
+
 PEPTIDES_DIR = REPO_ROOT / "content" / "peptides"
 REPORTS_DIR = REPO_ROOT / "scripts" / "audit" / "_reports"
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -60,6 +69,13 @@ ALLOWLIST_NEAR_ASSERTIVE = [
 
 WINDOW_CHARS = 80  # context window around match for reporting
 
+# Rule sets compiled once; each claim text is scanned once per set.
+ASSERTIVE_MATCHER = PhraseMatcher(ASSERTIVE_VERBS, words=True)
+MEDICALIZED_MATCHER = PhraseMatcher(MEDICALIZED_PHRASES)
+HEDGING_MATCHER = PhraseMatcher(HEDGING_CUES)
+ALLOWLIST_MATCHER = PhraseMatcher(ALLOWLIST_NEAR_ASSERTIVE)
+EXPOSURE_IMPERATIVE_MATCHER = PhraseMatcher(["should", "must", "take", "inject", "use", "start"], words=True)
+
 @dataclass
 class Finding:
     peptide_slug: str
@@ -73,10 +89,10 @@ class Finding:
     snippet: str
 
 def load_json(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return content.load_json(path)
 
 def iter_peptide_files() -> List[Path]:
-    return sorted([p for p in PEPTIDES_DIR.glob("*.json") if p.name not in ("_index.json", "_search_index.json")])
+    return content.list_peptide_files()
 
 def normalize_text(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "")).strip()
@@ -84,34 +100,20 @@ def normalize_text(s: str) -> str:
 def evidence_rank(grade: str) -> int:
     return EVIDENCE_RANK.get((grade or "unknown").strip(), 0)
 
-def contains_any(text: str, needles: List[str]) -> Optional[str]:
-    t = text.lower()
-    for n in needles:
-        if n in t:
-            return n
-    return None
-
 def find_assertive_hits(text: str) -> List[Tuple[str, int]]:
-    hits = []
-    t = text.lower()
-    for v in ASSERTIVE_VERBS:
-        for m in re.finditer(r"\b" + re.escape(v) + r"\b", t):
-            hits.append((v, m.start()))
-    return hits
-
-def has_hedge_near(text: str, pos: int) -> bool:
-    t = text.lower()
-    lo = max(0, pos - WINDOW_CHARS)
-    hi = min(len(t), pos + WINDOW_CHARS)
-    win = t[lo:hi]
-    return any(h in win for h in HEDGING_CUES)
+    # (verb, position) grouped by verb in ASSERTIVE_VERBS order
+    return [(h.pattern, h.start) for h in sorted(ASSERTIVE_MATCHER.hits(text))]
 
-def allowlisted_context(text: str, pos: int) -> bool:
-    t = text.lower()
-    lo = max(0, pos - WINDOW_CHARS)
-    hi = min(len(t), pos + WINDOW_CHARS)
-    win = t[lo:hi]
-    return any(a in win for a in ALLOWLIST_NEAR_ASSERTIVE)
+def _window(text: str, pos: int) -> Tuple[int, int]:
+    return max(0, pos - WINDOW_CHARS), min(len(text.lower()), pos + WINDOW_CHARS)
+
+def has_hedge_near(text: str, pos: int, hits=None) -> bool:
+    hits = HEDGING_MATCHER.hits(text) if hits is None else hits
+    return hit_in_window(hits, *_window(text, pos))
+
+def allowlisted_context(text: str, pos: int, hits=None) -> bool:
+    hits = ALLOWLIST_MATCHER.hits(text) if hits is None else hits
+    return hit_in_window(hits, *_window(text, pos))
 
 def snippet_around(text: str, pos: int) -> str:
     t = normalize_text(text)
@@ -133,7 +135,8 @@ def extract_claims(doc: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
                     out.append((section_name, c))
     return out
 
-def audit_peptide(path: Path) -> List[Finding]:
+def audit_peptide(path: Path, only: Optional[set] = None) -> List[Finding]:
+    """Findings for one peptide; with `only`, just the claims whose fingerprint is in it."""
     doc = load_json(path)
     pep = doc.get("peptide", {}) or {}
     slug = path.stem
@@ -141,17 +144,23 @@ def audit_peptide(path: Path) -> List[Finding]:
 
     findings: List[Finding] = []
     claims = extract_claims(doc)
+    grade = inherited_grade(doc)
 
     for section_name, claim in claims:
+        if only is not None and claim_fingerprint(section_name, claim, grade) not in only:
+            continue
         text = normalize_text(claim.get("text", ""))
         title = normalize_text(claim.get("title", "")) or normalize_text(claim.get("claim_type", "")) or section_name
         eg = (claim.get("evidence_grade") or pep.get("risk", {}).get("evidence_grade") or "unknown").strip()
 
         # Rule C1: Low evidence claims should not read as established efficacy
         if evidence_rank(eg) <= LOW_EVIDENCE_MAX and text:
-            for verb, pos in find_assertive_hits(text):
+            assertive = find_assertive_hits(text)
+            allow_hits = ALLOWLIST_MATCHER.hits(text) if assertive else []
+            hedge_hits = HEDGING_MATCHER.hits(text) if assertive else []
+            for verb, pos in assertive:
                 # If there is explicit contextual framing near the verb, downgrade/ignore
-                if allowlisted_context(text, pos) or has_hedge_near(text, pos):
+                if allowlisted_context(text, pos, allow_hits) or has_hedge_near(text, pos, hedge_hits):
                     continue
                 findings.append(Finding(
                     peptide_slug=slug,
@@ -167,8 +176,9 @@ def audit_peptide(path: Path) -> List[Finding]:
 
         # Rule C2: Medicalized phrases are always flagged unless clearly negated
         if text:
-            mp = contains_any(text, MEDICALIZED_PHRASES)
-            if mp:
+            mp_hit = MEDICALIZED_MATCHER.first(text)
+            if mp_hit:
+                mp = mp_hit.pattern
                 findings.append(Finding(
                     peptide_slug=slug,
                     canonical_name=cname,
@@ -178,13 +188,13 @@ def audit_peptide(path: Path) -> List[Finding]:
                     rule_id="7C.C2_MEDICALIZED_LANGUAGE",
                     severity="warning",
                     message=f"Medicalized phrase '{mp}' found. Ensure language is descriptive and evidence-bounded.",
-                    snippet=snippet_around(text, text.lower().find(mp)),
+                    snippet=snippet_around(text, mp_hit.start),
                 ))
 
         # Rule C3: Observed exposure must stay non-instructional (extra guard)
         if section_name == "observed_exposure_ranges" and text:
             # If text contains imperative phrasing, flag
-            if re.search(r"\b(should|must|take|inject|use|start)\b", text.lower()):
+            if EXPOSURE_IMPERATIVE_MATCHER.search(text):
                 findings.append(Finding(
                     peptide_slug=slug,
                     canonical_name=cname,
@@ -203,32 +213,40 @@ def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--write", action="store_true", help="Write timestamped report JSON to scripts/audit/_reports/")
     ap.add_argument("--strict", action="store_true", help="Exit non-zero if any warnings found (CI-ready)")
+    ap.add_argument("--jobs", type=int, default=default_jobs(), help="Worker processes for files that need re-auditing")
+    ap.add_argument("--no-cache", action="store_true", help="Re-audit every file (the run is still recorded for the next diff)")
+    ap.add_argument("--changed-claims", nargs="?", const="", metavar="CLAIMS_INDEX",
+                    help="Audit only claims changed since a claim index (default: the committed content/_index/claims_v1.json); no report")
     args = ap.parse_args()
 
+    if args.changed_claims is not None:
+        delta, changed_findings = audit_changed_claims(audit_peptide, Path(args.changed_claims) if args.changed_claims else None)
+        n_claims = sum(len(v) for v in delta.changed.values())
+        print(f"Evidence-language audit (changed claims): peptides={len(delta.changed)} claims={n_claims} findings={len(changed_findings)}")
+        for f in changed_findings:
+            print(f" - {f['peptide_slug']} {f['rule_id']}: {f['message']}")
+        return 2 if args.strict and changed_findings else 0
+
     peptide_files = iter_peptide_files()
-    all_findings: List[Finding] = []
-    for p in peptide_files:
-        all_findings.extend(audit_peptide(p))
+    # Findings are cached per file (content hash + rule-set version) and diffed against the last run.
+    run = run_audit(
+        "evidence_language", peptide_files, audit_peptide, rules_version(Path(__file__)),
+        jobs=args.jobs, use_cache=not args.no_cache,
+    )
+    all_findings = run.findings
+
+    # A written report diffs against the last written report, not the last (cached) run.
+    prev = latest_report(REPORTS_DIR, "evidence_language_audit_v1") if args.write else None
+    if args.write:
+        run.rebase(prev)
 
     report = {
         "schema_version": "evidence_language_audit_v1",
         "timestamp": datetime.now().strftime("%Y-%m-%d_%H%M%S"),
         "peptide_count": len(peptide_files),
         "finding_count": len(all_findings),
-        "findings": [
-            {
-                "peptide_slug": f.peptide_slug,
-                "canonical_name": f.canonical_name,
-                "section": f.section,
-                "claim_title": f.claim_title,
-                "evidence_grade": f.evidence_grade,
-                "rule_id": f.rule_id,
-                "severity": f.severity,
-                "message": f.message,
-                "snippet": f.snippet,
-            }
-            for f in all_findings
-        ],
+        "findings": all_findings,
+        "diff": run.diff_doc(),
     }
 
     # Print summary
@@ -236,15 +254,21 @@ def main() -> int:
     if all_findings:
         by_rule: Dict[str, int] = {}
         for f in all_findings:
-            by_rule[f.rule_id] = by_rule.get(f.rule_id, 0) + 1
+            by_rule[f["rule_id"]] = by_rule.get(f["rule_id"], 0) + 1
         print("Findings by rule:")
         for k in sorted(by_rule.keys()):
             print(f" - {k}: {by_rule[k]}")
+    print(f"Changes: {run.summary()}")
+    for line in run.diff_lines():
+        print(f"  {line}")
 
     if args.write:
-        outp = REPORTS_DIR / f"{report['timestamp']}.json"
-        outp.write_text(json.dumps(report, indent=2), encoding="utf-8")
-        print(f"Wrote report: {outp}")
+        if same_findings(prev, all_findings):
+            print(f"Report unchanged since {prev['timestamp']}; not written")
+        else:
+            outp = REPORTS_DIR / f"{report['timestamp']}.json"
+            outp.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            print(f"Wrote report: {outp}")
 
     if args.strict and all_findings:
         return 2
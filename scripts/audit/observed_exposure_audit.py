@@ -4,12 +4,22 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.lib import content  # type: ignore
+from scripts.lib.audit_runner import (  # type: ignore
+    audit_changed_claims, default_jobs, latest_report, rules_version, run_audit, same_findings,
+)
+from scripts.lib.claims import claim_fingerprint, inherited_grade  # type: ignore
+from scripts.lib.phrase_matcher import PhraseMatcher  # type: ignore
+
 PEPTIDES_DIR = REPO_ROOT / "content" / "peptides"
 REPORTS_DIR = REPO_ROOT / "scripts" / "audit" / "_reports"
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -32,6 +42,11 @@ PROTOCOLISH_PATTERNS = [
     r"\b(\d+)\s*(weeks?|days?)\s*off\b",
 ]
 
+# Rule sets compiled once; each text is scanned once per set.
+DISCLAIMER_MATCHER = PhraseMatcher(DISCLAIMER_REQUIRED_SUBSTRINGS)
+IMPERATIVE_MATCHER = PhraseMatcher(IMPERATIVE_WORDS, words=True)
+PROTOCOLISH_MATCHER = PhraseMatcher(PROTOCOLISH_PATTERNS, regex=True)
+
 @dataclass
 class Finding:
     peptide_slug: str
@@ -42,29 +57,29 @@ class Finding:
     snippet: str
 
 def load_json(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return content.load_json(path)
 
 def iter_peptide_files() -> List[Path]:
-    return sorted([p for p in PEPTIDES_DIR.glob("*.json") if p.name not in ("_index.json", "_search_index.json")])
+    return content.list_peptide_files()
 
 def norm(s: Any) -> str:
     return re.sub(r"\s+", " ", str(s or "")).strip()
 
 def has_disclaimer(text: str) -> bool:
-    t = text.lower()
-    return all(x in t for x in DISCLAIMER_REQUIRED_SUBSTRINGS)
+    return len(DISCLAIMER_MATCHER.found(text)) == len(DISCLAIMER_REQUIRED_SUBSTRINGS)
 
 def contains_imperative(text: str) -> str | None:
-    t = text.lower()
-    for w in IMPERATIVE_WORDS:
-        if re.search(r"\b" + re.escape(w) + r"\b", t):
-            return w
-    for pat in PROTOCOLISH_PATTERNS:
-        if re.search(pat, t):
-            return f"pattern:{pat}"
+    # First word in IMPERATIVE_WORDS order, then first pattern in PROTOCOLISH_PATTERNS order.
+    hit = IMPERATIVE_MATCHER.first(text)
+    if hit is not None:
+        return hit.pattern
+    hit = PROTOCOLISH_MATCHER.first(text)
+    if hit is not None:
+        return f"pattern:{hit.pattern}"
     return None
 
-def audit_one(path: Path) -> List[Finding]:
+def audit_one(path: Path, only: Optional[set] = None) -> List[Finding]:
+    """Findings for one peptide; with `only`, just the ranges whose claim fingerprint is in it."""
     doc = load_json(path)
     pep = doc.get("peptide", {}) or {}
     slug = path.stem
@@ -76,10 +91,13 @@ def audit_one(path: Path) -> List[Finding]:
 
     if not isinstance(ranges, list):
         return findings
+    grade = inherited_grade(doc)
 
     for i, r in enumerate(ranges):
         if not isinstance(r, dict):
             continue
+        if only is not None and claim_fingerprint("observed_exposure_ranges", r, grade) not in only:
+            continue
 
         unit = norm(r.get("unit"))
         minv = r.get("min", None)
@@ -174,37 +192,54 @@ def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--write", action="store_true", help="Write timestamped report JSON to scripts/audit/_reports/")
     ap.add_argument("--strict", action="store_true", help="Exit non-zero if any warnings found")
+    ap.add_argument("--jobs", type=int, default=default_jobs(), help="Worker processes for files that need re-auditing")
+    ap.add_argument("--no-cache", action="store_true", help="Re-audit every file (the run is still recorded for the next diff)")
+    ap.add_argument("--changed-claims", nargs="?", const="", metavar="CLAIMS_INDEX",
+                    help="Audit only claims changed since a claim index (default: the committed content/_index/claims_v1.json); no report")
     args = ap.parse_args()
 
+    if args.changed_claims is not None:
+        delta, changed_findings = audit_changed_claims(audit_one, Path(args.changed_claims) if args.changed_claims else None)
+        n_claims = sum(len(v) for v in delta.changed.values())
+        print(f"Observed-exposure audit (changed claims): peptides={len(delta.changed)} claims={n_claims} findings={len(changed_findings)}")
+        for f in changed_findings:
+            print(f" - {f['peptide_slug']} {f['rule_id']}: {f['message']}")
+        return 2 if args.strict and changed_findings else 0
+
     peptide_files = iter_peptide_files()
-    findings: List[Finding] = []
-    for p in peptide_files:
-        findings.extend(audit_one(p))
+    # Findings are cached per file (content hash + rule-set version) and diffed against the last run.
+    run = run_audit(
+        "observed_exposure", peptide_files, audit_one, rules_version(Path(__file__)),
+        jobs=args.jobs, use_cache=not args.no_cache,
+    )
+    findings = run.findings
+
+    # A written report diffs against the last written report, not the last (cached) run.
+    prev = latest_report(REPORTS_DIR, "observed_exposure_audit_v1") if args.write else None
+    if args.write:
+        run.rebase(prev)
 
     report = {
         "schema_version": "observed_exposure_audit_v1",
         "timestamp": datetime.now().strftime("%Y-%m-%d_%H%M%S"),
         "peptide_count": len(peptide_files),
         "finding_count": len(findings),
-        "findings": [
-            {
-                "peptide_slug": f.peptide_slug,
-                "canonical_name": f.canonical_name,
-                "rule_id": f.rule_id,
-                "severity": f.severity,
-                "message": f.message,
-                "snippet": f.snippet,
-            }
-            for f in findings
-        ],
+        "findings": findings,
+        "diff": run.diff_doc(),
     }
 
     print(f"Observed-exposure audit: peptides={len(peptide_files)} findings={len(findings)}")
+    print(f"Changes: {run.summary()}")
+    for line in run.diff_lines():
+        print(f"  {line}")
 
     if args.write:
-        outp = REPORTS_DIR / f"{report['timestamp']}_observed_exposure.json"
-        outp.write_text(json.dumps(report, indent=2), encoding="utf-8")
-        print(f"Wrote report: {outp}")
+        if same_findings(prev, findings):
+            print(f"Report unchanged since {prev['timestamp']}; not written")
+        else:
+            outp = REPORTS_DIR / f"{report['timestamp']}_observed_exposure.json"
+            outp.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            print(f"Wrote report: {outp}")
 
     if args.strict and findings:
         return 2
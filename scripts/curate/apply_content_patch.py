@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Apply declarative content patches to peptide documents in one transaction.
+
+Replaces the one-off patch_peptide_placeholders_batchN.py pattern (a hardcoded BATCH list +
+PATCH dict per script, each file loaded, mutated and rewritten on its own, indexes rebuilt
+by hand afterwards).
+
+Patch files (any number, applied in the order given):
+  *.json        {"schema_version": "content_patch_v1", "patches": [PATCH, ...]}  (or a bare list)
+  *.jsonl       one PATCH per line
+  *.yaml|*.yml  same shape as .json (needs PyYAML)
+
+  PATCH = {
+    "slug": "dsip",                                         # content/peptides/<slug>.json
+    "set":          {"practical": {...}, "peptide.sections.overview": [...]},
+    "merge":        {"practical": {"bottom_line": "..."}},  # shallow dict update
+    "set_if_empty": {"practical.benefits": [...]},          # only if missing / blank / [] / {} / curation-pending text
+    "delete":       ["peptide.sections.legacy_notes"]
+  }
+Paths are dot-separated keys with optional [i] list indexes ("peptide.sections.overview[0].title");
+missing intermediate objects are created. Within one patch the operations run in the order
+set, merge, set_if_empty, delete; several patches for one slug compose in file order.
+A "practical" object that ends up without schema_version gets practical_block_v1 (as the batch
+scripts did).
+
+Flow:
+  1. every patch is applied in memory (errors for all slugs are reported together)
+  2. each changed document is checked in memory with the gate validators: peptide JSON
+     (validate_peptide_json), practical block (validate_practical_block_v1) and the PDP
+     content contract (validate_pdp_contract_v1). A patch is rejected when it introduces a
+     failure; failures the document already had are listed but do not block.
+  3. --apply writes all changed documents as one transaction: new contents are staged next
+     to their targets, originals are copied into a rollback journal (scripts/curate/_journal/,
+     untracked), then the targets are replaced. Any error rolls every file back. A journal
+     left by an interrupted run blocks further applies until --recover restores it.
+  4. the index builders whose inputs changed are rerun (rebuild_all_indexes --only builders
+     --keep-going; --no-rebuild skips), then the validation gates (--only validators).
+     The queue-driven generator (generate_from_queue --apply) is left out: it rewrites peptide
+     documents itself, outside this transaction. A failed builder makes the exit status 1
+     (the content is committed either way); validation-gate failures are only reported.
+
+Without --apply nothing is written (dry run: per-slug changed paths + validation).
+
+Usage:
+  python3 scripts/curate/apply_content_patch.py patches/batch33.json
+  python3 scripts/curate/apply_content_patch.py patches/*.jsonl --apply
+  python3 scripts/curate/apply_content_patch.py --recover
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib import content  # type: ignore
+from scripts.validate.validate_pdp_contract_v1 import content_rule_errors  # type: ignore
+from scripts.validate.validate_peptide_json import check_data  # type: ignore
+from scripts.validate.validate_practical_block_v1 import validate_practical  # type: ignore
+
+try:
+    import yaml  # type: ignore
+except ImportError:  # optional: only needed for .yaml/.yml patch files
+    yaml = None
+
+PATCH_SCHEMA = "content_patch_v1"
+OPS = ("set", "merge", "set_if_empty", "delete")
+JOURNAL_DIR = ROOT / "scripts" / "curate" / "_journal"
+MANIFEST = "manifest.json"
+# Content generators the post-apply rebuild must not run (they write peptide documents).
+REBUILD_EXCLUDE = ("--exclude", "scripts/ingest/generate_from_queue.py")
+
+PENDING_RE = re.compile(r"pep-talk curation pending", re.I)
+_PATH_TOKEN = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+
+def die(msg: str, code: int = 1) -> None:
+    print(f"ERROR: {msg}", file=sys.stderr)
+    sys.exit(code)
+
+
+class PatchError(Exception):
+    pass
+
+
+# --- patch files ---
+
+def load_patch_file(p: Path) -> list[dict[str, Any]]:
+    try:
+        text = p.read_text(encoding="utf-8")
+    except OSError as e:
+        raise PatchError(f"{p}: {e}")
+    suffix = p.suffix.lower()
+    try:
+        if suffix == ".jsonl":
+            data: Any = [json.loads(line) for line in text.splitlines() if line.strip()]
+        elif suffix in (".yaml", ".yml"):
+            if yaml is None:
+                raise PatchError(f"{p}: YAML patch files need PyYAML (pip install pyyaml)")
+            data = yaml.safe_load(text)
+        else:
+            data = json.loads(text)
+    except (ValueError, getattr(yaml, "YAMLError", ValueError)) as e:
+        raise PatchError(f"{p}: could not parse ({e})")
+
+    if isinstance(data, dict):
+        if data.get("schema_version") not in (None, PATCH_SCHEMA):
+            raise PatchError(f"{p}: schema_version must be {PATCH_SCHEMA!r}")
+        data = data.get("patches")
+    if not isinstance(data, list):
+        raise PatchError(f"{p}: expected a list of patches")
+
+    out = []
+    for i, patch in enumerate(data):
+        where = f"{p}[{i}]"
+        if not isinstance(patch, dict) or not isinstance(patch.get("slug"), str) or not patch["slug"].strip():
+            raise PatchError(f"{where}: each patch needs a non-empty 'slug'")
+        unknown = sorted(set(patch) - {"slug", *OPS})
+        if unknown:
+            raise PatchError(f"{where}: unknown key(s) {unknown} (allowed: slug, {', '.join(OPS)})")
+        for op in ("set", "merge", "set_if_empty"):
+            if op in patch and not isinstance(patch[op], dict):
+                raise PatchError(f"{where}: '{op}' must map paths to values")
+        if "delete" in patch and not (isinstance(patch["delete"], list) and all(isinstance(x, str) for x in patch["delete"])):
+            raise PatchError(f"{where}: 'delete' must be a list of paths")
+        out.append({**patch, "slug": patch["slug"].strip(), "_where": where})
+    return out
+
+
+# --- path operations ---
+
+def parse_path(path: str) -> list[str | int]:
+    tokens: list[str | int] = []
+    pos = 0
+    for m in _PATH_TOKEN.finditer(path):
+        gap = path[pos:m.start()]
+        if gap not in ("", "."):
+            raise PatchError(f"bad path {path!r}")
+        tokens.append(m.group(1) if m.group(1) is not None else int(m.group(2)))
+        pos = m.end()
+    if not tokens or path[pos:]:
+        raise PatchError(f"bad path {path!r}")
+    return tokens
+
+
+def _parent(doc: Any, tokens: list[str | int], path: str, create: bool) -> Any:
+    cur = doc
+    for tok, nxt in zip(tokens, tokens[1:]):
+        if isinstance(tok, int):
+            if not isinstance(cur, list) or tok >= len(cur):
+                raise PatchError(f"{path}: index [{tok}] out of range")
+            cur = cur[tok]
+            continue
+        if not isinstance(cur, dict):
+            raise PatchError(f"{path}: '{tok}' is not inside an object")
+        if tok not in cur or cur[tok] is None:
+            if not create:
+                return None
+            cur[tok] = [] if isinstance(nxt, int) else {}
+        cur = cur[tok]
+    return cur
+
+
+def _get(parent: Any, key: str | int) -> Any:
+    if isinstance(key, int):
+        return parent[key] if isinstance(parent, list) and key < len(parent) else None
+    return parent.get(key) if isinstance(parent, dict) else None
+
+
+def _put(parent: Any, key: str | int, value: Any, path: str) -> None:
+    if isinstance(key, int):
+        if not isinstance(parent, list):
+            raise PatchError(f"{path}: [{key}] is not a list index")
+        if key == len(parent):
+            parent.append(value)
+        elif key < len(parent):
+            parent[key] = value
+        else:
+            raise PatchError(f"{path}: index [{key}] out of range")
+    elif isinstance(parent, dict):
+        parent[key] = value
+    else:
+        raise PatchError(f"{path}: '{key}' is not inside an object")
+
+
+def is_empty(v: Any) -> bool:
+    if v is None:
+        return True
+    if isinstance(v, str):
+        return not v.strip() or bool(PENDING_RE.search(v))
+    if isinstance(v, (list, dict)):
+        return len(v) == 0
+    return False
+
+
+def apply_patch(doc: dict, patch: dict[str, Any]) -> list[str]:
+    """Mutates doc; returns the paths that changed."""
+    changed: list[str] = []
+    for path, value in (patch.get("set") or {}).items():
+        tokens = parse_path(path)
+        parent = _parent(doc, tokens, path, create=True)
+        if _get(parent, tokens[-1]) != value:
+            _put(parent, tokens[-1], copy.deepcopy(value), path)
+            changed.append(path)
+    for path, value in (patch.get("merge") or {}).items():
+        if not isinstance(value, dict):
+            raise PatchError(f"{path}: merge value must be an object")
+        tokens = parse_path(path)
+        parent = _parent(doc, tokens, path, create=True)
+        cur = _get(parent, tokens[-1])
+        if cur is None:
+            cur = {}
+            _put(parent, tokens[-1], cur, path)
+        if not isinstance(cur, dict):
+            raise PatchError(f"{path}: merge target is not an object")
+        for k, v in value.items():
+            if cur.get(k) != v:
+                cur[k] = copy.deepcopy(v)
+                changed.append(f"{path}.{k}")
+    for path, value in (patch.get("set_if_empty") or {}).items():
+        tokens = parse_path(path)
+        parent = _parent(doc, tokens, path, create=True)
+        cur = _get(parent, tokens[-1])
+        if is_empty(cur) and cur != value:
+            _put(parent, tokens[-1], copy.deepcopy(value), path)
+            changed.append(path)
+    for path in patch.get("delete") or []:
+        tokens = parse_path(path)
+        parent = _parent(doc, tokens, path, create=False)
+        key = tokens[-1]
+        if isinstance(parent, dict) and key in parent:
+            del parent[key]
+            changed.append(path)
+        elif isinstance(parent, list) and isinstance(key, int) and key < len(parent):
+            del parent[key]
+            changed.append(path)
+
+    pr = doc.get("practical")
+    if isinstance(pr, dict) and "schema_version" not in pr and any(p.split(".")[0].startswith("practical") for p in changed):
+        pr["schema_version"] = "practical_block_v1"
+    return changed
+
+
+def dumps(doc: Any) -> str:
+    return json.dumps(doc, indent=2, ensure_ascii=False) + "\n"
+
+
+# --- validation ---
+
+def gate_errors(path: Path, doc: dict) -> tuple[str | None, str | None, list[str]]:
+    """(peptide JSON error, practical block error, PDP contract errors) for one in-memory document."""
+    pep_err, _ = check_data(doc)
+    try:
+        validate_practical(path, doc)
+        pr_err = None
+    except SystemExit as e:
+        pr_err = str(e.code).removeprefix("ERROR: ")
+    return pep_err, pr_err, content_rule_errors(doc, "peptide", path)
+
+
+def regressions(path: Path, before: dict, after: dict) -> tuple[list[str], list[str]]:
+    """(new failures that block the patch, pre-existing failures still present)."""
+    b_pep, b_pr, b_rules = gate_errors(path, before)
+    a_pep, a_pr, a_rules = gate_errors(path, after)
+    blocking: list[str] = []
+    existing: list[str] = []
+    # The peptide JSON and practical validators stop at the first problem, so a document that
+    # already failed is only reported; one that passed before must still pass.
+    for label, b, a in (("peptide json", b_pep, a_pep), ("practical block", b_pr, a_pr)):
+        if a is None:
+            continue
+        (blocking if b is None else existing).append(f"{label}: {a}")
+    for msg in a_rules:
+        (existing if msg in b_rules else blocking).append(f"pdp contract: {msg}")
+    return blocking, existing
+
+
+# --- transaction ---
+
+class Transaction:
+    """All-or-nothing replacement of a set of files, with a rollback journal on disk."""
+
+    def __init__(self, writes: dict[Path, str], journal_dir: Path = JOURNAL_DIR) -> None:
+        self.writes = writes
+        self.dir = journal_dir
+
+    def _stage_path(self, p: Path) -> Path:
+        return p.with_name(f".{p.name}.patch-{os.getpid()}.tmp")
+
+    def commit(self) -> None:
+        if self.dir.exists():
+            raise PatchError(f"an interrupted transaction is pending in {self.dir}; run with --recover first")
+        self.dir.mkdir(parents=True)
+        items = sorted(self.writes.items())
+        files = [
+            {"path": str(p.relative_to(ROOT)), "backup": f"{i:05d}.bak", "stage": str(self._stage_path(p).relative_to(ROOT))}
+            for i, (p, _) in enumerate(items)
+        ]
+        manifest = {"state": "preparing", "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "files": files}
+        try:
+            # Every stage path is journaled before it exists, so --recover can always clean up.
+            self._write_manifest(manifest)
+            for f, (_, text) in zip(files, items):
+                shutil.copy2(ROOT / f["path"], self.dir / f["backup"])
+                with open(ROOT / f["stage"], "w", encoding="utf-8") as fh:
+                    fh.write(text)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            # From here on a crash leaves a journal that --recover rolls back from the backups.
+            self._set_state(manifest, "prepared")
+            for f in files:
+                os.replace(ROOT / f["stage"], ROOT / f["path"])
+            self._set_state(manifest, "committed")
+        except BaseException:
+            rollback(self.dir, manifest)
+            raise
+        shutil.rmtree(self.dir)
+
+    def _set_state(self, manifest: dict, state: str) -> None:
+        # The in-memory state (what an in-process rollback acts on) only moves once it is on disk.
+        self._write_manifest({**manifest, "state": state})
+        manifest["state"] = state
+
+    def _write_manifest(self, data: dict) -> None:
+        tmp = self.dir / f"{MANIFEST}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.dir / MANIFEST)
+
+
+def rollback(journal_dir: Path = JOURNAL_DIR, manifest: dict | None = None) -> int:
+    """
+    Undo the journaled transaction and remove the journal; returns files restored.
+      preparing   no target replaced yet (backups may be partial): staged files are deleted
+      prepared    staged files deleted, every target restored from its backup
+      committed   only the cleanup was lost: the journal is removed, nothing restored
+    """
+    if manifest is None:
+        try:
+            manifest = json.loads((journal_dir / MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}  # interrupted before the manifest was written: nothing staged yet
+    state = manifest.get("state")
+    files = [] if state == "committed" else manifest.get("files") or []
+    restored = 0
+    for f in files:
+        (ROOT / f["stage"]).unlink(missing_ok=True)
+        backup = journal_dir / f["backup"]
+        if state == "prepared" and backup.exists():
+            target = ROOT / f["path"]
+            tmp = target.with_name(f".{target.name}.rollback.tmp")
+            shutil.copy2(backup, tmp)
+            os.replace(tmp, target)
+            restored += 1
+    shutil.rmtree(journal_dir, ignore_errors=True)
+    return restored
+
+
+# --- driver ---
+
+def iter_patches(files: list[Path]) -> Iterator[dict[str, Any]]:
+    for p in files:
+        yield from load_patch_file(p)
+
+
+def plan(patch_files: list[Path]) -> tuple[dict[Path, str], list[str], int]:
+    """(path -> new text for changed documents, error lines, patches read)."""
+    docs: dict[str, tuple[Path, str, dict, dict]] = {}  # slug -> (path, original text, original, patched)
+    changes: dict[str, list[str]] = {}
+    errors: list[str] = []
+    n = 0
+    for patch in iter_patches(patch_files):
+        n += 1
+        slug = patch["slug"]
+        if slug not in docs:
+            path = content.PEPTIDES_DIR / f"{slug}.json"
+            if content.is_registry(path) or not path.is_file():
+                errors.append(f"{patch['_where']}: no peptide document for slug {slug!r}")
+                continue
+            try:
+                text = path.read_text(encoding="utf-8")
+                original = json.loads(text)
+            except (OSError, ValueError) as e:
+                errors.append(f"{patch['_where']}: could not read {path} ({e})")
+                continue
+            docs[slug] = (path, text, original, copy.deepcopy(original))
+        try:
+            changes.setdefault(slug, []).extend(apply_patch(docs[slug][3], patch))
+        except PatchError as e:
+            errors.append(f"{patch['_where']} ({slug}): {e}")
+
+    writes: dict[Path, str] = {}
+    for slug, (path, text, original, patched) in sorted(docs.items()):
+        new_text = dumps(patched)
+        if new_text == text:
+            print(f"UNCHANGED {slug}")
+            continue
+        blocking, existing = regressions(path, original, patched)
+        paths = sorted(set(changes.get(slug) or [])) or ["(formatting only)"]
+        print(f"{'REJECT' if blocking else 'PATCH'} {slug}: {', '.join(paths)}")
+        for msg in blocking:
+            errors.append(f"{slug}: {msg}")
+        for msg in existing:
+            print(f"  note (pre-existing) {msg}")
+        writes[path] = new_text
+    return writes, errors, n
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Apply declarative peptide content patches in one validated transaction.")
+    ap.add_argument("patches", nargs="*", type=Path, help="Patch files (.json / .jsonl / .yaml)")
+    ap.add_argument("--apply", action="store_true", help="Write the changes (default: dry run)")
+    ap.add_argument("--no-rebuild", action="store_true", help="Do not run the incremental index rebuild after --apply")
+    ap.add_argument("--recover", action="store_true", help="Roll back an interrupted transaction and exit")
+    args = ap.parse_args(argv)
+
+    if args.recover:
+        if not JOURNAL_DIR.exists():
+            print("OK: no pending transaction")
+            return 0
+        print(f"OK: rolled back {rollback()} file(s)")
+        return 0
+    if not args.patches:
+        ap.error("no patch files given")
+    if JOURNAL_DIR.exists():
+        die(f"an interrupted transaction is pending in {JOURNAL_DIR.relative_to(ROOT)}; run with --recover first")
+
+    t0 = time.perf_counter()
+    try:
+        writes, errors, n = plan(args.patches)
+    except PatchError as e:
+        die(str(e))
+    if errors:
+        for e in errors:
+            print(f"ERROR: {e}", file=sys.stderr)
+        print(f"FAILED: {len(errors)} error(s); nothing written")
+        return 1
+
+    summary = f"{n} patch(es), {len(writes)} document(s) changed ({(time.perf_counter() - t0) * 1000:.0f}ms)"
+    if not args.apply:
+        print(f"DRY-RUN OK: {summary}; rerun with --apply to write")
+        return 0
+    if not writes:
+        print(f"OK: {summary}")
+        return 0
+
+    try:
+        Transaction(writes).commit()
+    except (OSError, PatchError) as e:
+        die(f"transaction rolled back: {e}")
+    print(f"OK: committed {summary}")
+
+    if args.no_rebuild:
+        return 0
+    from scripts.index import rebuild_all_indexes  # type: ignore
+    rc = rebuild_all_indexes.main(["--only", "builders", "--keep-going", *REBUILD_EXCLUDE])
+    if rc != 0:
+        print("ERROR: index rebuild failed (listed above); content changes are committed. "
+              "Fix and rerun scripts/index/rebuild_all_indexes.py", file=sys.stderr)
+    if rebuild_all_indexes.main(["--only", "validators", "--keep-going"]) != 0:
+        print("WARN: validation gates reported failures (listed above); the patched documents passed the in-memory gate", file=sys.stderr)
+    return 1 if rc != 0 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Export content/ into a local SQLite database that mirrors db/sql/schema_v1.sql.
+
+The SQLite DDL is derived from schema_v1.sql itself (so the two cannot drift):
+  BIGSERIAL PRIMARY KEY -> INTEGER PRIMARY KEY     TIMESTAMPTZ / TEXT[] -> TEXT (arrays as JSON)
+  <name>_enum           -> TEXT                    DEFAULT now()        -> DEFAULT CURRENT_TIMESTAMP
+  NUMERIC(p,s)          -> NUMERIC
+Tables, columns, UNIQUE / CHECK / REFERENCES constraints and the schema's indexes are kept.
+Enum columns accept any text here; values outside the enum are loaded as-is and reported as
+WARN lines (content still uses e.g. evidence_grade "unknown"), so the same rows can be checked
+before they are fed to Postgres.
+
+SQLite-only additions:
+  peptides.slug (unique)                 content is keyed by slug; schema_v1 has no slug column
+  peptide_interactions.archetype/summary NOT NULL dropped: content has class tokens, not archetypes
+  secondary indexes on slug, alias (NOCASE) and interaction targets, built after the load
+
+Content mapping (peptides only; blends and topics have no tables in schema_v1):
+  peptides                 canonical_name, short_name, practical.bottom_line as description
+  peptide_aliases          peptide.aliases (first peptide wins an alias used twice)
+  peptide_structures       peptide.structure, placeholder text dropped
+  peptide_status_history   peptide.status (category, jurisdiction, last_reviewed as effective_from)
+  evidence_items           peptide.evidence, shared across peptides by (source_type, source_id)
+  claims + links           dict items with text in peptide.sections (claim_type from the item,
+                           else from the section; evidence_grade from the item, else inherited
+                           from peptide.risk as the audits and claim index do, else the schema
+                           default, counted in a WARN line); evidence_refs -> claim_evidence_links
+  risk_scores              peptide.risk
+  drug/supplement_classes  interaction_classes_v1.json classes (name = slug), plus any raw
+                           interaction term that matches no class
+  peptide_interactions     interactions.drug_classes / supplement_classes / peptides
+  peptide_changelog        peptide.changelog
+
+collect_tables() produces plain {table: (columns, rows)} with explicit ids; load_sqlite() bulk
+loads them (executemany per table, one transaction) into a fresh file that replaces --out
+atomically.
+
+Usage:
+  python3 scripts/db/export_sqlite_v1.py
+  python3 scripts/db/export_sqlite_v1.py --out /tmp/content.sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from collections import Counter
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib import content  # type: ignore
+from scripts.lib.claims import inherited_grade  # type: ignore
+from scripts.lib.interaction_canon import iter_tokens, load_canonicalizer  # type: ignore
+
+SCHEMA_PATH = ROOT / "db" / "sql" / "schema_v1.sql"
+DEFAULT_OUT = ROOT / "db" / "_local" / "content_v1.sqlite"
+
+RELAXED_NOT_NULL = {("peptide_interactions", "archetype"), ("peptide_interactions", "summary")}
+
+EXTRA_DDL = [
+    "ALTER TABLE peptides ADD COLUMN slug TEXT",
+]
+EXTRA_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_peptides_slug ON peptides(slug)",
+    "CREATE INDEX IF NOT EXISTS idx_peptide_aliases_alias_nocase ON peptide_aliases(alias COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS idx_peptide_aliases_peptide_id ON peptide_aliases(peptide_id)",
+    "CREATE INDEX IF NOT EXISTS idx_interactions_drug_class ON peptide_interactions(target_drug_class_id)",
+    "CREATE INDEX IF NOT EXISTS idx_interactions_supp_class ON peptide_interactions(target_supp_class_id)",
+    "CREATE INDEX IF NOT EXISTS idx_interactions_target_peptide ON peptide_interactions(target_peptide_id)",
+    "CREATE INDEX IF NOT EXISTS idx_claim_links_evidence ON claim_evidence_links(evidence_item_id)",
+]
+
+SECTION_CLAIM_TYPE = {
+    "overview": "overview",
+    "use_cases": "use_case",
+    "mechanism": "mechanism",
+    "human_effects": "effect_benefit",
+    "preclinical_effects": "effect_neutral",
+    "hypothesized_effects": "effect_neutral",
+    "time_dynamics": "time_dynamics",
+    "risks": "risk",
+    "contraindications": "contraindication",
+    "monitoring": "monitoring",
+    "observed_exposure_ranges": "dosing_range_observed",
+    "developmental_risk_block": "developmental_risk",
+    "interaction_summary": "interaction_summary",
+}
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def die(msg: str, code: int = 1) -> None:
+    print(f"ERROR: {msg}", file=sys.stderr)
+    sys.exit(code)
+
+
+# --- schema translation ---
+
+class SqliteSchema:
+    def __init__(self, sql: str) -> None:
+        self.enums: dict[str, list[str]] = {
+            m.group(1): re.findall(r"'([^']+)'", m.group(2))
+            for m in re.finditer(r"CREATE TYPE (\w+) AS ENUM \((.*?)\);", sql, re.S)
+        }
+        self.enum_columns: dict[tuple[str, str], str] = {}
+        self.tables: list[str] = []
+        self.create: list[str] = []
+        for m in re.finditer(r"CREATE TABLE IF NOT EXISTS (\w+) \((.*?)\n\);", sql, re.S):
+            table = m.group(1)
+            self.tables.append(table)
+            lines = [self._column(table, re.sub(r"\s*--.*$", "", ln)) for ln in m.group(2).splitlines()]
+            body = "\n".join(ln for ln in lines if ln.strip())
+            self.create.append(f"CREATE TABLE {table} (\n{body}\n)")
+        self.indexes = re.findall(r"CREATE INDEX IF NOT EXISTS [^;]+", sql)
+        if not self.tables:
+            die(f"No CREATE TABLE statements found in {SCHEMA_PATH}")
+
+    def _column(self, table: str, line: str) -> str:
+        m = re.match(r"\s*(\w+)\s+(\w+)", line)
+        if m and m.group(2) in self.enums:
+            self.enum_columns[(table, m.group(1))] = m.group(2)
+        if m and (table, m.group(1)) in RELAXED_NOT_NULL:
+            line = line.replace(" NOT NULL", "")
+        line = re.sub(r"\bBIGSERIAL PRIMARY KEY\b", "INTEGER PRIMARY KEY", line)
+        line = re.sub(r"\bTIMESTAMPTZ\b", "TEXT", line)
+        line = re.sub(r"\bTEXT\[\]", "TEXT", line)
+        line = re.sub(r"\bNUMERIC\(\d+,\s*\d+\)", "NUMERIC", line)
+        line = re.sub(r"\bDEFAULT now\(\)", "DEFAULT CURRENT_TIMESTAMP", line)
+        return re.sub(r"\b(\w+_enum)\b", lambda e: "TEXT" if e.group(1) in self.enums else e.group(1), line)
+
+
+def load_schema(path: Path = SCHEMA_PATH) -> SqliteSchema:
+    try:
+        return SqliteSchema(path.read_text(encoding="utf-8"))
+    except OSError as e:
+        die(f"Cannot read schema: {path} ({e})")
+
+
+# --- content -> rows ---
+
+def _text(v: Any) -> str | None:
+    if not isinstance(v, str):
+        return None
+    v = v.strip()
+    return v if v and "curation pending" not in v.lower() else None
+
+
+def _date(v: Any) -> str | None:
+    return v if isinstance(v, str) and _DATE.match(v) else None
+
+
+class Tables:
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[list[str], list[tuple]]] = {}
+        self.warnings: Counter[str] = Counter()
+        self.skipped: Counter[str] = Counter()  # placeholder / incomplete source entries per table
+
+    def add(self, table: str, columns: list[str], row: tuple) -> int:
+        cols, rows = self.data.setdefault(table, (columns, []))
+        if cols != columns:
+            raise ValueError(f"{table}: inconsistent columns {columns} != {cols}")
+        rows.append(row)
+        return len(rows)
+
+    def count(self, table: str) -> int:
+        return len(self.data.get(table, ((), []))[1])
+
+
+def collect_tables() -> Tables:
+    t = Tables()
+    canon = load_canonicalizer()
+    docs = [d for d in content.iter_peptides()]
+
+    peptide_id = {d.slug: i for i, d in enumerate(docs, start=1)}
+    seen_names: dict[str, str] = {}
+    seen_aliases: set[str] = set()
+    evidence_id: dict[tuple[str, str], int] = {}
+    class_id: dict[tuple[str, str], int] = {}
+
+    def class_row(bucket: str, name: str, description: str | None) -> int:
+        key = (bucket, name)
+        if key not in class_id:
+            class_id[key] = t.add(bucket, ["id", "name", "description"], (t.count(bucket) + 1, name, description))
+        return class_id[key]
+
+    for bucket, classes in canon.buckets.items():
+        for slug, shown in classes.items():
+            class_row(bucket, slug, shown.get("title"))
+
+    for doc in docs:
+        pid = peptide_id[doc.slug]
+        pep = doc.peptide
+        name = doc.canonical_name
+        if name in seen_names:
+            t.warnings[f"peptides: canonical_name {name!r} already used by {seen_names[name]}; using slug"] += 1
+            name = doc.slug
+        seen_names[name] = doc.slug
+        t.add("peptides", ["id", "slug", "canonical_name", "short_name", "description"],
+              (pid, doc.slug, name, _text(pep.get("short_name")), _text(doc.practical.get("bottom_line"))))
+
+        for alias in doc.aliases:
+            alias = alias.strip()
+            if not alias:
+                continue
+            if alias in seen_aliases:
+                t.warnings[f"peptide_aliases: duplicate alias {alias!r} ({doc.slug})"] += 1
+                continue
+            seen_aliases.add(alias)
+            t.add("peptide_aliases", ["id", "peptide_id", "alias"], (t.count("peptide_aliases") + 1, pid, alias))
+
+        st = pep.get("structure") if isinstance(pep.get("structure"), dict) else {}
+        struct = (
+            _text(st.get("amino_acid_seq")), _text(st.get("sequence_oneletter")), _text(st.get("molecular_formula")),
+            st.get("molecular_weight") if isinstance(st.get("molecular_weight"), (int, float)) else None,
+            _text(st.get("structure_image_url")),
+        )
+        if any(v is not None for v in struct):
+            t.add("peptide_structures",
+                  ["id", "peptide_id", "amino_acid_seq", "sequence_oneletter", "molecular_formula", "molecular_weight", "structure_image_url"],
+                  (t.count("peptide_structures") + 1, pid, *struct))
+
+        status = doc.status
+        reviewed = _date(status.get("last_reviewed"))
+        category = _text(status.get("category"))
+        if category and reviewed:
+            t.add("peptide_status_history", ["id", "peptide_id", "status", "jurisdiction", "effective_from", "rationale"],
+                  (t.count("peptide_status_history") + 1, pid, category, _text(status.get("jurisdiction")),
+                   reviewed, _text(status.get("human_use_note"))))
+
+        local_evidence: dict[str, int] = {}
+        for ev in doc.evidence:
+            title, source_type, grade = _text(ev.get("title")), _text(ev.get("source_type")), _text(ev.get("evidence_grade"))
+            if not (title and source_type and grade):
+                # Placeholder entries ("curation pending") are expected; only count them.
+                t.skipped["evidence_items"] += 1
+                continue
+            source_id = _text(ev.get("source_id"))
+            key = (source_type, source_id) if source_id else None
+            if key is not None and key in evidence_id:
+                eid = evidence_id[key]
+            else:
+                eid = t.add("evidence_items", ["id", "title", "source_type", "source_id", "url", "published_date", "evidence_grade", "notes"],
+                            (t.count("evidence_items") + 1, title, source_type, source_id, _text(ev.get("url")),
+                             _date(ev.get("published_date")), grade, _text(ev.get("notes"))))
+                if key is not None:
+                    evidence_id[key] = eid
+            if isinstance(ev.get("id"), str):
+                local_evidence[ev["id"]] = eid
+
+        doc_grade = inherited_grade(doc.raw)
+        for section, items in doc.sections.items():
+            for it in items if isinstance(items, list) else []:
+                if not isinstance(it, dict):
+                    continue
+                text = _text(it.get("text")) or _text(it.get("body"))
+                claim_type = it.get("claim_type") or SECTION_CLAIM_TYPE.get(section)
+                if not text or not claim_type:
+                    continue
+                grade = it.get("evidence_grade") or doc_grade
+                if not grade:
+                    grade = "mechanistic_only"
+                    t.warnings["claims: no evidence_grade on claim or peptide.risk; used schema default 'mechanistic_only'"] += 1
+                cid = t.add("claims", ["id", "peptide_id", "claim_type", "title", "claim_text", "population_group", "confidence", "evidence_grade"],
+                            (t.count("claims") + 1, pid, claim_type, _text(it.get("title")) or _text(it.get("heading")), text,
+                             it.get("population_group") or "general", it.get("confidence") or "unknown", grade))
+                linked: set[int] = set()
+                for ref in it.get("evidence_refs") or []:
+                    eid = local_evidence.get(ref) if isinstance(ref, str) else None
+                    if eid is None:
+                        t.skipped["claim_evidence_links"] += 1
+                    elif eid not in linked:
+                        linked.add(eid)
+                        t.add("claim_evidence_links", ["id", "claim_id", "evidence_item_id"], (t.count("claim_evidence_links") + 1, cid, eid))
+
+        risk = doc.risk
+        score = risk.get("risk_score", risk.get("current_score"))
+        rationale = risk.get("rationale").strip() if isinstance(risk.get("rationale"), str) else ""
+        if isinstance(score, int) and 1 <= score <= 10 and rationale:
+            t.add("risk_scores", ["id", "peptide_id", "risk_score", "severity", "likelihood", "evidence_grade",
+                                  "developmental_risk", "unknowns_penalty", "rationale", "effective_from"],
+                  (t.count("risk_scores") + 1, pid, score, risk.get("severity") or "moderate", risk.get("likelihood") or "possible",
+                   risk.get("evidence_grade") or "mechanistic_only", bool(risk.get("developmental_risk", False)),
+                   bool(risk.get("unknowns_penalty", True)), rationale, reviewed or date.today().isoformat()))
+        elif risk:
+            t.warnings["risk_scores: missing/out-of-range score or empty rationale"] += 1
+
+        inter_cols = ["id", "peptide_id", "target_type", "target_drug_class_id", "target_supp_class_id", "target_peptide_id", "summary"]
+        for bucket, target_type in (("drug_classes", "drug_class"), ("supplement_classes", "supplement_class")):
+            for it in doc.interaction_list(bucket):
+                token = next(iter_tokens([it]), None)
+                if token is None:
+                    continue
+                slug = canon.resolve(token, bucket)
+                cls = class_row(bucket, slug or token, None)
+                summary = _text(it.get("risk_note")) if isinstance(it, dict) else None
+                ids = (cls, None) if bucket == "drug_classes" else (None, cls)
+                t.add("peptide_interactions", inter_cols, (t.count("peptide_interactions") + 1, pid, target_type, *ids, None, summary))
+        for token in iter_tokens(doc.interaction_list("peptides")):
+            target = peptide_id.get(token)
+            if target is None or target == pid:
+                t.warnings[f"peptide_interactions: unknown or self peptide target {token!r}"] += 1
+                continue
+            t.add("peptide_interactions", inter_cols, (t.count("peptide_interactions") + 1, pid, "peptide", None, None, target, None))
+
+        for ch in pep.get("changelog") or []:
+            if not isinstance(ch, dict):
+                continue
+            change_type, summary = _text(ch.get("change_type")), _text(ch.get("summary"))
+            if change_type and summary:
+                t.add("peptide_changelog", ["id", "peptide_id", "change_type", "summary", "detail", "changed_at"],
+                      (t.count("peptide_changelog") + 1, pid, change_type, summary, _text(ch.get("detail")),
+                       _date(ch.get("date")) or reviewed or date.today().isoformat()))
+
+    for line in canon.report():
+        t.warnings[line] += 1
+    return t
+
+
+def enum_warnings(schema: SqliteSchema, tables: Tables) -> list[str]:
+    out = []
+    for (table, col), enum in sorted(schema.enum_columns.items()):
+        if table not in tables.data:
+            continue
+        cols, rows = tables.data[table]
+        if col not in cols:
+            continue
+        i = cols.index(col)
+        allowed = set(schema.enums[enum])
+        bad = Counter(r[i] for r in rows if r[i] is not None and r[i] not in allowed)
+        for v, n in sorted(bad.items(), key=lambda kv: (-kv[1], str(kv[0]))):
+            out.append(f"{table}.{col}: {v!r} not in {enum} (x{n})")
+    return out
+
+
+# --- load ---
+
+def load_sqlite(out: Path, schema: SqliteSchema, tables: Tables) -> dict[str, int]:
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("BEGIN")
+        for stmt in [*schema.create, *EXTRA_DDL]:
+            conn.execute(stmt)
+        counts: dict[str, int] = {}
+        for table in schema.tables:
+            if table not in tables.data:
+                counts[table] = 0
+                continue
+            cols, rows = tables.data[table]
+            marks = ", ".join("?" * len(cols))
+            conn.executemany(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({marks})", rows)
+            counts[table] = len(rows)
+        extra = sorted(set(tables.data) - set(schema.tables))
+        if extra:
+            raise ValueError(f"rows for tables missing from schema: {', '.join(extra)}")
+        for stmt in [*schema.indexes, *EXTRA_INDEXES]:
+            conn.execute(stmt)
+        bad_fk = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if bad_fk:
+            raise ValueError(f"foreign key violations: {bad_fk[:5]}")
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+    except (sqlite3.Error, ValueError) as e:
+        conn.close()
+        tmp.unlink(missing_ok=True)
+        die(f"SQLite export failed: {e}")
+    conn.close()
+    os.replace(tmp, out)
+    return counts
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Export content/ into a SQLite mirror of db/sql/schema_v1.sql.")
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUT, help=f"Database file (default: {DEFAULT_OUT.relative_to(ROOT)})")
+    args = ap.parse_args(argv)
+
+    schema = load_schema()
+    tables = collect_tables()
+    counts = load_sqlite(args.out, schema, tables)
+
+    for line, n in tables.warnings.items():
+        print(f"WARN: {line}" + (f" x{n}" if n > 1 else ""))
+    for line in enum_warnings(schema, tables):
+        print(f"WARN: {line}")
+    print(f"OK: wrote {args.out}")
+    print("ROWS:", {k: v for k, v in counts.items() if v})
+    if tables.skipped:
+        print("SKIPPED (placeholder/incomplete):", dict(tables.skipped))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -21,6 +21,7 @@ Design rules:
 from __future__ import annotations
 
 import json
+import sys
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
@@ -28,6 +29,9 @@ from typing import Any, Dict, List, Optional, Tuple
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
 CONTENT_DIR = REPO_ROOT / "content"
 
 PEPTIDE_CATEGORIES_PATH = CONTENT_DIR / "_taxonomy" / "peptide_categories_v1.json"
@@ -72,11 +76,8 @@ def _load_json(path: Path) -> Any:
         return json.load(f)
 
 
-def _write_json(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+def _write_json(path: Path, obj: Any) -> bool:
+    return write_json_if_changed(path, obj)
 
 
 def _expect_list_of_dicts(obj: Any, key: str, path: Path) -> List[Dict[str, Any]]:
@@ -380,8 +381,8 @@ def main() -> int:
         "categories": categories_out,
     }
 
-    _write_json(OUTPUT_PATH, out_obj)
-    print(f"Wrote {OUTPUT_PATH} (categories={len(categories_out)})")
+    changed = _write_json(OUTPUT_PATH, out_obj)
+    print(f"{'Wrote' if changed else 'Unchanged'} {OUTPUT_PATH} (categories={len(categories_out)})")
     return 0
 
 
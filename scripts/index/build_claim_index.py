@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Build content/_index/claims_v1.json: a content fingerprint per peptide claim
+(sections.* claim objects and practical.* bullets; see scripts/lib/claims.py).
+
+The committed index (git HEAD) is the baseline for incremental checks: after editing a
+curation batch, --changed lists exactly the claims that differ from it, and the audits'
+and validators' --changed-claims modes evaluate only those claims (or their peptides).
+The rebuild rewrites the file on disk every run; the baseline advances only when the
+index is committed.
+
+Usage:
+  python3 scripts/index/build_claim_index.py                    # (re)write the index
+  python3 scripts/index/build_claim_index.py --changed          # claims changed vs the committed index
+  python3 scripts/index/build_claim_index.py --changed --since old_claims_v1.json --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.lib.claims import CLAIMS_INDEX_PATH, build_index, changed_since, load_baseline  # type: ignore
+
+
+def die(msg: str, code: int = 1) -> None:
+    print(f"ERROR: {msg}", file=sys.stderr)
+    sys.exit(code)
+
+
+def report_changes(since: Path | None, as_json: bool) -> int:
+    baseline = load_baseline(since)
+    current = build_index()
+    delta = changed_since(baseline, current)
+    if as_json:
+        print(json.dumps({
+            "baseline": baseline.get("fingerprint_set"),
+            "current": current["fingerprint_set"],
+            "changed": {slug: sorted(fps) for slug, fps in sorted(delta.changed.items())},
+            "removed": {slug: sorted(fps) for slug, fps in sorted(delta.removed.items())},
+            "unchanged": delta.unchanged,
+        }, indent=2))
+        return 0
+
+    n_changed = sum(len(v) for v in delta.changed.values())
+    n_removed = sum(len(v) for v in delta.removed.values())
+    print(f"Claims since {baseline.get('fingerprint_set')}: changed={n_changed} removed={n_removed} unchanged={delta.unchanged}")
+    for slug in delta.slugs:
+        entry = current["peptides"].get(slug) or {}
+        for c in entry.get("claims") or []:
+            if c["fp"] in delta.changed.get(slug, ()):
+                print(f"  CHANGED {slug} {c['at']} {c['title']!r}")
+        for fp in sorted(delta.removed.get(slug, ())):
+            print(f"  REMOVED {slug} {fp}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Build the claim fingerprint index (or list claims changed since it).")
+    ap.add_argument("--changed", action="store_true", help="List claims changed since the baseline index; write nothing")
+    ap.add_argument("--since", type=Path, help="Baseline claim index file for --changed (default: the committed index, git HEAD)")
+    ap.add_argument("--json", action="store_true", help="--changed: print the delta as JSON")
+    args = ap.parse_args(argv)
+
+    if args.changed:
+        return report_changes(args.since, args.json)
+
+    try:
+        idx = build_index()
+    except Exception as e:
+        die(f"Failed to build claim index: {e}")
+    out = {"version": idx["version"], "generated_at": date.today().isoformat(), **{k: v for k, v in idx.items() if k != "version"}}
+    changed = write_json_if_changed(CLAIMS_INDEX_PATH, out)
+    print(f"OK: {'wrote' if changed else 'unchanged'} {CLAIMS_INDEX_PATH.relative_to(ROOT)}")
+    print("COUNTS:", idx["counts"])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
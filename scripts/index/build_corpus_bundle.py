@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Build content/_index/corpus_v1.jsonl: every peptide, blend and topic page document in one
+newline-delimited JSON bundle, plus a byte-offset sidecar (corpus_v1.jsonl.offsets.json).
+
+One record per line, peptides then blends then topics, each in slug order:
+  {"key": "peptide:bpc-157", "kind": "peptide", "slug": "bpc-157", "name": "BPC-157",
+   "path": "content/peptides/bpc-157.json", "schema_version": "pdp_json_v1", "doc": {...}}
+"key" uses the app_state_v1 entity_key form; "doc" is the source document unchanged.
+
+Sidecar:
+  bundle, compression   bundle file name; null or "gzip"
+  bytes, sha256         size and digest of the bundle file
+  counts                records per kind
+  records               key -> [byte offset, byte length] of the record in the bundle file
+
+Consumers can stream the bundle line by line, or seek to one record: read `length` bytes at
+`offset` (read_record() below). With --gzip the bundle is corpus_v1.jsonl.gz, written as one
+gzip member per record (a valid gzip stream; `zcat` yields the plain bundle), so offsets
+still address single records in the compressed file.
+
+The bundle carries no timestamps, so an unchanged corpus leaves both files untouched.
+
+Usage:
+  python3 scripts/index/build_corpus_bundle.py
+  python3 scripts/index/build_corpus_bundle.py --gzip
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib import content  # type: ignore
+from scripts.lib.atomic_io import write_bytes_if_changed, write_json_if_changed  # type: ignore
+
+BUNDLE_PATH = content.INDEX_DIR / "corpus_v1.jsonl"
+GZIP_BUNDLE_PATH = content.INDEX_DIR / "corpus_v1.jsonl.gz"
+
+
+def die(msg: str, code: int = 1) -> None:
+    print(f"ERROR: {msg}", file=sys.stderr)
+    sys.exit(code)
+
+
+def offsets_path(bundle: Path) -> Path:
+    return bundle.with_name(bundle.name + ".offsets.json")
+
+
+def _str(v: Any) -> str:
+    return v.strip() if isinstance(v, str) else ""
+
+
+def record_name(kind: str, slug: str, doc: dict) -> str:
+    if kind == "peptide":
+        pep = doc.get("peptide") if isinstance(doc.get("peptide"), dict) else {}
+        return _str(pep.get("canonical_name")) or slug
+    if kind == "blend":
+        blend = doc.get("blend") if isinstance(doc.get("blend"), dict) else {}
+        return _str(blend.get("display_name")) or slug
+    page = doc.get("topic_page") if isinstance(doc.get("topic_page"), dict) else {}
+    return _str(page.get("title")) or slug
+
+
+def iter_records(loader: content.ContentLoader | None = None) -> Iterator[dict[str, Any]]:
+    ld = loader if loader is not None else content.default_loader()
+    sources = (
+        ("peptide", content.list_peptide_files()),
+        ("blend", content.list_blend_files()),
+        ("topic", content.list_topic_page_files()),
+    )
+    for kind, files in sources:
+        for p in files:
+            try:
+                doc = ld.load_json(p)
+            except Exception as e:
+                die(f"Failed to parse JSON: {p} ({e})")
+            if not isinstance(doc, dict):
+                die(f"Root JSON must be an object/dict: {p}")
+            slug = p.stem
+            yield {
+                "key": f"{kind}:{slug}",
+                "kind": kind,
+                "slug": slug,
+                "name": record_name(kind, slug, doc),
+                "path": str(p.relative_to(ROOT)),
+                "schema_version": doc.get("schema_version"),
+                "doc": doc,
+            }
+
+
+def build_bundle(records: Iterator[dict[str, Any]], compress: bool = False) -> tuple[bytes, dict[str, list[int]], dict[str, int]]:
+    """(bundle bytes, key -> [offset, length], counts per kind)."""
+    chunks: list[bytes] = []
+    offsets: dict[str, list[int]] = {}
+    counts: dict[str, int] = {}
+    pos = 0
+    for rec in records:
+        line = (json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        if compress:
+            line = gzip.compress(line, mtime=0)
+        if rec["key"] in offsets:
+            die(f"Duplicate corpus key: {rec['key']}")
+        offsets[rec["key"]] = [pos, len(line)]
+        counts[rec["kind"]] = counts.get(rec["kind"], 0) + 1
+        chunks.append(line)
+        pos += len(line)
+    return b"".join(chunks), offsets, counts
+
+
+def read_record(key: str, bundle: Path = BUNDLE_PATH) -> dict[str, Any] | None:
+    """One record by key ("peptide:bpc-157"), read by seeking via the sidecar; None when absent."""
+    idx = json.loads(offsets_path(bundle).read_text(encoding="utf-8"))
+    span = (idx.get("records") or {}).get(key)
+    if span is None:
+        return None
+    offset, length = span
+    with open(bundle, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    if idx.get("compression") == "gzip":
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Build the JSONL corpus bundle + byte-offset sidecar.")
+    ap.add_argument("--gzip", action="store_true", help=f"Write {GZIP_BUNDLE_PATH.relative_to(ROOT)} (one gzip member per record)")
+    args = ap.parse_args(argv)
+
+    bundle_path = GZIP_BUNDLE_PATH if args.gzip else BUNDLE_PATH
+    data, offsets, counts = build_bundle(iter_records(), compress=args.gzip)
+
+    sidecar = {
+        "version": "v1",
+        "generated_at": date.today().isoformat(),
+        "bundle": bundle_path.name,
+        "compression": "gzip" if args.gzip else None,
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "counts": counts,
+        "records": offsets,
+    }
+
+    changed = write_bytes_if_changed(bundle_path, data)
+    changed_idx = write_json_if_changed(offsets_path(bundle_path), sidecar)
+    print(f"OK: {'wrote' if changed else 'unchanged'} {bundle_path.relative_to(ROOT)} ({len(data)} bytes)")
+    print(f"OK: {'wrote' if changed_idx else 'unchanged'} {offsets_path(bundle_path).relative_to(ROOT)}")
+    print("COUNTS:", counts)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
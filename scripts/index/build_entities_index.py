@@ -4,6 +4,11 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.lib.peptide_facts import load_facts  # type: ignore
+
 def die(msg: str, code: int = 1):
     print(f"ERROR: {msg}", file=sys.stderr)
     sys.exit(code)
@@ -63,32 +68,33 @@ def main():
         # Keep only non-empty strings
         gov_tax_map[s.strip()] = [k for k in tks if isinstance(k, str) and k.strip()]
 
-    peptide_files = sorted([p for p in peptides_dir.glob("*.json") if not p.name.startswith("_")])
     blend_files = sorted([p for p in blends_dir.glob("*.json") if p.suffix == ".json" and not p.name.startswith("_") and p.name != "README.md"])
 
     peptides = []
     peptide_slugs = set()
-    for p in peptide_files:
-        d = load_json(p)
-        pep = d.get("peptide")
-        if not isinstance(pep, dict):
+    facts = load_facts()
+    for i in facts.rows():
+        p = facts.path[i]
+        if facts.error[i] is not None:
+            die(f"Failed to parse JSON: {p} ({facts.error[i]})")
+        if not facts.has_peptide[i]:
             die(f"Invalid peptide object in: {p}")
-        slug = p.stem
-        canonical = pep.get("canonical_name") or slug
-        status = pep.get("status") or {}
+        slug = facts.slug[i]
+        canonical = facts.canonical_name[i] or slug
+        status = facts.status[i] or {}
         status_cat = status.get("category") or ""
 
         entity_kind = "peptide"
         # heuristic: if they tagged it, use it (non-breaking)
-        ek = pep.get("entity_kind") or pep.get("meta", {}).get("entity_kind")
+        ek = facts.entity_kind[i]
         if isinstance(ek, str) and ek.strip():
             entity_kind = ek.strip()
 
-        taxonomy_keys = norm_list(pep.get("taxonomy_keys") or pep.get("meta", {}).get("taxonomy_keys"))
+        taxonomy_keys = norm_list(facts.taxonomy_keys[i])
         # Deterministic fallback: if peptide JSON doesn't carry taxonomy_keys, use governance mapping.
         if not taxonomy_keys:
             taxonomy_keys = norm_list(gov_tax_map.get(slug))
-        appears_in_blends = norm_list(pep.get("meta", {}).get("appears_in_blends"))
+        appears_in_blends = norm_list(facts.appears_in_blends[i])
 
         peptides.append({
             "kind": "peptide",
@@ -208,8 +214,8 @@ def main():
         "topics": topics,
     }
 
-    out_path.write_text(json.dumps(out, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    print(f"Wrote: {out_path}")
+    changed = write_json_if_changed(out_path, out)
+    print(f"{'Wrote' if changed else 'Unchanged'}: {out_path}")
     print(f"Peptides: {len(peptides)}  Blends: {len(blends)}  Total: {len(peptides)+len(blends)}")
 
 if __name__ == "__main__":
@@ -13,7 +13,9 @@ NO dosing. NO instructions. Risk-only metadata + links.
 
 from __future__ import annotations
 
+import argparse
 import json
+import sys
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
@@ -21,6 +23,18 @@ from typing import Any
 
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.lib.content import list_blend_files  # type: ignore
+from scripts.lib.peptide_facts import load_facts  # type: ignore
+from scripts.index.risk_engine import (  # type: ignore
+    EVIDENCE_RANK,
+    LIKELIHOOD_RANK,
+    SEVERITY_RANK,
+    RiskEngine,
+)
+
 PEPTIDES_DIR = ROOT / "content" / "peptides"
 BLENDS_DIR = ROOT / "content" / "blends"
 BLENDS_INDEX = BLENDS_DIR / "_index.json"
@@ -28,23 +42,6 @@ SAFETY_INDEX = ROOT / "content" / "safety" / "_safety_index.json"
 OUT_PATH = ROOT / "content" / "_index" / "risk_index_v1.json"
 
 
-EVIDENCE_RANK = {
-    # Higher rank = stronger evidence (best). We will choose the WEAKER of two by rank.
-    "regulatory_label": 9,
-    "rct_meta": 8,
-    "rct": 7,
-    "human_interventional": 6,
-    "human_observational": 5,
-    "animal": 4,
-    "in_vitro": 3,
-    "mechanistic_only": 2,
-    "unknown": 1,
-}
-
-SEVERITY_RANK = {"minimal": 1, "mild": 2, "moderate": 3, "high": 4, "critical": 5}
-LIKELIHOOD_RANK = {"unlikely": 1, "possible": 2, "likely": 3, "very_likely": 4}
-
-
 def die(msg: str, code: int = 1) -> None:
     raise SystemExit(f"ERROR: {msg}")
 
@@ -56,14 +53,6 @@ def load_json(p: Path) -> Any:
         die(f"Failed to parse JSON: {p} ({e})")
 
 
-def list_peptide_files() -> list[Path]:
-    return sorted([p for p in PEPTIDES_DIR.glob("*.json") if not p.name.startswith("_")])
-
-
-def list_blend_files() -> list[Path]:
-    return sorted([p for p in BLENDS_DIR.glob("*.json") if not p.name.startswith("_")])
-
-
 def safety_ids() -> set[str]:
     if not SAFETY_INDEX.exists():
         return set()
@@ -99,21 +88,6 @@ def build_safety_links(*, developmental_risk: bool, unknowns_penalty: bool, has_
     return out
 
 
-def has_any_interaction_notes(peptide_obj: dict) -> bool:
-    # Use what exists today: interaction_summary arrays embedded in sections (if present).
-    # If those are empty, this returns False.
-    secs = peptide_obj.get("sections", [])
-    if not isinstance(secs, list):
-        return False
-    for s in secs:
-        if not isinstance(s, dict):
-            continue
-        summary = s.get("interaction_summary")
-        if isinstance(summary, list) and any(isinstance(x, str) and x.strip() for x in summary):
-            return True
-    return False
-
-
 def worse_evidence(a: str | None, b: str | None) -> str | None:
     if not a and not b:
         return None
@@ -222,21 +196,20 @@ def compute_blend_risk(component_risks: list[dict]) -> dict:
     }
 
 
-def main() -> int:
-
-    allowed_safety = safety_ids()
-
-    # Build peptide risk map
+def load_peptide_risks() -> tuple[dict[str, dict], dict[str, bool]]:
+    """Peptide risk blocks and interaction-note flags by peptide slug (dies on an invalid risk block)."""
     pep_risk_by_slug: dict[str, dict] = {}
     pep_has_interactions: dict[str, bool] = {}
 
-    for p in list_peptide_files():
-        d = load_json(p)
-        pep = d.get("peptide", {})
-        slug = pep.get("slug")
+    facts = load_facts()
+    for i in facts.rows():
+        p = facts.path[i]
+        if facts.error[i] is not None:
+            die(f"Failed to parse JSON: {p} ({facts.error[i]})")
+        slug = facts.pep_slug[i]
         if not isinstance(slug, str) or not slug.strip():
             die(f"Peptide missing slug: {p}")
-        r = pep.get("risk")
+        r = facts.risk[i]
         if not isinstance(r, dict):
             die(f"Peptide missing risk block: {p}")
 
@@ -244,8 +217,12 @@ def main() -> int:
         if not isinstance(r.get("risk_score"), int):
             die(f"Peptide risk_score must be int for {slug}")
         pep_risk_by_slug[slug] = r
-        pep_has_interactions[slug] = has_any_interaction_notes(pep)
+        pep_has_interactions[slug] = facts.interaction_notes[i]
+    return pep_risk_by_slug, pep_has_interactions
+
 
+def load_blend_components() -> dict[str, list[str]]:
+    """Component peptide slugs of every blend file, by blend slug."""
     # Build blend composition map from blends/_index.json if present
     blend_components: dict[str, list[str]] = {}
     if BLENDS_INDEX.exists():
@@ -260,45 +237,9 @@ def main() -> int:
                 if isinstance(slug, str) and isinstance(comps, list):
                     blend_components[slug] = [c for c in comps if isinstance(c, str) and c.strip()]
 
-    # Build risk entries
-    entities = []
-
-    # Peptides
-    for slug, r in sorted(pep_risk_by_slug.items()):
-        dev = bool(r.get("developmental_risk"))
-        unk = bool(r.get("unknowns_penalty"))
-        inter = bool(pep_has_interactions.get(slug, False))
-        tier = compute_risk_tier(
-            risk_score=int(r.get("risk_score")),
-            severity=r.get("severity"),
-            likelihood=r.get("likelihood"),
-            developmental_risk=dev,
-            unknowns_penalty=unk,
-        )
-        links = build_safety_links(developmental_risk=dev, unknowns_penalty=unk, has_interactions=inter)
-        links = [x for x in links if x in allowed_safety] if allowed_safety else links
-
-        entities.append({
-            "route": f"peptide:{slug}",
-            "kind": "peptide",
-            "slug": slug,
-            "risk": {
-                "risk_score": int(r.get("risk_score")),
-                "risk_tier": tier,
-                "severity": r.get("severity"),
-                "likelihood": r.get("likelihood"),
-                "evidence_grade": r.get("evidence_grade"),
-                "developmental_risk": dev,
-                "unknowns_penalty": unk,
-            },
-            "safety_links": links,
-        })
-
-    # Blends (computed)
     # Prefer blend_components from _index.json; fallback: parse each blend JSON for components (if present there)
-    blend_slugs = sorted(set([p.stem for p in list_blend_files()]))
-
-    for slug in blend_slugs:
+    out: dict[str, list[str]] = {}
+    for slug in sorted(set([p.stem for p in list_blend_files()])):
         comps = blend_components.get(slug)
         if not comps:
             # fallback to blend json
@@ -307,42 +248,116 @@ def main() -> int:
             if not isinstance(comps, list):
                 comps = []
             comps = [c for c in comps if isinstance(c, str) and c.strip()]
+        out[slug] = comps
+    return out
 
-        component_risks = [pep_risk_by_slug.get(c, {}) for c in comps]
-        br = compute_blend_risk(component_risks)
-        dev = bool(br.get("developmental_risk"))
-        unk = bool(br.get("unknowns_penalty"))
-        # blend interactions = OR of component interactions (until you add real blend interactions)
+
+def scalar_entry(
+    kind: str,
+    risk: dict,
+    comps: list[str],
+    pep_risk_by_slug: dict[str, dict],
+    pep_has_interactions: dict[str, bool],
+    allowed_safety: set[str],
+) -> dict:
+    """One entity's risk + safety_links via the per-entity reference functions."""
+    if kind == "peptide":
+        r = risk
+        inter = bool(pep_has_interactions.get(comps[0], False))
+    else:
+        r = compute_blend_risk([pep_risk_by_slug.get(c, {}) for c in comps])
         inter = any(bool(pep_has_interactions.get(c, False)) for c in comps)
+    dev = bool(r.get("developmental_risk"))
+    unk = bool(r.get("unknowns_penalty"))
+    tier = compute_risk_tier(
+        risk_score=int(r.get("risk_score")),
+        severity=r.get("severity"),
+        likelihood=r.get("likelihood"),
+        developmental_risk=dev,
+        unknowns_penalty=unk,
+    )
+    links = build_safety_links(developmental_risk=dev, unknowns_penalty=unk, has_interactions=inter)
+    links = [x for x in links if x in allowed_safety] if allowed_safety else links
+    out = {
+        "risk_score": int(r.get("risk_score")),
+        "risk_tier": tier,
+        "severity": r.get("severity"),
+        "likelihood": r.get("likelihood"),
+        "evidence_grade": r.get("evidence_grade"),
+        "developmental_risk": dev,
+        "unknowns_penalty": unk,
+    }
+    if kind == "blend":
+        out["computed_from_components"] = True
+        out["component_slugs"] = comps
+    return {"risk": out, "safety_links": links}
+
+
+def check_scalar(
+    entities: list[dict],
+    pep_risk_by_slug: dict[str, dict],
+    pep_has_interactions: dict[str, bool],
+    allowed_safety: set[str],
+) -> None:
+    for e in entities:
+        comps = e["risk"]["component_slugs"] if e["kind"] == "blend" else [e["slug"]]
+        ref = scalar_entry(e["kind"], pep_risk_by_slug.get(e["slug"], {}), comps, pep_risk_by_slug, pep_has_interactions, allowed_safety)
+        if ref != {"risk": e["risk"], "safety_links": e["safety_links"]}:
+            die(f"Risk engine disagrees with per-entity scoring for {e['route']}: {e['risk']} != {ref['risk']}")
+    print(f"OK: risk engine matches per-entity scoring ({len(entities)} entities)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--check-scalar", action="store_true", help="Cross-check the batched engine against the per-entity functions")
+    args = ap.parse_args(argv)
+
+    allowed_safety = safety_ids()
 
-        tier = compute_risk_tier(
-            risk_score=int(br.get("risk_score")),
-            severity=br.get("severity"),
-            likelihood=br.get("likelihood"),
-            developmental_risk=dev,
-            unknowns_penalty=unk,
-        )
-        links = build_safety_links(developmental_risk=dev, unknowns_penalty=unk, has_interactions=inter)
-        links = [x for x in links if x in allowed_safety] if allowed_safety else links
+    pep_risk_by_slug, pep_has_interactions = load_peptide_risks()
+    blend_components = load_blend_components()
 
+    # Build risk entries (all peptides and blends scored in one batched pass)
+    engine = RiskEngine(pep_risk_by_slug, pep_has_interactions, allowed_safety)
+    entities = []
+
+    # Peptides
+    for e in engine.peptides():
+        entities.append({
+            "route": f"peptide:{e['slug']}",
+            "kind": "peptide",
+            "slug": e["slug"],
+            "risk": e["risk"],
+            "safety_links": e["safety_links"],
+        })
+
+    # Blends (computed)
+    blend_slugs = sorted(blend_components)
+    stacks = [blend_components[slug] for slug in blend_slugs]
+
+    # blend interactions = OR of component interactions (until you add real blend interactions)
+    for slug, comps, br in zip(blend_slugs, stacks, engine.blends(stacks)):
         entities.append({
             "route": f"blend:{slug}",
             "kind": "blend",
             "slug": slug,
             "risk": {
-                "risk_score": int(br.get("risk_score")),
-                "risk_tier": tier,
-                "severity": br.get("severity"),
-                "likelihood": br.get("likelihood"),
-                "evidence_grade": br.get("evidence_grade"),
-                "developmental_risk": dev,
-                "unknowns_penalty": unk,
+                "risk_score": br["risk_score"],
+                "risk_tier": br["risk_tier"],
+                "severity": br["severity"],
+                "likelihood": br["likelihood"],
+                "evidence_grade": br["evidence_grade"],
+                "developmental_risk": br["developmental_risk"],
+                "unknowns_penalty": br["unknowns_penalty"],
                 "computed_from_components": True,
                 "component_slugs": comps,
             },
-            "safety_links": links,
+            "safety_links": br["safety_links"],
         })
 
+    if args.check_scalar:
+        check_scalar(entities, pep_risk_by_slug, pep_has_interactions, allowed_safety)
+
     out = {
         "version": "v1",
         "generated_on": date.today().isoformat(),
@@ -354,8 +369,8 @@ def main() -> int:
         "entities": entities,
     }
 
-    OUT_PATH.write_text(json.dumps(out, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    print(f"Wrote: {OUT_PATH} (entities={len(entities)})")
+    changed = write_json_if_changed(OUT_PATH, out)
+    print(f"{'Wrote' if changed else 'Unchanged'}: {OUT_PATH} (entities={len(entities)})")
     return 0
 
 
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -17,6 +18,10 @@ from typing import Any, Dict, List, Optional
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.lib.peptide_facts import load_facts  # type: ignore
 PEPTIDES_DIR = REPO_ROOT / "content" / "peptides"
 SEARCH_INDEX_PATH = PEPTIDES_DIR / "_search_index.json"
 REPORTS_DIR = REPO_ROOT / "scripts" / "index" / "_reports"
@@ -37,10 +42,6 @@ class IndexItem:
     primary_topics: List[str]
 
 
-def _load_json(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def _safe_bool(v: Any, default: bool = False) -> bool:
     if isinstance(v, bool):
         return v
@@ -52,19 +53,8 @@ def _safe_bool(v: Any, default: bool = False) -> bool:
     return default
 
 
-def _list_peptide_files() -> List[Path]:
-    files: List[Path] = []
-    for p in PEPTIDES_DIR.glob("*.json"):
-        if p.name.startswith("_"):
-            continue
-        files.append(p)
-    return sorted(files, key=lambda x: x.name)
-
-
-def _extract_primary_topics(doc: Dict[str, Any]) -> List[str]:
-    pep = doc.get("peptide", {}) or {}
-    meta = pep.get("meta", {}) or {}
-    topics = meta.get("primary_topics", []) or []
+def _extract_primary_topics(topics: Any) -> List[str]:
+    topics = topics or []
     if isinstance(topics, str):
         topics = [t.strip() for t in topics.split("|") if t.strip()]
     if not isinstance(topics, list):
@@ -80,22 +70,21 @@ def build_index() -> Dict[str, Any]:
     items: List[IndexItem] = []
     warnings: List[str] = []
 
-    for path in _list_peptide_files():
-        try:
-            doc = _load_json(path)
-        except Exception as e:
-            warnings.append(f"Failed to parse {path.name}: {e}")
+    facts = load_facts()
+    for i in facts.rows():
+        name = Path(facts.path[i]).name
+        if facts.error[i] is not None:
+            warnings.append(f"Failed to parse {name}: {facts.error[i]}")
             continue
 
-        pep = doc.get("peptide", {}) or {}
-        canonical = (pep.get("canonical_name") or "").strip()
-        slug = path.stem.strip()
+        canonical = (facts.canonical_name[i] or "").strip()
+        slug = facts.slug[i].strip()
         if not canonical or not slug:
-            warnings.append(f"Missing canonical_name or slug for {path.name}")
+            warnings.append(f"Missing canonical_name or slug for {name}")
             continue
 
-        short = (pep.get("short_name") or canonical).strip()
-        aliases = pep.get("aliases") or []
+        short = (facts.short_name[i] or canonical).strip()
+        aliases = facts.aliases[i] or []
         if isinstance(aliases, str):
             aliases = [a.strip() for a in aliases.split("|") if a.strip()]
         if not isinstance(aliases, list):
@@ -103,9 +92,9 @@ def build_index() -> Dict[str, Any]:
         aliases = [a.strip() for a in aliases if isinstance(a, str) and a.strip()]
         aliases = sorted(set(aliases))
 
-        classification = pep.get("classification", {}) or {}
-        status = pep.get("status", {}) or {}
-        risk = pep.get("risk", {}) or {}
+        classification = facts.classification[i] or {}
+        status = facts.status[i] or {}
+        risk = facts.risk[i] or {}
 
         status_category = (status.get("category") or classification.get("category") or "").strip()
         needs_rx = _safe_bool(classification.get("needs_prescription"), default=False)
@@ -115,7 +104,7 @@ def build_index() -> Dict[str, Any]:
         ev_grade = (risk.get("evidence_grade") or "unknown").strip()
         dev_risk = _safe_bool(risk.get("developmental_risk"), default=False)
 
-        primary_topics = _extract_primary_topics(doc)
+        primary_topics = _extract_primary_topics(facts.primary_topics[i])
 
         items.append(IndexItem(
             slug=slug,
@@ -171,12 +160,12 @@ def build_index() -> Dict[str, Any]:
     return out_doc
 
 
-def main() -> int:
+def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--write", action="store_true", help="Write content/peptides/_search_index.json")
     ap.add_argument("--check", action="store_true", help="Do not write; exit 2 if file differs from generated output")
     ap.add_argument("--report", action="store_true", help="Write scripts/index/_reports/<timestamp>.json")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     if args.write and args.check:
         print("ERROR: Use only one of --write or --check")
@@ -197,7 +186,7 @@ def main() -> int:
 
     # --write mode
     if args.write:
-        SEARCH_INDEX_PATH.write_text(generated, encoding="utf-8")
+        write_json_if_changed(SEARCH_INDEX_PATH, doc, ensure_ascii=True)
 
     # report (allowed in either mode; but in check mode we returned already)
     if args.report:
@@ -13,6 +13,9 @@ Rules:
 - Uses synonyms map (content/_taxonomy/search_synonyms_v1.json) as an explicit override-free boost.
 - Uses peptide_search_index_v1 for canonical_name + aliases.
 - Uses entities_v1 + blends registry for existence + taxonomy_keys.
+
+Also emits content/_index/search_routes_v1.pack (compiled, checksummed copy the
+Python resolver prefers for cold start; see scripts/search/routes_pack.py).
 """
 
 from __future__ import annotations
@@ -23,6 +26,11 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.search.routes_pack import write_pack  # type: ignore
+
 
 def die(msg: str, code: int = 1) -> None:
     print(f"ERROR: {msg}", file=sys.stderr)
@@ -423,8 +431,12 @@ def main() -> int:
         pass
 
 
-    out_path.write_text(json.dumps(out, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    print(f"Wrote {out_path} (terms={len(out_terms)})")
+    changed = write_json_if_changed(out_path, out)
+    print(f"{'Wrote' if changed else 'Unchanged'} {out_path} (terms={len(out_terms)})")
+
+    pack_path = out_path.with_suffix(".pack")
+    size, pack_changed = write_pack(out_path, pack_path)
+    print(f"{'Wrote' if pack_changed else 'Unchanged'} {pack_path} ({size} bytes)")
     return 0
 
 
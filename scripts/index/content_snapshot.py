@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared, read-only content snapshot for in-process index rebuilds.
+
+The corpus (peptides, blends, topic pages, taxonomy, governance, indexes) is parsed
+once up front and kept as immutable marshal blobs. Every load hands out a fresh,
+mutable copy (marshal.loads is several times cheaper than json.loads), so one step
+mutating what it loaded can never leak into the next step.
+
+Entries are keyed on resolved path and validated against (mtime_ns, size) on every
+access: when a step rewrites a file (e.g. entities_v1.json), later steps see the new
+content automatically.
+
+The memo itself is scripts/lib/content.py's ContentLoader (so PEPTIDE_CONTENT_CACHE=1
+also lets the snapshot skip parsing unchanged files). Used by
+scripts/index/rebuild_all_indexes.py, which swaps each step module's
+load_json/_load_json for a snapshot-backed version before calling its main().
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.content import _MISS, ContentLoader  # type: ignore
+
+SNAPSHOT_DIRS = (
+    "content/peptides",
+    "content/blends",
+    "content/topics",
+    "content/topics/pages",
+    "content/_taxonomy",
+    "content/_governance",
+    "content/_index",
+    "content/safety",
+)
+
+# Step-module attributes that are swapped for snapshot-backed loaders.
+LOADER_NAMES = ("load_json", "_load_json")
+
+
+class ContentSnapshot(ContentLoader):
+    def __init__(self, root: Path = ROOT, dirs: tuple[str, ...] = SNAPSHOT_DIRS, disk_cache: bool | Path | None = None) -> None:
+        super().__init__(disk_cache=disk_cache)
+        self.root = root
+        self.dirs = dirs
+
+    def preload(self) -> int:
+        """Parse every JSON file under the snapshot dirs once. Unparseable files are left to the step loaders."""
+        n = 0
+        for d in self.dirs:
+            base = self.root / d
+            if not base.is_dir():
+                continue
+            for p in sorted(base.glob("*.json")):
+                try:
+                    self._read(p)
+                    n += 1
+                except Exception:
+                    continue
+        return n
+
+    def wrap_loader(self, loader: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Snapshot-backed drop-in for a script's own loader. Misses go through the
+        original loader so its error handling (die()/fail() messages) is unchanged.
+        """
+        if getattr(loader, "_snapshot_wrapped", False):
+            return loader
+
+        def wrapped(p, *args, **kwargs):
+            if args or kwargs:
+                return loader(p, *args, **kwargs)
+            obj = self.get(p)
+            if obj is not _MISS:
+                self.hits += 1
+                return obj
+            self.misses += 1
+            obj = loader(p)
+            # put() serializes now, so the caller may mutate obj freely.
+            self.put(p, obj)
+            return obj
+
+        wrapped._snapshot_wrapped = True  # type: ignore[attr-defined]
+        wrapped.__wrapped__ = loader  # type: ignore[attr-defined]
+        wrapped.__name__ = getattr(loader, "__name__", "load_json")
+        return wrapped
+
+    def install(self, module: Any) -> list[str]:
+        """Swap the module's JSON loaders for snapshot-backed ones. Returns the names swapped."""
+        swapped = []
+        for name in LOADER_NAMES:
+            fn = getattr(module, name, None)
+            if callable(fn):
+                setattr(module, name, self.wrap_loader(fn))
+                swapped.append(name)
+        return swapped
@@ -10,85 +10,602 @@ Order matters:
 5) Build unified entities index (peptides + blends)
 6) Validate unified entities index
 
+The content corpus is parsed once into a shared, read-only snapshot
+(scripts/index/content_snapshot.py) and each builder/validator's main() is called as a
+function against it. Steps declare their inputs/outputs; the dependency graph derived
+from them lets independent steps (validators, risk/interactions/category indexes, ...)
+run concurrently on a forked process pool (--jobs, default CPU count).
+Each step's output is buffered and printed in list order, so logs and artifacts are the
+same at any --jobs; -j1 runs serially with live output. Use --subprocess for the old
+behavior (one interpreter per step) when debugging a single script.
+--only builders / --only validators restricts the run to steps that write artifacts /
+steps that only check (e.g. a content patch rebuilds the affected indexes first and
+reports the validation gates separately); --exclude SCRIPT drops a step by script path.
+
 This script is deterministic and should be safe to run repeatedly.
 """
 
 from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import multiprocessing
+import os
 import subprocess
 import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
+from typing import TextIO
 
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.index.content_snapshot import ContentSnapshot  # type: ignore
+from scripts.lib import atomic_io, content  # type: ignore
+from scripts.lib.peptide_facts import load_facts  # type: ignore
+from scripts.index.rebuild_state import (  # type: ignore
+    Hasher,
+    Tree,
+    describe_diff,
+    diff_hashes,
+    expand,
+    load_state,
+    save_state,
+    spec_matches,
+    specs_overlap,
+)
+
+
+# Inputs / outputs (repo-relative globs). "[!_]" skips registries like _index.json.
+PEPTIDE_DOCS = "content/peptides/[!_]*.json"
+PEPTIDE_INDEX = "content/peptides/_index.json"
+PEPTIDE_SEARCH_INDEX = "content/peptides/_search_index.json"
+QUEUE_CSV = "content/peptides/_queue.csv"
+PEPTIDE_TEMPLATE = "scripts/ingest/peptide_template.json"
+BLEND_DOCS = "content/blends/[!_]*.json"
+BLENDS_REGISTRY = "content/blends/_index.json"
+TOPICS_INDEX = "content/topics/_topics_index.json"
+TOPIC_PAGES = "content/topics/pages/*.json"
+TOPIC_MAP = "content/_deprecated/topics/topic_peptide_map_v1.json"
+GOVERNANCE = "content/_governance/coverage_checklist_v1.json"
+PEPTIDE_CATEGORIES = "content/_taxonomy/peptide_categories_v1.json"
+BLEND_CATEGORIES = "content/_taxonomy/blend_categories_v1.json"
+INTERACTION_CLASSES = "content/_taxonomy/interaction_classes_v1.json"
+SEARCH_SYNONYMS = "content/_taxonomy/search_synonyms_v1.json"
+SAFETY_INDEX = "content/safety/_safety_index.json"
+ENTITIES = "content/_index/entities_v1.json"
+INTERACTIONS_TO_PEPTIDES = "content/_index/interactions_to_peptides_v1.json"
+INTERACTION_OVERLAP = "content/_index/interaction_overlap_v1.json"
+RISK_INDEX = "content/_index/risk_index_v1.json"
+STACK_RISK_TABLE = "content/_index/stack_risk_table_v1.json"
+CATEGORIES = "content/_index/categories_v1.json"
+SEARCH_ROUTES = "content/_index/search_routes_v1.json"
+SEARCH_ROUTES_PACK = "content/_index/search_routes_v1.pack"
+FULLTEXT_PACK = "content/_index/fulltext_v1.pack"
+CORPUS_BUNDLE = "content/_index/corpus_v1.jsonl"
+CORPUS_OFFSETS = "content/_index/corpus_v1.jsonl.offsets.json"
+CLAIMS_INDEX = "content/_index/claims_v1.json"
+WEB_SOURCES = Tree("app/web", (".ts", ".tsx", ".js", ".jsx", ".md", ".mdx"))
+# Shared helpers every step may import (content loader, peptide facts, atomic writes).
+SHARED_LIB = "scripts/lib/*.py"
+
+
+@dataclass(frozen=True)
+class Step:
+    script: str
+    args: tuple[str, ...] = ()
+    # Declared dependency graph: what the step reads (the script itself is implied) and writes.
+    inputs: tuple[str | Tree, ...] = ()
+    outputs: tuple[str, ...] = ()
+
+    @property
+    def cmd(self) -> list[str]:
+        return ["python3", self.script, *self.args]
+
+    @property
+    def key(self) -> str:
+        return " ".join([self.script, *self.args])
 
+    @property
+    def all_inputs(self) -> tuple[str | Tree, ...]:
+        return (self.script, SHARED_LIB, *self.inputs)
 
-def run(cmd: list[str]) -> None:
-    print("\n$", " ".join(cmd))
-    subprocess.check_call(cmd, cwd=str(ROOT))
 
+def build_steps() -> list[Step]:
+    steps: list[Step] = []
 
-def main() -> int:
     # 0) Rebuild + validate topic pages (content/topics/pages)
-    run(["python3", "scripts/topics/rebuild_topic_pages.py"])
-    run(["python3", "scripts/validate/validate_topics_v1.py"])
+    steps.append(Step(
+        "scripts/topics/rebuild_topic_pages.py",
+        inputs=(TOPICS_INDEX, TOPIC_MAP, PEPTIDE_DOCS),
+        outputs=(TOPIC_PAGES,),
+    ))
+    steps.append(Step(
+        "scripts/validate/validate_topics_v1.py",
+        inputs=(TOPICS_INDEX, TOPIC_PAGES, TOPIC_MAP, PEPTIDE_DOCS),
+    ))
 
     # 1) Rebuild peptide search index (do not apply queue; just rebuild index)
     # If your generate_from_queue.py supports --rebuild-search-index without queue changes,
     # it's the canonical hook. It currently rebuilds the index even when queue is empty.
-    run(["python3", "scripts/ingest/generate_from_queue.py", "--apply", "--rebuild-search-index"])
+    steps.append(Step(
+        "scripts/ingest/generate_from_queue.py", ("--apply", "--rebuild-search-index"),
+        inputs=(QUEUE_CSV, PEPTIDE_TEMPLATE, TOPICS_INDEX, PEPTIDE_DOCS, "scripts/index/build_search_index.py"),
+        # --apply also writes queue-created docs and developmental-risk fixes back into peptides/
+        outputs=(PEPTIDE_INDEX, PEPTIDE_SEARCH_INDEX, PEPTIDE_DOCS),
+    ))
 
     # 2) Taxonomy validation (peptides + blends + governance)
-    run(["python3", "scripts/validate/validate_taxonomy_keys.py"])
+    steps.append(Step(
+        "scripts/validate/validate_taxonomy_keys.py",
+        inputs=(PEPTIDE_CATEGORIES, BLEND_CATEGORIES, GOVERNANCE, BLENDS_REGISTRY, PEPTIDE_DOCS),
+    ))
 
     # 2b) Validate queue CSV (topic ids, structure)
-    run(["python3", "scripts/validate/validate_queue_csv.py"])
+    steps.append(Step("scripts/validate/validate_queue_csv.py", inputs=(QUEUE_CSV,)))
 
     # Practical block validation (benefits/side-effects/cautions) — real-world voice guardrail
-    run(["python3", "scripts/validate/validate_practical_block_v1.py"])  # PEP_TALK__ADD_PRACTICAL_VALIDATE_V1
-    run(["python3", "scripts/validate/validate_pdp_contract_v1.py"])
+    steps.append(Step("scripts/validate/validate_practical_block_v1.py", inputs=(PEPTIDE_DOCS,)))  # PEP_TALK__ADD_PRACTICAL_VALIDATE_V1
+    steps.append(Step(
+        "scripts/validate/validate_pdp_contract_v1.py",
+        inputs=(PEPTIDE_DOCS, BLEND_DOCS, WEB_SOURCES),
+    ))
 
     # 3) Validate blend JSON stubs
-    # Validate every blend json file (excluding _index.json + README)
-    blends_dir = ROOT / "content" / "blends"
-    for p in sorted(blends_dir.glob("*.json")):
-        if p.name.startswith("_"):
-            continue
-        run(["python3", "scripts/validate/validate_blend_json.py", str(p)])
+    # Every blend json file (excluding _index.json + README) in one multi-file run
+    steps.append(Step("scripts/validate/validate_blend_json.py", ("content/blends",), inputs=(BLEND_DOCS,)))
 
     # 4) Validate blends registry consistency
-    run(["python3", "scripts/validate/validate_blends_registry_consistency.py"])
+    steps.append(Step(
+        "scripts/validate/validate_blends_registry_consistency.py",
+        inputs=(BLENDS_REGISTRY, BLEND_DOCS, BLEND_CATEGORIES),
+    ))
 
     # 5) Build unified entities index
-    run(["python3", "scripts/index/build_entities_index.py"])
+    steps.append(Step(
+        "scripts/index/build_entities_index.py",
+        inputs=(PEPTIDE_DOCS, BLEND_DOCS, BLENDS_REGISTRY, TOPIC_PAGES, GOVERNANCE),
+        outputs=(ENTITIES,),
+    ))
 
     # 6) Validate unified entities index
-    run(["python3", "scripts/validate/validate_entities_index.py"])
+    steps.append(Step(
+        "scripts/validate/validate_entities_index.py",
+        inputs=(ENTITIES, PEPTIDE_DOCS, BLEND_DOCS, BLENDS_REGISTRY),
+    ))
 
     # Build + validate interactions reverse index (interaction_slug -> peptides)
-    run(["python3", "scripts/index/rebuild_interactions_to_peptides_index_v1.py"])
-    run(["python3", "scripts/validate/validate_interactions_to_peptides_index_v1.py"])  # PEP_TALK__ADD_REVINDEX_VALIDATE_V1
+    steps.append(Step(
+        "scripts/index/rebuild_interactions_to_peptides_index_v1.py",
+        inputs=(ENTITIES, INTERACTION_CLASSES, PEPTIDE_DOCS),
+        outputs=(INTERACTIONS_TO_PEPTIDES, INTERACTION_OVERLAP),
+    ))
+    steps.append(Step(
+        "scripts/validate/validate_interactions_to_peptides_index_v1.py",
+        inputs=(INTERACTION_CLASSES, INTERACTIONS_TO_PEPTIDES),
+    ))  # PEP_TALK__ADD_REVINDEX_VALIDATE_V1
 
     # 6b) Build + validate unified risk index (peptides direct; blends computed)
-    run(["python3", "scripts/index/build_risk_index.py"])
-    run(["python3", "scripts/validate/validate_risk_index_v1.py"])
-
+    steps.append(Step(
+        "scripts/index/build_risk_index.py",
+        inputs=(PEPTIDE_DOCS, BLEND_DOCS, BLENDS_REGISTRY, SAFETY_INDEX, "scripts/index/risk_engine.py"),
+        outputs=(RISK_INDEX,),
+    ))
+    steps.append(Step("scripts/validate/validate_risk_index_v1.py", inputs=(RISK_INDEX, SAFETY_INDEX)))
+    steps.append(Step(
+        "scripts/index/stack_risk.py",
+        ("--write-table",),
+        inputs=(
+            PEPTIDE_DOCS, BLEND_DOCS, BLENDS_REGISTRY, SAFETY_INDEX,
+            "scripts/index/risk_engine.py", "scripts/index/build_risk_index.py",
+        ),
+        outputs=(STACK_RISK_TABLE,),
+    ))
 
     # 7) Build Explore-by-Category index
-    run(["python3", "scripts/index/build_category_index.py"])
+    steps.append(Step(
+        "scripts/index/build_category_index.py",
+        inputs=(PEPTIDE_CATEGORIES, BLEND_CATEGORIES, GOVERNANCE, ENTITIES, BLENDS_REGISTRY),
+        outputs=(CATEGORIES,),
+    ))
 
     # 8) Validate Explore-by-Category index
-    run(["python3", "scripts/validate/validate_category_index.py"])
+    steps.append(Step(
+        "scripts/validate/validate_category_index.py",
+        inputs=(CATEGORIES, PEPTIDE_CATEGORIES, ENTITIES, BLENDS_REGISTRY),
+    ))
 
     # 9) Build Search Routes index (routing-smart search layer)
-    run(["python3", "scripts/index/build_search_routes_index.py"])
+    steps.append(Step(
+        "scripts/index/build_search_routes_index.py",
+        inputs=(ENTITIES, PEPTIDE_SEARCH_INDEX, BLENDS_REGISTRY, SEARCH_SYNONYMS, PEPTIDE_CATEGORIES, TOPIC_PAGES,
+                "scripts/search/routes_pack.py"),
+        outputs=(SEARCH_ROUTES, SEARCH_ROUTES_PACK),
+    ))
 
     # 10) Validate Search Routes index
-    run(["python3", "scripts/validate/validate_search_routes_index.py"])
+    steps.append(Step(
+        "scripts/validate/validate_search_routes_index.py",
+        inputs=(SEARCH_ROUTES, ENTITIES, PEPTIDE_CATEGORIES),
+    ))
 
     # 11) Validate deterministic query resolver behavior
-    run(["python3", "scripts/validate/validate_query_resolver.py"])
+    steps.append(Step(
+        "scripts/validate/validate_query_resolver.py",
+        inputs=(SEARCH_ROUTES, SEARCH_ROUTES_PACK, SEARCH_SYNONYMS, "scripts/search/*.py"),
+    ))
+
+    # 11b) Build BM25 full-text index (section text; resolver fallback for unrouted queries)
+    steps.append(Step(
+        "scripts/search/fulltext_index.py",
+        inputs=(PEPTIDE_DOCS, BLEND_DOCS, "scripts/search/routes_pack.py"),
+        outputs=(FULLTEXT_PACK,),
+    ))
+
+    # 12) Build JSONL corpus bundle (+ byte-offset sidecar) for streaming / seeking consumers
+    steps.append(Step(
+        "scripts/index/build_corpus_bundle.py",
+        inputs=(PEPTIDE_DOCS, BLEND_DOCS, TOPIC_PAGES),
+        outputs=(CORPUS_BUNDLE, CORPUS_OFFSETS),
+    ))
+
+    # 13) Build claim fingerprint index (current state; the --changed baseline is the committed copy)
+    steps.append(Step(
+        "scripts/index/build_claim_index.py",
+        inputs=(PEPTIDE_DOCS,),
+        outputs=(CLAIMS_INDEX,),
+    ))
+
+    return steps
+
+
+def why_run(step: Step, record: dict | None, hasher: Hasher, pending_outputs: set[str]) -> tuple[str | None, dict[str, str]]:
+    """
+    Returns (reason-to-run or None when up to date, current input hashes).
+    pending_outputs: outputs of earlier steps that will run but have not yet (plan-only mode).
+    """
+    inputs = hasher.specs(step.all_inputs)
+    if record is None:
+        return "no previous successful run recorded", inputs
+
+    upstream = sorted(p for p in pending_outputs if any(spec_matches(s, p) for s in step.all_inputs))
+    if upstream:
+        return f"upstream output will be rebuilt: {', '.join(upstream[:3])}", inputs
+
+    changed, added, removed = diff_hashes(record.get("inputs", {}), inputs)
+    if changed or added or removed:
+        return "inputs " + describe_diff(changed, added, removed), inputs
+
+    recorded_out = record.get("outputs", {})
+    current_out = hasher.specs(step.outputs)
+    missing = sorted(k for k in recorded_out if k not in current_out)
+    if missing or (step.outputs and not current_out):
+        return f"output missing: {', '.join(missing[:3]) or ', '.join(step.outputs)}", inputs
+    changed, added, _ = diff_hashes(recorded_out, current_out)
+    if changed or added:
+        return "outputs modified outside the rebuild: " + ", ".join((changed + added)[:3]), inputs
+
+    return None, inputs
+
+
+_MODULES: dict[str, ModuleType] = {}
+
+
+def load_step_module(script: str) -> ModuleType:
+    mod = _MODULES.get(script)
+    if mod is not None:
+        return mod
+    path = ROOT / script
+    name = "_rebuild_step_" + path.stem
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load step script: {path}")
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    _MODULES[script] = mod
+    return mod
+
+
+def _exit_code(code: object) -> int:
+    # Mirror the interpreter: None -> 0, int -> itself, anything else is printed -> 1.
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_inprocess(step: Step, snapshot: ContentSnapshot) -> int:
+    mod = load_step_module(step.script)
+
+    # Steps and the helper modules they import (scripts.*) read through the snapshot.
+    snapshot.install(mod)
+    for name, m in list(sys.modules.items()):
+        if name.startswith("scripts.") and m is not None:
+            snapshot.install(m)
+
+    main = getattr(mod, "main", None)
+    if not callable(main):
+        print(f"ERROR: {step.script} has no main()", file=sys.stderr)
+        return 1
+
+    old_argv = sys.argv
+    sys.argv = [str(ROOT / step.script), *step.args]
+    try:
+        rc = _exit_code(main())
+    except SystemExit as e:
+        rc = _exit_code(e.code)
+    except Exception:
+        traceback.print_exc()
+        rc = 1
+    finally:
+        sys.argv = old_argv
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return rc
+
+
+def run_subprocess(step: Step) -> int:
+    return subprocess.call(step.cmd, cwd=str(ROOT))
+
+
+def build_graph(steps: list[Step]) -> list[set[int]]:
+    """
+    deps[j] = earlier steps j must wait for. Edges keep the serial semantics of the list:
+    j waits for i < j when j reads what i writes, writes what i reads, or writes what i writes.
+    """
+    deps: list[set[int]] = [set() for _ in steps]
+    for j, b in enumerate(steps):
+        for i in range(j):
+            a = steps[i]
+            if (
+                any(specs_overlap(o, x) for o in a.outputs for x in b.all_inputs)
+                or any(specs_overlap(o, x) for o in b.outputs for x in a.all_inputs)
+                or any(specs_overlap(o, x) for o in a.outputs for x in b.outputs)
+            ):
+                deps[j].add(i)
+    return deps
+
+
+def critical_path(steps: list[Step], deps: list[set[int]]) -> int:
+    depth = [0] * len(steps)
+    for j in range(len(steps)):
+        depth[j] = 1 + max((depth[i] for i in deps[j]), default=0)
+    return max(depth, default=0)
+
+
+# Set by main() before the worker pool forks; workers inherit the preloaded snapshot.
+_POOL_SNAPSHOT: ContentSnapshot | None = None
+
+
+def _pool_run(step: Step, use_subprocess: bool) -> tuple[int, str, int, int, int, int]:
+    """
+    Run one step with its output captured.
+    Returns (rc, output, snapshot hits, snapshot misses, files written, files unchanged).
+    """
+    if use_subprocess:
+        p = subprocess.run(step.cmd, cwd=str(ROOT), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        return p.returncode, p.stdout, 0, 0, 0, 0
+
+    snapshot = _POOL_SNAPSHOT if _POOL_SNAPSHOT is not None else ContentSnapshot()
+    hits, misses = snapshot.hits, snapshot.misses
+    written, unchanged = atomic_io.STATS.written, atomic_io.STATS.unchanged
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf), contextlib.redirect_stderr(buf):
+        rc = run_inprocess(step, snapshot)
+    return (
+        rc, buf.getvalue(),
+        snapshot.hits - hits, snapshot.misses - misses,
+        atomic_io.STATS.written - written, atomic_io.STATS.unchanged - unchanged,
+    )
+
+
+class _InlineExecutor:
+    """jobs=1: run each step immediately in this process with live output."""
+
+    def __init__(self, snapshot: ContentSnapshot, use_subprocess: bool) -> None:
+        self.snapshot = snapshot
+        self.use_subprocess = use_subprocess
+
+    def submit(self, step: Step) -> Future:
+        fut: Future = Future()
+        print("\n$", " ".join(step.cmd))
+        rc = run_subprocess(step) if self.use_subprocess else run_inprocess(step, self.snapshot)
+        fut.set_result((rc, None, 0, 0, 0, 0))
+        return fut
+
+    def shutdown(self) -> None:
+        pass
+
+
+class _PoolExecutor:
+    def __init__(self, jobs: int, use_subprocess: bool) -> None:
+        self.use_subprocess = use_subprocess
+        if use_subprocess:
+            # Each step is its own interpreter already; threads only wait on them.
+            self.pool = ThreadPoolExecutor(max_workers=jobs)
+        else:
+            self.pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("fork"))
+
+    def submit(self, step: Step) -> Future:
+        return self.pool.submit(_pool_run, step, self.use_subprocess)
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=True)
+
+
+def default_jobs() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def main(argv: list[str] | None = None) -> int:
+    global _POOL_SNAPSHOT
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--subprocess", action="store_true", help="Run each step in its own python3 process (legacy mode)")
+    ap.add_argument("--keep-going", action="store_true", help="Run remaining steps after a failure; report all failures at the end")
+    ap.add_argument("--full", action="store_true", help="Ignore recorded fingerprints and run every step")
+    ap.add_argument("--explain", action="store_true", help="Print why each step runs or is skipped")
+    ap.add_argument("--plan", action="store_true", help="Only print the run/skip plan (implies --explain); run nothing")
+    ap.add_argument("-j", "--jobs", type=int, default=default_jobs(), help="Independent steps to run at once (default: CPU count; 1 = serial, live output)")
+    ap.add_argument("--only", choices=("builders", "validators"), help="Run only steps that write outputs / only steps that validate")
+    ap.add_argument("--exclude", action="append", default=[], metavar="SCRIPT", help="Skip the step(s) running this script (repeatable)")
+    args = ap.parse_args(argv)
+    explain = args.explain or args.plan
+    jobs = max(1, args.jobs)
+    if jobs > 1 and not args.subprocess and "fork" not in multiprocessing.get_all_start_methods():
+        jobs = 1
+
+    # Several steps resolve paths relative to the cwd (Path(".")).
+    os.chdir(ROOT)
+
+    t0 = time.perf_counter()
+    snapshot = ContentSnapshot()
+    if not args.subprocess and not args.plan:
+        n = snapshot.preload()
+        # Shared-loader reads (the peptide facts table included) go through the snapshot too;
+        # the facts are built here once so forked workers inherit them.
+        content.set_default_loader(snapshot)
+        facts = load_facts()
+        print(f"Content snapshot: {n} JSON documents, {len(facts)} peptide fact rows ({(time.perf_counter() - t0) * 1000:.0f}ms)")
+
+    state = load_state()
+    records: dict = state["steps"]
+    hasher = Hasher()
+    steps = build_steps()
+    if args.only:
+        steps = [s for s in steps if bool(s.outputs) == (args.only == "builders")]
+    if args.exclude:
+        steps = [s for s in steps if s.script not in args.exclude]
+
+    if args.plan:
+        pending_outputs: set[str] = set()
+        ran = 0
+        for step in steps:
+            reason = "--full" if args.full else why_run(step, records.get(step.key), hasher, pending_outputs)[0]
+            if reason is None:
+                print(f"\nSKIP {step.key}: up to date")
+                continue
+            print(f"\nRUN  {step.key}: {reason}")
+            for spec in step.outputs:
+                pending_outputs.update(expand(spec) or [spec])
+            ran += 1
+        print(f"\nPlan: run={ran} skip={len(steps) - ran}")
+        return 0
+
+    deps = build_graph(steps)
+    if jobs > 1:
+        print(f"Scheduler: {len(steps)} steps, jobs={jobs}, longest dependency chain={critical_path(steps, deps)}")
+
+    _POOL_SNAPSHOT = snapshot
+    executor = _InlineExecutor(snapshot, args.subprocess) if jobs == 1 else _PoolExecutor(jobs, args.subprocess)
+
+    # Output is buffered per step and printed in list order, so logs read the same at any -j.
+    blocks: dict[int, list[tuple[TextIO, str]]] = {}
+    printed = 0
+    finished: set[int] = set()
+    running: dict[Future, int] = {}
+    failed: list[tuple[Step, int]] = []
+    ran = skipped = 0
+    stop = False
+
+    def flush() -> None:
+        nonlocal printed
+        while printed in finished:
+            for stream, text in blocks.pop(printed, []):
+                stream.flush()
+                print(text, end="", file=stream)
+                stream.flush()
+            printed += 1
+        sys.stdout.flush()
+
+    def complete(i: int, rc: int, output: str | None, hits: int, misses: int, written: int, unchanged: int) -> None:
+        nonlocal stop
+        step = steps[i]
+        snapshot.hits += hits
+        snapshot.misses += misses
+        atomic_io.STATS.written += written
+        atomic_io.STATS.unchanged += unchanged
+        if output is not None:
+            blocks.setdefault(i, []).append((sys.stdout, output))
+        if rc != 0:
+            records.pop(step.key, None)
+            blocks.setdefault(i, []).append((sys.stderr, f"\nFAIL: {' '.join(step.cmd)} (exit {rc})\n"))
+            failed.append((step, rc))
+            if not args.keep_going:
+                stop = True
+        else:
+            # Fingerprint after the step: it may rewrite its own inputs (e.g. queue-driven peptide fixes).
+            records[step.key] = {
+                "inputs": hasher.specs(step.all_inputs),
+                "outputs": hasher.specs(step.outputs),
+            }
+        save_state(state)
+        blocks.setdefault(i, [])
+        finished.add(i)
+
+    try:
+        while True:
+            # deps point only to earlier steps, so one in-order pass releases everything ready
+            # (including steps unblocked by skips earlier in the same pass).
+            submitted = {*finished, *running.values()}
+            for i, step in enumerate(steps):
+                if stop:
+                    break
+                if i in submitted or not deps[i] <= finished:
+                    continue
+                reason = "--full" if args.full else why_run(step, records.get(step.key), hasher, set())[0]
+                if reason is None:
+                    skipped += 1
+                    blocks[i] = [(sys.stdout, f"\nSKIP {step.key}: up to date\n")] if explain else []
+                    finished.add(i)
+                    continue
+                ran += 1
+                if jobs == 1:
+                    flush()
+                    if explain:
+                        print(f"\nRUN  {step.key}: {reason}")
+                    complete(i, *executor.submit(step).result())
+                else:
+                    header = (f"\nRUN  {step.key}: {reason}\n" if explain else "") + f"\n$ {' '.join(step.cmd)}\n"
+                    blocks[i] = [(sys.stdout, header)]
+                    running[executor.submit(step)] = i
+            flush()
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in sorted(done, key=lambda f: running[f]):
+                i = running.pop(fut)
+                try:
+                    result = fut.result()
+                except Exception as e:  # worker died (e.g. killed); report like a failed step
+                    result = (1, f"ERROR: worker failed: {e!r}\n", 0, 0, 0, 0)
+                complete(i, *result)
+    finally:
+        executor.shutdown()
+    flush()
 
-    print("\nOK: rebuild_all_indexes completed successfully.")
+    elapsed = time.perf_counter() - t0
+    if not args.subprocess:
+        print(f"\nSnapshot loads: hits={snapshot.hits} misses={snapshot.misses}")
+        print(f"Index writes: {atomic_io.STATS.summary()}")
+    print(f"Steps: ran={ran} skipped={skipped}")
+    if failed:
+        failed.sort(key=lambda f: steps.index(f[0]))
+        print(f"\nFAIL: {len(failed)} step(s) failed:", file=sys.stderr)
+        for step, rc in failed:
+            print(f"  - {' '.join(step.cmd)} (exit {rc})", file=sys.stderr)
+        return failed[0][1]
+    print(f"\nOK: rebuild_all_indexes completed successfully. ({elapsed:.2f}s)")
     return 0
 
 
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 import json
+import sys
 from pathlib import Path
 from collections import defaultdict
 from datetime import date
 
 ROOT = Path(__file__).resolve().parents[2]
-PEPTIDES_DIR = ROOT / "content" / "peptides"
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.lib.interaction_canon import iter_tokens, load_canonicalizer  # type: ignore
+from scripts.lib.peptide_facts import load_facts  # type: ignore
 OUT_DIR = ROOT / "content" / "_index"
 OUT_FP = OUT_DIR / "interactions_v1.json"
 
@@ -57,115 +62,46 @@ def load_governed_peptide_slugs() -> list[str]:
 
 
 
-def build_slug_map(tax: dict, section: str) -> dict:
-    """
-    Returns: {slug: {"title": str, "aka": [str...]}}
-    Taxonomy sections are list[dict] with keys: slug,title,aka,notes...
-    """
-    out: dict = {}
-    for item in (tax.get(section) or []):
-        if not isinstance(item, dict):
-            continue
-        slug = item.get("slug")
-        if not isinstance(slug, str) or not slug.strip():
-            continue
-        slug = slug.strip()
-        title = item.get("title") if isinstance(item.get("title"), str) else slug
-        aka = item.get("aka") or []
-        aka = [a.strip() for a in aka if isinstance(a, str) and a.strip()]
-        out[slug] = {"title": title.strip(), "aka": aka}
-    return out
-
-
-def expand_terms(token: str, slug_map: dict) -> list[str]:
-    """
-    token can be a slug OR a plain term.
-    If token is a known slug, expand to [title, *aka, slug]
-    Else return [token]
-    """
-    token = norm(token)
-    if not token:
-        return []
-    if token in slug_map:
-        t = slug_map[token]
-        return [t["title"], *t["aka"], token]
-    return [token]
-
-
-def iter_tokens(items):
-    """
-    Accept list entries as:
-      - "slug-or-term"
-      - {"slug": "..."} or {"name": "..."}
-    Return normalized string tokens.
-    """
-    if not isinstance(items, list):
-        return
-    for it in items:
-        if isinstance(it, str):
-            tok = it
-        elif isinstance(it, dict):
-            tok = it.get("slug") or it.get("name") or ""
-        else:
-            continue
-        tok = norm(str(tok))
-        if tok:
-            yield tok
-
-
 def main():
     # Load taxonomy (best-effort)
-    try:
-        tax = load_json(TAX_FP)
-    except Exception:
-        tax = {}
-
-    DRUG = build_slug_map(tax, "drug_classes")
-    SUPP = build_slug_map(tax, "supplement_classes")
+    canon = load_canonicalizer(TAX_FP)
 
     drug_map = defaultdict(list)  # term -> [peptide_slug...]
     supp_map = defaultdict(list)  # term -> [peptide_slug...]
     pep_map = defaultdict(list)   # term -> [peptide_slug...]
 
     governed_slugs = load_governed_peptide_slugs()
+    facts = load_facts()
 
     total_loaded = 0
     peptides_with_any = 0
 
     for slug in governed_slugs:
-        fp = PEPTIDES_DIR / f"{slug}.json"
-        if not fp.exists():
+        i = facts.row_of(slug)
+        if i is None:
             # governed slug missing a file: skip but keep governed count stable
             continue
-        try:
-            doc = load_json(fp)
-        except Exception:
-            continue
-        if not isinstance(doc, dict):
+        if facts.error[i] is not None:
             continue
 
         total_loaded += 1
 
         # IMPORTANT: Schema-v1 interactions are TOP-LEVEL
-        interactions = doc.get("interactions")
-        if not isinstance(interactions, dict):
+        interactions = facts.interactions[i]
+        if interactions is None:
             continue
 
         hit_any = False
 
-        for token in iter_tokens(interactions.get("drug_classes")):
-            for term in expand_terms(token, DRUG):
-                t = norm(term)
-                if t:
-                    drug_map[t].append(slug)
-                    hit_any = True
-
-        for token in iter_tokens(interactions.get("supplement_classes")):
-            for term in expand_terms(token, SUPP):
-                t = norm(term)
-                if t:
-                    supp_map[t].append(slug)
-                    hit_any = True
+        # A token that resolves to a class is indexed under its title, aka and slug; else as written.
+        for bucket, term_map in (("drug_classes", drug_map), ("supplement_classes", supp_map)):
+            for token in iter_tokens(interactions.get(bucket)):
+                cls = canon.resolve(token, bucket)
+                for term in canon.display_terms(cls, bucket) or [token]:
+                    t = norm(term)
+                    if t:
+                        term_map[t].append(slug)
+                        hit_any = True
 
         for token in iter_tokens(interactions.get("peptides")):
             t = norm(token)
@@ -227,10 +163,11 @@ def main():
 
     }
 
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    OUT_FP.write_text(json.dumps(out, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    print(f"OK: wrote {OUT_FP.relative_to(ROOT)}")
+    changed = write_json_if_changed(OUT_FP, out)
+    print(f"OK: {'wrote' if changed else 'unchanged'} {OUT_FP.relative_to(ROOT)}")
     print("STATS:", out["stats"])
+    for line in canon.report():
+        print(f"WARN: {line}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Input/output fingerprints for incremental index rebuilds.
+
+Each rebuild step declares its inputs (globs relative to the repo root, or a Tree of
+source files) and the artifacts it writes. After a step succeeds we record a content
+hash per input and output file in scripts/index/_state/rebuild_state_v1.json
+(untracked, local to the checkout). On the next run a step is skipped only when:
+- it succeeded before,
+- every input file hashes the same (no edits, additions or removals), and
+- every declared output still exists with the hash it had when the step wrote it.
+
+File hashes are memoized on (path, mtime_ns, size), so re-checking the same corpus
+for many steps costs one stat per file.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+STATE_PATH = ROOT / "scripts" / "index" / "_state" / "rebuild_state_v1.json"
+STATE_VERSION = 1
+
+PRUNE_DIRS = {"node_modules", ".next", ".git", "__pycache__"}
+
+
+@dataclass(frozen=True)
+class Tree:
+    """All files under `root` with one of `suffixes` (ignored dirs are pruned during the walk)."""
+    root: str
+    suffixes: tuple[str, ...]
+
+    def __str__(self) -> str:
+        return f"{self.root}/**/*{{{','.join(self.suffixes)}}}"
+
+
+def expand(spec: str | Tree, root: Path = ROOT) -> list[str]:
+    """Sorted repo-relative paths matched by one input/output spec."""
+    if isinstance(spec, Tree):
+        base = root / spec.root
+        out = []
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d not in PRUNE_DIRS)
+            for fn in filenames:
+                if os.path.splitext(fn)[1].lower() in spec.suffixes:
+                    out.append(os.path.relpath(os.path.join(dirpath, fn), root))
+        return sorted(out)
+    if any(ch in spec for ch in "*?["):
+        return sorted(str(p.relative_to(root)) for p in root.glob(spec) if p.is_file())
+    return [spec] if (root / spec).is_file() else []
+
+
+def spec_matches(spec: str | Tree, rel: str) -> bool:
+    if isinstance(spec, Tree):
+        return rel.startswith(spec.root.rstrip("/") + "/") and os.path.splitext(rel)[1].lower() in spec.suffixes
+    return fnmatch.fnmatchcase(rel, spec)
+
+
+def specs_overlap(a: str | Tree, b: str | Tree, root: Path = ROOT) -> bool:
+    """True when two specs can name the same file (pattern-wise or on disk right now)."""
+    if isinstance(a, str) and isinstance(b, str):
+        if a == b or fnmatch.fnmatchcase(a, b) or fnmatch.fnmatchcase(b, a):
+            return True
+    elif isinstance(a, Tree) and isinstance(b, str) and spec_matches(a, b):
+        return True
+    elif isinstance(b, Tree) and isinstance(a, str) and spec_matches(b, a):
+        return True
+    elif isinstance(a, Tree) and isinstance(b, Tree):
+        ra, rb = a.root.rstrip("/") + "/", b.root.rstrip("/") + "/"
+        if (ra.startswith(rb) or rb.startswith(ra)) and set(a.suffixes) & set(b.suffixes):
+            return True
+    return bool(set(expand(a, root)) & set(expand(b, root)))
+
+
+class Hasher:
+    def __init__(self, root: Path = ROOT) -> None:
+        self.root = root
+        self._memo: dict[str, tuple[int, int, str]] = {}
+
+    def file(self, rel: str) -> str | None:
+        p = os.path.join(self.root, rel)
+        try:
+            st = os.stat(p)
+        except OSError:
+            return None
+        m = self._memo.get(rel)
+        if m is not None and m[0] == st.st_mtime_ns and m[1] == st.st_size:
+            return m[2]
+        with open(p, "rb") as f:
+            digest = hashlib.blake2b(f.read(), digest_size=12).hexdigest()
+        self._memo[rel] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def specs(self, specs) -> dict[str, str]:
+        out: dict[str, str] = {}
+        for spec in specs:
+            for rel in expand(spec, self.root):
+                h = self.file(rel)
+                if h is not None:
+                    out[rel] = h
+        return out
+
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {"version": STATE_VERSION, "steps": {}}
+    if not isinstance(data, dict) or data.get("version") != STATE_VERSION or not isinstance(data.get("steps"), dict):
+        return {"version": STATE_VERSION, "steps": {}}
+    return data
+
+
+def save_state(state: dict, path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def diff_hashes(old: dict[str, str], new: dict[str, str]) -> tuple[list[str], list[str], list[str]]:
+    """(changed, added, removed) repo-relative paths."""
+    changed = sorted(k for k in new if k in old and old[k] != new[k])
+    added = sorted(k for k in new if k not in old)
+    removed = sorted(k for k in old if k not in new)
+    return changed, added, removed
+
+
+def describe_diff(changed: list[str], added: list[str], removed: list[str], limit: int = 3) -> str:
+    parts = []
+    for label, paths in (("changed", changed), ("added", added), ("removed", removed)):
+        if not paths:
+            continue
+        shown = ", ".join(paths[:limit])
+        more = f" (+{len(paths) - limit} more)" if len(paths) > limit else ""
+        parts.append(f"{label}: {shown}{more}")
+    return "; ".join(parts)
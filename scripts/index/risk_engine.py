@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Batched risk scoring for risk_index_v1 (and what-if stacks).
+
+build_risk_index.compute_risk_tier()/compute_blend_risk() score one entity at a time
+with string rank lookups. RiskEngine encodes every peptide risk block once as integer
+columns (clamped score, severity/likelihood/evidence ranks, tier classes, flags) and then
+scores all peptides, and any number of component stacks, in one batched pass:
+
+- tiers: base band from the clamped score, escalated by severity / flags / likelihood
+- blends: max component score (+1 when 2+ components score >= 6), max severity and
+  likelihood, worst evidence grade (earliest component wins ties), OR of flags
+- safety links: one precomputed list per (developmental, interactions, unknowns) mask
+
+NumPy is used when it is installed; otherwise the same algorithm runs over plain lists.
+Both paths reproduce the per-entity functions exactly (risk_index_v1.json is
+byte-identical), including their quirks: severity/likelihood/evidence pick the raw
+strings with the default rank 1 for unknown values, unknown component slugs count as an
+empty risk block, and an empty stack scores 5.
+
+Usage:
+  engine = RiskEngine(pep_risk_by_slug, pep_has_interactions, allowed_safety)
+  engine.peptides()                       # [{slug, risk, safety_links}] in slug order
+  engine.blends([["bpc-157", "tb-500"]])  # [{risk..., safety_links}] per stack
+  engine.score(["bpc-157", "tb-500"])     # one stack, O(stack size)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+try:
+    import numpy as np  # optional; the pure-Python path gives identical results
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+EVIDENCE_RANK = {
+    # Higher rank = stronger evidence (best). We will choose the WEAKER of two by rank.
+    "regulatory_label": 9,
+    "rct_meta": 8,
+    "rct": 7,
+    "human_interventional": 6,
+    "human_observational": 5,
+    "animal": 4,
+    "in_vitro": 3,
+    "mechanistic_only": 2,
+    "unknown": 1,
+}
+
+SEVERITY_RANK = {"minimal": 1, "mild": 2, "moderate": 3, "high": 4, "critical": 5}
+LIKELIHOOD_RANK = {"unlikely": 1, "possible": 2, "likely": 3, "very_likely": 4}
+
+TIERS = ("low", "moderate", "high")
+
+# Tier classes of the normalized (stripped, lower-cased) severity / likelihood.
+SEV_OTHER, SEV_MODERATE, SEV_HIGH = 0, 1, 2
+
+# Safety-link mask bits.
+LINK_DEVELOPMENTAL, LINK_INTERACTIONS, LINK_UNKNOWNS = 1, 2, 4
+
+BLEND_DEFAULT_SCORE = 5  # empty stack: conservative default
+STACKING_THRESHOLD = 6
+
+
+def safety_links_for_mask(mask: int) -> list[str]:
+    links = []
+    if mask & LINK_DEVELOPMENTAL:
+        links.append("safety_adolescents_development")
+        links.append("safety_endocrine_axes")
+    if mask & LINK_INTERACTIONS:
+        links.append("safety_interactions")
+    if mask & LINK_UNKNOWNS:
+        links.append("safety_evidence_grades")
+    links.append("safety_risk_scoring")
+    return links
+
+
+def _norm(v: Any) -> str:
+    return (v or "").strip().lower()
+
+
+def _sev_class(v: Any) -> int:
+    s = _norm(v)
+    if s in ("critical", "high"):
+        return SEV_HIGH
+    return SEV_MODERATE if s == "moderate" else SEV_OTHER
+
+
+def _rank(table: dict[str, int], v: Any) -> int:
+    """0 = absent (falsy); unknown values rank 1 like the per-entity helpers."""
+    return table.get(v, 1) if v else 0
+
+
+def _tier_py(score: int, sev_class: int, like_hot: bool, flagged: bool) -> int:
+    s = max(1, min(10, score))
+    base = 0 if s <= 3 else (1 if s <= 6 else 2)
+    if sev_class == SEV_HIGH:
+        return 2
+    if flagged and s >= 6:
+        return 2
+    if sev_class == SEV_MODERATE and like_hot:
+        return max(base, 1)
+    return base
+
+
+class RiskEngine:
+    """
+    Peptide risk blocks encoded as integer columns. Row i is self.slugs[i]; the extra
+    trailing row (self.empty) is an empty risk block: unknown component slugs map to it,
+    and aggregates with no severity/likelihood/evidence point at it.
+    """
+
+    def __init__(
+        self,
+        risks: dict[str, dict],
+        interactions: dict[str, bool] | None = None,
+        allowed_safety: set[str] | None = None,
+        use_numpy: bool | None = None,
+    ) -> None:
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        self.slugs = sorted(risks)
+        self.row = {s: i for i, s in enumerate(self.slugs)}
+        blocks = [risks[s] for s in self.slugs] + [{}]
+        interactions = interactions or {}
+
+        self.risk_score = [int(r.get("risk_score") or 0) for r in blocks]
+        self.severity = [r.get("severity") for r in blocks]
+        self.likelihood = [r.get("likelihood") for r in blocks]
+        self.evidence = [r.get("evidence_grade") for r in blocks]
+        self.sev_rank = [_rank(SEVERITY_RANK, v) for v in self.severity]
+        self.like_rank = [_rank(LIKELIHOOD_RANK, v) for v in self.likelihood]
+        self.ev_rank = [_rank(EVIDENCE_RANK, v) for v in self.evidence]
+        self.sev_class = [_sev_class(v) for v in self.severity]
+        self.like_hot = [_norm(v) in ("very_likely", "likely") for v in self.likelihood]
+        self.dev = [bool(r.get("developmental_risk")) for r in blocks]
+        self.unk = [bool(r.get("unknowns_penalty")) for r in blocks]
+        self.inter = [bool(interactions.get(s, False)) for s in self.slugs] + [False]
+        self.mask = [
+            d * LINK_DEVELOPMENTAL | i * LINK_INTERACTIONS | u * LINK_UNKNOWNS
+            for d, i, u in zip(self.dev, self.inter, self.unk)
+        ]
+        # Absent grades sort after every known one, so the weakest present grade wins.
+        self.ev_sort_rank = [r or len(EVIDENCE_RANK) + 1 for r in self.ev_rank]
+        self.empty = len(self.slugs)
+
+        self.links = [
+            [x for x in links if x in allowed_safety] if allowed_safety else links
+            for links in map(safety_links_for_mask, range(8))
+        ]
+
+        if self.use_numpy:
+            self._a = {
+                name: np.asarray(getattr(self, name), dtype=np.int64)
+                for name in ("risk_score", "sev_rank", "like_rank", "ev_rank", "ev_sort_rank", "mask")
+            }
+
+    # --- tiers ---
+
+    def _tiers(self, score: Sequence[int], sev_class: Sequence[int], like_hot: Sequence[int], flagged: Sequence[int]) -> list[int]:
+        if not self.use_numpy:
+            return [_tier_py(*t) for t in zip(score, sev_class, like_hot, flagged)]
+        if not len(score):
+            return []
+        s = np.clip(np.asarray(score, dtype=np.int64), 1, 10)
+        sev = np.asarray(sev_class, dtype=np.int64)
+        tier = (s > 3).astype(np.int64) + (s > 6)
+        tier = np.where((sev == SEV_MODERATE) & (np.asarray(like_hot) != 0), np.maximum(tier, 1), tier)
+        tier = np.where((np.asarray(flagged) != 0) & (s >= 6), 2, tier)
+        tier = np.where(sev == SEV_HIGH, 2, tier)
+        return tier.tolist()
+
+    # --- peptides ---
+
+    def peptides(self) -> list[dict[str, Any]]:
+        """Risk entries for every peptide, in slug order."""
+        n = len(self.slugs)
+        flagged = [d or u for d, u in zip(self.dev[:n], self.unk[:n])]
+        tiers = self._tiers(self.risk_score[:n], self.sev_class[:n], self.like_hot[:n], flagged)
+        out = []
+        for i, slug in enumerate(self.slugs):
+            out.append({
+                "slug": slug,
+                "risk": {
+                    "risk_score": self.risk_score[i],
+                    "risk_tier": TIERS[tiers[i]],
+                    "severity": self.severity[i],
+                    "likelihood": self.likelihood[i],
+                    "evidence_grade": self.evidence[i],
+                    "developmental_risk": self.dev[i],
+                    "unknowns_penalty": self.unk[i],
+                },
+                "safety_links": list(self.links[self.mask[i]]),
+            })
+        return out
+
+    # --- stacks ---
+
+    def _rows(self, stack: Sequence[str]) -> list[int]:
+        return [self.row.get(c, self.empty) for c in stack]
+
+    def _aggregate_py(self, stacks: list[list[int]]) -> list[tuple[int, int, int, int, int]]:
+        empty = self.empty
+        score_of, mask_of = self.risk_score, self.mask
+        sev_rank, like_rank = self.sev_rank.__getitem__, self.like_rank.__getitem__
+        ev_rank = self.ev_sort_rank.__getitem__
+        out = []
+        for rows in stacks:
+            if not rows:
+                out.append((BLEND_DEFAULT_SCORE, empty, empty, empty, 0))
+                continue
+            top, high, mask = -1, 0, 0
+            for i in rows:
+                sc = score_of[i]
+                if sc > top:
+                    top = sc
+                if sc >= STACKING_THRESHOLD:
+                    high += 1
+                mask |= mask_of[i]
+            # max()/min() keep the earliest component on ties, like max_severity()/worse_evidence().
+            sev = max(rows, key=sev_rank)
+            like = max(rows, key=like_rank)
+            ev = min(rows, key=ev_rank)
+            out.append((
+                top + (high >= 2),
+                sev if self.sev_rank[sev] else empty,
+                like if self.like_rank[like] else empty,
+                ev if self.ev_rank[ev] else empty,
+                mask,
+            ))
+        return out
+
+    def _aggregate_np(self, stacks: list[list[int]]) -> list[tuple[int, int, int, int, int]]:
+        a = self._a
+        empty = self.empty
+        lengths = [len(r) for r in stacks]
+        flat = np.fromiter((i for r in stacks for i in r), dtype=np.int64, count=sum(lengths))
+        if not len(flat):
+            return [(BLEND_DEFAULT_SCORE, empty, empty, empty, 0)] * len(stacks)
+        m = len(flat)
+        pos = np.arange(m, dtype=np.int64)
+        # Segment starts of the non-empty stacks (empty ones occupy no elements).
+        starts = np.cumsum([0] + lengths[:-1], dtype=np.int64)[np.asarray(lengths) > 0]
+
+        def seg(ufunc, values):
+            return ufunc.reduceat(values, starts)
+
+        def earliest(ufunc, rank, present):
+            # Key (rank, position): the first component with the winning rank wins ties.
+            order = (m - 1 - pos) if ufunc is np.maximum else pos
+            key = seg(ufunc, rank[flat] * m + order)
+            hit = flat[(m - 1 - key % m) if ufunc is np.maximum else key % m]
+            return np.where(present[hit], hit, empty)
+
+        scores = a["risk_score"][flat]
+        score = seg(np.maximum, scores) + (seg(np.add, (scores >= STACKING_THRESHOLD).astype(np.int64)) >= 2)
+        sev = earliest(np.maximum, a["sev_rank"], a["sev_rank"] > 0)
+        like = earliest(np.maximum, a["like_rank"], a["like_rank"] > 0)
+        ev = earliest(np.minimum, a["ev_sort_rank"], a["ev_rank"] > 0)
+        mask = seg(np.bitwise_or, a["mask"][flat])
+
+        rows = zip(score.tolist(), sev.tolist(), like.tolist(), ev.tolist(), mask.tolist())
+        return [next(rows) if n else (BLEND_DEFAULT_SCORE, empty, empty, empty, 0) for n in lengths]
+
+    def aggregate_rows(self, stacks: Sequence[Sequence[int]], use_numpy: bool | None = None) -> list[tuple[int, int, int, int, int, int]]:
+        """
+        Aggregate stacks given as row indices. One tuple per stack:
+        (clamped score, tier index, severity row, likelihood row, evidence row, link mask),
+        where a row is self.empty when no component carries that value.
+        """
+        rows = stacks if isinstance(stacks, list) else list(stacks)
+        vectorized = self.use_numpy if use_numpy is None else (use_numpy and self.use_numpy)
+        agg = self._aggregate_np(rows) if vectorized else self._aggregate_py(rows)
+        scores = [max(1, min(10, t[0])) for t in agg]
+        flagged = [t[4] & (LINK_DEVELOPMENTAL | LINK_UNKNOWNS) for t in agg]
+        sev_class = [self.sev_class[t[1]] for t in agg]
+        like_hot = [self.like_hot[t[2]] for t in agg]
+        tiers = self._tiers(scores, sev_class, like_hot, flagged) if vectorized else [
+            _tier_py(*t) for t in zip(scores, sev_class, like_hot, flagged)
+        ]
+        return [(score, tier, t[1], t[2], t[3], t[4]) for t, score, tier in zip(agg, scores, tiers)]
+
+    def aggregate(self, stacks: Sequence[Sequence[str]], use_numpy: bool | None = None) -> list[tuple[int, int, int, int, int, int]]:
+        """aggregate_rows() for stacks of slugs; unknown slugs count as an empty risk block."""
+        return self.aggregate_rows([self._rows(s) for s in stacks], use_numpy)
+
+    def result(self, agg: tuple[int, int, int, int, int, int]) -> dict[str, Any]:
+        """Risk fields for one aggregate (same fields as build_risk_index.compute_blend_risk, plus interactions and safety_links)."""
+        score, tier, sev, like, ev, mask = agg
+        return {
+            "risk_score": score,
+            "risk_tier": TIERS[tier],
+            "severity": self.severity[sev],
+            "likelihood": self.likelihood[like],
+            "evidence_grade": self.evidence[ev],
+            "developmental_risk": bool(mask & LINK_DEVELOPMENTAL),
+            "unknowns_penalty": bool(mask & LINK_UNKNOWNS),
+            "interactions": bool(mask & LINK_INTERACTIONS),
+            "safety_links": list(self.links[mask]),
+        }
+
+    def blends(self, stacks: Sequence[Sequence[str]]) -> list[dict[str, Any]]:
+        """Conservative aggregate risk for each component stack, batched."""
+        return [self.result(t) for t in self.aggregate(stacks)]
+
+    def score(self, stack: Sequence[str]) -> dict[str, Any]:
+        """One stack, O(stack size): the plain-Python path avoids per-call array setup."""
+        return self.result(self.aggregate([stack], use_numpy=False)[0])
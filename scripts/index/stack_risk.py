@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+What-if stack risk: score any set of peptides/blends with the blend risk rules.
+
+StackRiskEvaluator applies build_risk_index's blend aggregation (max component score,
++1 when 2+ components score >= 6, max severity/likelihood, worst evidence grade, OR of
+flags, safety links) to arbitrary stacks. Per-peptide risk is encoded once
+(risk_engine.RiskEngine), so each evaluation is O(stack size).
+
+Stack items may be:
+  "bpc-157" / "peptide:bpc-157"    a peptide (slug, alias or canonical name; "bpc157" works too)
+  "blend:klow" / "klow"            a blend, expanded to its component peptides
+Components are de-duplicated (a peptide listed directly and via a blend counts once);
+unresolvable items are reported under "unresolved" and left out of the score.
+
+Also reads stack documents: content/stacks/*.json (stack_v1: peptides + blends) and
+app_state_v1 saved stacks (stacks.items[].items[].entity_key).
+
+Bulk mode (--write-table) scores every pair and triple of peptides into
+content/_index/stack_risk_table_v1.json so the stack builder can look risk up instead of
+recomputing it. Layout:
+  peptides        slugs; a combination is a sorted tuple of positions in this list
+  pairs, triples  base64 of little-endian uint16 codes, one per combination, in
+                  itertools.combinations(range(len(peptides)), k) order
+                  (index of c0<c1<..: C(n,k) - 1 - sum_i C(n-1-c_i, k-i))
+  code bits       0-3 risk_score, 4-5 tier (low/moderate/high), 6-8 link mask,
+                  9-10 / 11-12 / 13-14 position within the combination of the component
+                  whose severity / likelihood / evidence_grade was picked (3 = none)
+  links_by_mask   safety links per link mask (1 developmental, 2 interactions, 4 unknowns)
+
+Usage:
+  python3 scripts/index/stack_risk.py content/stacks/*.json
+  python3 scripts/index/stack_risk.py --slugs bpc-157 tb-500 blend:glow
+  python3 scripts/index/stack_risk.py --write-table
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import itertools
+import json
+import re
+import sys
+from array import array
+from datetime import date
+from math import comb
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.index.build_risk_index import load_blend_components, load_peptide_risks, safety_ids  # type: ignore
+from scripts.index.risk_engine import TIERS, RiskEngine  # type: ignore
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.lib.peptide_facts import load_facts  # type: ignore
+
+TABLE_PATH = ROOT / "content" / "_index" / "stack_risk_table_v1.json"
+TABLE_SIZES = (2, 3)
+NO_SOURCE = 3
+
+
+def die(msg: str, code: int = 1) -> None:
+    raise SystemExit(f"ERROR: {msg}")
+
+
+def compact(s: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", s.lower())
+
+
+def combination_index(n: int, combo: Sequence[int]) -> int:
+    """Position of a sorted combination in itertools.combinations(range(n), len(combo)) order."""
+    k = len(combo)
+    return comb(n, k) - 1 - sum(comb(n - 1 - c, k - i) for i, c in enumerate(combo))
+
+
+class StackRiskEvaluator:
+    def __init__(self, engine: RiskEngine, blend_components: dict[str, list[str]], aliases: dict[str, str] | None = None) -> None:
+        self.engine = engine
+        self.blend_components = blend_components
+        # compact(slug / alias / canonical name) -> peptide slug; exact slugs always win.
+        self.aliases = {compact(s): s for s in engine.slugs}
+        for k, v in (aliases or {}).items():
+            self.aliases.setdefault(compact(k), v)
+
+    @classmethod
+    def from_content(cls) -> "StackRiskEvaluator":
+        pep_risk_by_slug, pep_has_interactions = load_peptide_risks()
+        engine = RiskEngine(pep_risk_by_slug, pep_has_interactions, safety_ids())
+        facts = load_facts()
+        aliases: dict[str, str] = {}
+        for i in facts.rows():
+            slug = facts.pep_slug[i]
+            if slug not in engine.row:
+                continue
+            names = [facts.slug[i], facts.canonical_name[i], facts.short_name[i]]
+            if isinstance(facts.aliases[i], list):
+                names.extend(facts.aliases[i])
+            for name in names:
+                if isinstance(name, str) and compact(name):
+                    aliases.setdefault(name, slug)
+        return cls(engine, load_blend_components(), aliases)
+
+    # --- resolution ---
+
+    def resolve_peptide(self, name: str) -> str | None:
+        if name in self.engine.row:
+            return name
+        return self.aliases.get(compact(name))
+
+    def resolve(self, items: Iterable[str]) -> tuple[list[str], list[str]]:
+        """(component peptide slugs in first-seen order, unresolved items)."""
+        slugs: list[str] = []
+        unresolved: list[str] = []
+        for item in items:
+            kind, _, name = item.strip().rpartition(":")
+            name = name.strip()
+            found: list[str] | None = None
+            if kind in ("", "peptide"):
+                pep = self.resolve_peptide(name)
+                found = [pep] if pep else None
+            if found is None and kind in ("", "blend") and name in self.blend_components:
+                comps = [self.resolve_peptide(c) for c in self.blend_components[name]]
+                found = [c for c in comps if c]
+            if found is None:
+                unresolved.append(item)
+                continue
+            slugs.extend(s for s in found if s not in slugs)
+        return slugs, unresolved
+
+    # --- evaluation ---
+
+    def evaluate(self, items: Iterable[str]) -> dict[str, Any]:
+        """Risk for one stack, shaped like a risk_index_v1 blend entity (plus unresolved items)."""
+        slugs, unresolved = self.resolve(items)
+        r = self.engine.score(slugs)
+        return {
+            "risk": {
+                "risk_score": r["risk_score"],
+                "risk_tier": r["risk_tier"],
+                "severity": r["severity"],
+                "likelihood": r["likelihood"],
+                "evidence_grade": r["evidence_grade"],
+                "developmental_risk": r["developmental_risk"],
+                "unknowns_penalty": r["unknowns_penalty"],
+                "computed_from_components": True,
+                "component_slugs": slugs,
+            },
+            "safety_links": r["safety_links"],
+            "unresolved": unresolved,
+        }
+
+    def evaluate_doc(self, doc: Any) -> list[dict[str, Any]]:
+        """Evaluate a stack_v1 document or every saved stack in an app_state_v1 document."""
+        if not isinstance(doc, dict):
+            raise ValueError("stack document must be an object")
+        if doc.get("schema_version") == "stack_v1":
+            items = [*(doc.get("peptides") or []), *(f"blend:{b}" for b in doc.get("blends") or [])]
+            return [{"stack": doc.get("slug") or doc.get("stack_id"), **self.evaluate(i for i in items if isinstance(i, str))}]
+        if doc.get("version") == "app_state_v1":
+            out = []
+            for st in (doc.get("stacks") or {}).get("items") or []:
+                if not isinstance(st, dict):
+                    continue
+                keys = [it.get("entity_key") for it in st.get("items") or [] if isinstance(it, dict)]
+                out.append({"stack": st.get("name") or st.get("id"), **self.evaluate(k for k in keys if isinstance(k, str))})
+            return out
+        raise ValueError("not a stack_v1 or app_state_v1 document")
+
+    # --- bulk table ---
+
+    def table(self, sizes: Sequence[int] = TABLE_SIZES) -> dict[str, Any]:
+        eng = self.engine
+        n = len(eng.slugs)
+        out: dict[str, Any] = {
+            "version": "v1",
+            "generated_on": date.today().isoformat(),
+            "peptides": eng.slugs,
+            "tiers": list(TIERS),
+            "links_by_mask": eng.links,
+            "counts": {},
+        }
+        for k in sizes:
+            combos = list(itertools.combinations(range(n), k))
+            codes = array("H")
+            for combo, (score, tier, sev, like, ev, mask) in zip(combos, eng.aggregate_rows(combos)):
+                src = [combo.index(r) if r != eng.empty else NO_SOURCE for r in (sev, like, ev)]
+                codes.append(score | tier << 4 | mask << 6 | src[0] << 9 | src[1] << 11 | src[2] << 13)
+            if sys.byteorder == "big":
+                codes.byteswap()
+            name = {2: "pairs", 3: "triples"}.get(k, f"size_{k}")
+            out["counts"][name] = len(codes)
+            out[name] = base64.b64encode(codes.tobytes()).decode("ascii")
+        return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Score what-if peptide stacks with the blend risk rules.")
+    ap.add_argument("paths", nargs="*", help="stack_v1 or app_state_v1 JSON files")
+    ap.add_argument("--slugs", nargs="+", metavar="ITEM", help="Score one ad-hoc stack (peptide/blend slugs or entity keys)")
+    ap.add_argument("--write-table", action="store_true", help=f"Write {TABLE_PATH.relative_to(ROOT)} (every pair and triple)")
+    args = ap.parse_args(argv)
+
+    if not (args.paths or args.slugs or args.write_table):
+        ap.error("nothing to do: give stack files, --slugs, or --write-table")
+
+    ev = StackRiskEvaluator.from_content()
+
+    if args.write_table:
+        table = ev.table()
+        changed = write_json_if_changed(TABLE_PATH, table)
+        counts = ", ".join(f"{k}={v}" for k, v in table["counts"].items())
+        print(f"{'Wrote' if changed else 'Unchanged'}: {TABLE_PATH} ({counts})")
+
+    results: list[dict[str, Any]] = []
+    for path in args.paths:
+        p = Path(path)
+        try:
+            doc = json.loads(p.read_text(encoding="utf-8"))
+            results.extend({"source": path, **r} for r in ev.evaluate_doc(doc))
+        except (OSError, ValueError) as e:
+            die(f"{path}: {e}")
+    if args.slugs:
+        results.append({"source": "--slugs", **ev.evaluate(args.slugs)})
+    if results:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
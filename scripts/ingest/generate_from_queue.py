@@ -22,7 +22,6 @@ import sys
 import csv
 import json
 import re
-import subprocess
 from copy import deepcopy
 from dataclasses import dataclass
 from datetime import date, datetime
@@ -31,6 +30,12 @@ from typing import Any, Dict, List, Optional, Set
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.index import build_search_index  # type: ignore
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.validate import validate_peptide_json  # type: ignore
+
 DEPRECATED_TOPICS_DIR = REPO_ROOT / "content" / "_deprecated" / "topics"
 CONTENT_PEPTIDES_DIR = REPO_ROOT / "content" / "peptides"
 TEMPLATE_PATH = REPO_ROOT / "scripts" / "ingest" / "peptide_template.json"
@@ -49,8 +54,14 @@ def load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def save_json(path: Path, obj: Dict[str, Any]) -> None:
-    path.write_text(json.dumps(obj, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+def save_json(path: Path, obj: Dict[str, Any]) -> bool:
+    """Index/report artifacts: a changed build stamp alone does not rewrite the file."""
+    return write_json_if_changed(path, obj)
+
+
+def save_doc(path: Path, obj: Dict[str, Any]) -> bool:
+    """Peptide content documents: every key is content (a new status.last_reviewed must be written)."""
+    return write_json_if_changed(path, obj, volatile=frozenset())
 
 
 def today_iso() -> str:
@@ -425,13 +436,8 @@ def run_validator(paths: List[Path]) -> int:
     if not VALIDATOR_PATH.exists():
         raise FileNotFoundError(f"Validator not found: {VALIDATOR_PATH}")
 
-    rc = 0
-    for p in paths:
-        cmd = ["python3", str(VALIDATOR_PATH), str(p)]
-        proc = subprocess.run(cmd, cwd=str(REPO_ROOT))
-        if proc.returncode != 0:
-            rc = proc.returncode
-    return rc
+    # One in-process multi-file run (per-file PASS/FAIL + summary) instead of a python3 per file.
+    return validate_peptide_json.main([str(p) for p in paths])
 
 
 
@@ -501,15 +507,10 @@ def rebuild_search_index() -> None:
     Rebuild content/peptides/_search_index.json and write scripts/index/_reports/<timestamp>.json.
     Metadata-only: does not change peptide JSON content.
     """
-    cmd = [
-        sys.executable,
-        str(REPO_ROOT / "scripts" / "index" / "build_search_index.py"),
-        "--write",
-        "--report",
-    ]
-    r = subprocess.run(cmd)
-    if r.returncode != 0:
-        raise SystemExit(f"ERROR: build_search_index.py failed with exit code {r.returncode}")
+    # In-process (same interpreter, no second startup / re-import).
+    rc = build_search_index.main(["--write", "--report"])
+    if rc != 0:
+        raise SystemExit(f"ERROR: build_search_index.py failed with exit code {rc}")
 
 def main() -> int:
     ap = argparse.ArgumentParser()
@@ -577,7 +578,7 @@ def main() -> int:
                 doc_existing = load_json(peptide_path)
                 dev_modified = enforce_developmental_risk(doc_existing, row.slug, row.developmental_systems)
                 if dev_modified and args.apply:
-                    save_json(peptide_path, doc_existing)
+                    save_doc(peptide_path, doc_existing)
             # If file does not exist, template generation path will include flags later.
 
         out_path = CONTENT_PEPTIDES_DIR / f"{row.slug}.json"
@@ -598,7 +599,7 @@ def main() -> int:
             (updated if exists else created).append(row.slug)
             continue
 
-        save_json(out_path, doc)
+        save_doc(out_path, doc)
         written_paths.append(out_path)
         (updated if exists else created).append(row.slug)
 
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Atomic, write-if-changed output for index builders.
+
+write_json_if_changed(path, obj) serializes obj the way the builders always have
+(indent=2, trailing newline) and:
+- skips the write when the file already holds the same bytes, or the same document
+  apart from volatile stamp fields (updated_at, generated_on, generated_at,
+  last_reviewed) -- the old file, with its old stamp, is kept;
+- otherwise writes a temp file in the same directory, fsyncs it, and renames it over
+  the target, so readers never see a half-written index.
+
+Unchanged outputs keep their mtime, so the incremental rebuild state, the content
+snapshot, copy_content_indexes.mjs and the Next.js build cache all see "no change".
+
+Counts are kept in the module-level STATS (written / unchanged); rebuild_all_indexes.py
+prints the totals for a run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+VOLATILE_KEYS = frozenset({"updated_at", "generated_on", "generated_at", "last_reviewed"})
+
+
+@dataclass
+class WriteStats:
+    written: int = 0
+    unchanged: int = 0
+
+    def summary(self) -> str:
+        return f"written={self.written} unchanged={self.unchanged}"
+
+
+STATS = WriteStats()
+
+
+def strip_volatile(obj: Any, keys: frozenset[str] = VOLATILE_KEYS) -> Any:
+    if isinstance(obj, dict):
+        return {k: strip_volatile(v, keys) for k, v in obj.items() if k not in keys}
+    if isinstance(obj, list):
+        return [strip_volatile(v, keys) for v in obj]
+    return obj
+
+
+def dumps(obj: Any, ensure_ascii: bool = False) -> str:
+    return json.dumps(obj, indent=2, ensure_ascii=ensure_ascii) + "\n"
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    # Persist the rename itself (best effort; not supported on every platform).
+    try:
+        dfd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dfd)
+    except OSError:
+        pass
+    finally:
+        os.close(dfd)
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """Returns True when the file was (re)written."""
+    try:
+        if path.read_bytes() == data:
+            STATS.unchanged += 1
+            return False
+    except OSError:
+        pass
+    atomic_write_bytes(path, data)
+    STATS.written += 1
+    return True
+
+
+def write_json_if_changed(
+    path: Path,
+    obj: Any,
+    *,
+    ensure_ascii: bool = False,
+    volatile: frozenset[str] = VOLATILE_KEYS,
+) -> bool:
+    """Returns True when the file was (re)written, False when the existing file already matches."""
+    new_text = dumps(obj, ensure_ascii)
+    try:
+        old_text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        old_text = None
+
+    if old_text is not None:
+        if old_text == new_text:
+            STATS.unchanged += 1
+            return False
+        if volatile:
+            try:
+                old_obj = json.loads(old_text)
+            except ValueError:
+                old_obj = None
+            # Only keep the old file if it is in canonical form (not just semantically equal).
+            if (
+                old_obj is not None
+                and dumps(old_obj, ensure_ascii) == old_text
+                and dumps(strip_volatile(old_obj, volatile), ensure_ascii) == dumps(strip_volatile(obj, volatile), ensure_ascii)
+            ):
+                STATS.unchanged += 1
+                return False
+
+    atomic_write_bytes(path, new_text.encode("utf-8"))
+    STATS.written += 1
+    return True
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Parallel, cached runner for the per-peptide audits (scripts/audit/*_audit.py).
+
+An audit is a module-level function path -> [Finding dataclass, ...]. run_audit():
+- hashes every input file and reuses cached findings for files whose content hash and
+  rule-set version are unchanged (scripts/_cache/audit/<name>_v1.json, untracked);
+- fans the remaining files out across a forked process pool (--jobs);
+- diffs the findings against the previous run (the cache doubles as the last-run record):
+  new / resolved / unchanged, compared as whole findings (a finding whose message or
+  snippet changed shows up as one resolved + one new).
+
+Every run advances the cache, so the run-to-run diff is "since whatever ran last". A
+written report must show what changed since the report reviewers last saw instead:
+--write mode calls run.rebase(latest_report(...)) before building the report.
+
+The rule-set version is a hash of the audit script and the matcher library, so editing a
+rule list or rule logic re-audits everything.
+
+audit_changed_claims() is the claim-level mode: only claims whose fingerprint is not in a
+claim baseline (scripts/lib/claims.py) are evaluated -- audit_fn(path, only={fp, ...}).
+
+Usage (from an audit script):
+  run = run_audit("evidence_language", files, audit_peptide, rules_version(Path(__file__)), jobs=args.jobs)
+  run.findings          # [asdict(finding), ...] in file order
+  run.diff_lines()      # ["NEW ...", "RESOLVED ..."]
+  run.rebase(latest_report(REPORTS_DIR, schema))   # --write: diff against the last report
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.claims import ClaimDelta, build_index, changed_since, load_baseline  # type: ignore
+
+CACHE_DIR = ROOT / "scripts" / "_cache" / "audit"
+CACHE_VERSION = 1
+RULE_LIBS = (ROOT / "scripts" / "lib" / "phrase_matcher.py",)
+
+AuditFn = Callable[[Path], list]
+
+
+def default_jobs() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def rules_version(*sources: Path) -> str:
+    """Hash of the given rule sources (the audit script) plus the shared matcher library."""
+    h = hashlib.sha256()
+    for p in (*sources, *RULE_LIBS):
+        try:
+            h.update(p.read_bytes())
+        except OSError:
+            h.update(str(p).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _finding_key(f: dict[str, Any]) -> str:
+    return json.dumps(f, sort_keys=True, ensure_ascii=False)
+
+
+def _diff(before: Iterable[dict[str, Any]], after: Iterable[dict[str, Any]]) -> tuple[list, list, int]:
+    """(new, resolved, unchanged count) between two finding lists, compared as whole findings."""
+    b = Counter(_finding_key(f) for f in before)
+    a = Counter(_finding_key(f) for f in after)
+    new = [json.loads(k) for k in sorted((a - b).elements())]
+    resolved = [json.loads(k) for k in sorted((b - a).elements())]
+    return new, resolved, sum((a & b).values())
+
+
+def _audit_one(args: tuple[AuditFn, Path]) -> list[dict[str, Any]]:
+    fn, p = args
+    return [asdict(f) for f in fn(p)]
+
+
+class AuditRun:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.files = 0
+        self.audited: list[str] = []     # rel paths re-audited this run
+        self.findings: list[dict[str, Any]] = []
+        self.new: list[dict[str, Any]] = []
+        self.resolved: list[dict[str, Any]] = []
+        self.unchanged = 0
+        self.baseline_at: str | None = None  # timestamp of the previous run (or report), if any
+        self.baseline_kind = "run"
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.new or self.resolved)
+
+    def rebase(self, report: dict[str, Any] | None) -> None:
+        """Re-diff this run's findings against a previous report instead of the last run."""
+        self.new, self.resolved, self.unchanged = _diff(report.get("findings") or [] if report else [], self.findings)
+        self.baseline_at = report.get("timestamp") if report else None
+        self.baseline_kind = "report"
+
+    def diff_doc(self) -> dict[str, Any]:
+        return {
+            "baseline": self.baseline_at,
+            "baseline_kind": self.baseline_kind,
+            "new_count": len(self.new),
+            "resolved_count": len(self.resolved),
+            "unchanged_count": self.unchanged,
+            "new": self.new,
+            "resolved": self.resolved,
+        }
+
+    def summary(self) -> str:
+        since = f"since {self.baseline_kind} {self.baseline_at}" if self.baseline_at else f"(no previous {self.baseline_kind})"
+        return (
+            f"files={self.files} re-audited={len(self.audited)} cached={self.files - len(self.audited)}; "
+            f"new={len(self.new)} resolved={len(self.resolved)} unchanged={self.unchanged} {since}"
+        )
+
+    def diff_lines(self, limit: int = 50) -> list[str]:
+        lines: list[str] = []
+        for tag, items in (("NEW", self.new), ("RESOLVED", self.resolved)):
+            for f in items[:limit]:
+                lines.append(f"{tag} {f.get('peptide_slug')} {f.get('rule_id')}: {f.get('message')}")
+            if len(items) > limit:
+                lines.append(f"{tag} ... {len(items) - limit} more")
+        return lines
+
+
+def _load_cache(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or not isinstance(data.get("files"), dict):
+        return {}
+    return data
+
+
+def _save_cache(path: Path, data: dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def run_audit(
+    name: str,
+    files: Iterable[Path],
+    audit_fn: AuditFn,
+    rules: str,
+    jobs: int = 1,
+    use_cache: bool = True,
+) -> AuditRun:
+    """
+    Audit files (cached per content hash + rules), record this run, and diff against the last.
+    use_cache=False re-audits every file but still records the run and reports the diff.
+    """
+    cache_path = CACHE_DIR / f"{name}_v{CACHE_VERSION}.json"
+    prev = _load_cache(cache_path)
+    prev_files: dict[str, Any] = prev.get("files") or {}
+    reuse = use_cache and prev.get("rules") == rules
+
+    run = AuditRun(name)
+    run.baseline_at = prev.get("timestamp")
+    order: list[tuple[str, Path, str]] = []
+    per_file: dict[str, list[dict[str, Any]]] = {}
+    todo: list[tuple[str, Path]] = []
+    for p in files:
+        rel = os.path.relpath(p, ROOT)
+        try:
+            digest = hashlib.sha256(p.read_bytes()).hexdigest()
+        except OSError:
+            digest = ""
+        order.append((rel, p, digest))
+        entry = prev_files.get(rel)
+        if reuse and digest and isinstance(entry, dict) and entry.get("sha256") == digest:
+            per_file[rel] = entry.get("findings") or []
+        else:
+            todo.append((rel, p))
+
+    work = [(audit_fn, p) for _, p in todo]
+    if jobs > 1 and len(work) > 1:
+        ctx = multiprocessing.get_context("fork") if sys.platform != "win32" else None
+        with ProcessPoolExecutor(max_workers=min(jobs, len(work)), mp_context=ctx) as ex:
+            results = list(ex.map(_audit_one, work, chunksize=max(1, len(work) // (jobs * 4))))
+    else:
+        results = [_audit_one(w) for w in work]
+    for (rel, _), found in zip(todo, results):
+        per_file[rel] = found
+    run.audited = [rel for rel, _ in todo]
+
+    run.files = len(order)
+    for rel, _, _ in order:
+        run.findings.extend(per_file[rel])
+
+    before = [f for e in prev_files.values() if isinstance(e, dict) for f in e.get("findings") or []]
+    run.new, run.resolved, run.unchanged = _diff(before, run.findings)
+
+    _save_cache(cache_path, {
+        "version": CACHE_VERSION,
+        "rules": rules,
+        "timestamp": datetime.now().strftime("%Y-%m-%d_%H%M%S"),
+        "files": {rel: {"sha256": digest, "findings": per_file[rel]} for rel, _, digest in order},
+    })
+    return run
+
+
+def audit_changed_claims(audit_fn: Callable[..., list], since: Path | None = None) -> tuple[ClaimDelta, list[dict[str, Any]]]:
+    """Findings for just the claims changed since the claim index at `since` (default: the committed one; no cache, no run record)."""
+    current = build_index()
+    delta = changed_since(load_baseline(since), current)
+    findings: list[dict[str, Any]] = []
+    for slug in sorted(delta.changed):
+        path = ROOT / current["peptides"][slug]["path"]
+        findings.extend(asdict(f) for f in audit_fn(path, only=delta.changed[slug]))
+    return delta, findings
+
+
+def latest_report(reports_dir: Path, schema_version: str) -> dict[str, Any] | None:
+    """Most recent report in reports_dir with this schema_version (by timestamp), or None."""
+    best: dict[str, Any] | None = None
+    for p in reports_dir.glob("*.json"):
+        try:
+            doc = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        if isinstance(doc, dict) and doc.get("schema_version") == schema_version:
+            if best is None or str(doc.get("timestamp", "")) > str(best.get("timestamp", "")):
+                best = doc
+    return best
+
+
+def same_findings(report: dict[str, Any] | None, findings: list[dict[str, Any]]) -> bool:
+    if report is None:
+        return False
+    new, resolved, _ = _diff(report.get("findings") or [], findings)
+    return not new and not resolved
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Claim-level content fingerprints for incremental validation.
+
+A claim is one item a validator or audit evaluates on its own:
+  sections.<section>[i]     each object in a peptide.sections.* list (overview, use_cases,
+                            observed_exposure_ranges, ...) -- what the audits and
+                            validate_peptide_json.validate_claim() walk
+  practical.<field>[i]      each string bullet in a practical_block_v1 list
+
+claim_fingerprint() hashes the section name plus the whole claim (canonical JSON), so
+reordering claims keeps fingerprints stable while any edit -- text, title, evidence_grade,
+but also confidence, population_group, evidence_refs, which the validators check too --
+gives a new one. A claim object without its own evidence_grade is judged under the
+peptide's risk.evidence_grade (evidence_language_audit rule C1), so that inherited grade
+is hashed in as well: changing it changes exactly the claims that rely on it.
+
+The claim index (content/_index/claims_v1.json, built by scripts/index/build_claim_index.py):
+  fingerprint_set     hash of every fingerprint in the corpus (identifies a corpus state "X")
+  peptides            slug -> {"path", "set", "claims": [{"fp", "at", "title", "evidence_grade"}]}
+
+changed_since(baseline) answers "which claims changed since fingerprint set X": per peptide,
+the fingerprints present now but not in the baseline (new or edited claims), plus the ones
+that disappeared. Consumers restrict their work to those claims (or their files).
+
+The rebuild (step 13) rewrites claims_v1.json on every run, so the file on disk cannot be
+the baseline. load_baseline() defaults to the committed copy (git HEAD): "changed since
+the last commit", advanced only by committing the index.
+
+Usage:
+  sys.path.insert(0, str(ROOT))
+  from scripts.lib.claims import build_index, changed_since, load_baseline  # type: ignore
+  delta = changed_since(load_baseline(), build_index())
+  delta.changed["bpc-157"]   # {fp, ...}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib import content  # type: ignore
+
+CLAIMS_INDEX_PATH = content.INDEX_DIR / "claims_v1.json"
+PRACTICAL_LISTS = ("benefits", "side_effects_common", "side_effects_serious", "who_should_be_cautious")
+
+
+class Claim(NamedTuple):
+    at: str          # location in the document: "sections.overview[0]", "practical.benefits[2]"
+    section: str     # "overview", "practical.benefits", ...
+    value: Any       # the claim object (or bullet string) as stored
+
+
+def inherited_grade(doc: dict) -> str:
+    """peptide.risk.evidence_grade: the grade of every claim object that has none of its own."""
+    pep = doc.get("peptide") if isinstance(doc.get("peptide"), dict) else {}
+    risk = pep.get("risk") if isinstance(pep.get("risk"), dict) else {}
+    return _str(risk.get("evidence_grade"))
+
+
+def claim_fingerprint(section: str, claim: Any, inherited: str = "") -> str:
+    """Fingerprint of one claim; pass inherited_grade(doc) so a grade-less claim tracks the peptide's grade."""
+    key = [section, claim]
+    if inherited and isinstance(claim, dict) and not claim.get("evidence_grade"):
+        key.append(inherited)
+    blob = json.dumps(key, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def iter_claims(doc: dict) -> Iterator[Claim]:
+    """Claims of one peptide document, in document order."""
+    pep = doc.get("peptide") if isinstance(doc.get("peptide"), dict) else {}
+    sections = pep.get("sections") if isinstance(pep.get("sections"), dict) else {}
+    for name, arr in sections.items():
+        if isinstance(arr, list):
+            for i, c in enumerate(arr):
+                if isinstance(c, dict):
+                    yield Claim(f"sections.{name}[{i}]", name, c)
+    pr = doc.get("practical") if isinstance(doc.get("practical"), dict) else {}
+    for name in PRACTICAL_LISTS:
+        arr = pr.get(name)
+        if isinstance(arr, list):
+            for i, s in enumerate(arr):
+                if isinstance(s, str):
+                    yield Claim(f"practical.{name}[{i}]", f"practical.{name}", s)
+
+
+def _set_hash(fps: list[str]) -> str:
+    return hashlib.sha256("\n".join(sorted(fps)).encode("utf-8")).hexdigest()[:16]
+
+
+def _str(v: Any) -> str:
+    return v.strip() if isinstance(v, str) else ""
+
+
+def index_entry(path: Path, doc: dict) -> dict[str, Any]:
+    claims = []
+    grade = inherited_grade(doc)
+    for c in iter_claims(doc):
+        obj = c.value if isinstance(c.value, dict) else {}
+        claims.append({
+            "fp": claim_fingerprint(c.section, c.value, grade),
+            "at": c.at,
+            "title": _str(obj.get("title")) or _str(obj.get("claim_type")),
+            "evidence_grade": _str(obj.get("evidence_grade")),
+        })
+    return {
+        "path": str(path.relative_to(ROOT)),
+        "set": _set_hash([c["fp"] for c in claims]),
+        "claims": claims,
+    }
+
+
+def build_index(loader: content.ContentLoader | None = None) -> dict[str, Any]:
+    """Claim index for the current peptide corpus (no timestamp; see build_claim_index.py)."""
+    peptides: dict[str, Any] = {}
+    for doc in content.iter_peptides(loader):
+        peptides[doc.slug] = index_entry(doc.path, doc.raw)
+    all_fps = [c["fp"] for e in peptides.values() for c in e["claims"]]
+    return {
+        "version": "v1",
+        "fingerprint_set": _set_hash([f"{slug}:{e['set']}" for slug, e in peptides.items()]),
+        "counts": {"peptides": len(peptides), "claims": len(all_fps)},
+        "peptides": peptides,
+    }
+
+
+def _as_index(data: Any) -> dict[str, Any]:
+    if isinstance(data, dict) and isinstance(data.get("peptides"), dict):
+        return data
+    return {"version": "v1", "fingerprint_set": None, "peptides": {}}
+
+
+def load_index(path: Path = CLAIMS_INDEX_PATH) -> dict[str, Any]:
+    """A claim index file; a missing/unreadable one reads as empty (everything counts as changed)."""
+    try:
+        return _as_index(json.loads(path.read_text(encoding="utf-8")))
+    except Exception:
+        return _as_index(None)
+
+
+def load_baseline(path: Path | None = None, rev: str = "HEAD") -> dict[str, Any]:
+    """
+    The index to diff against: `path` if given, else claims_v1.json as committed at `rev`.
+    Outside a git checkout (or before the index is committed) this falls back to the file
+    on disk with a warning -- which a rebuild may already have advanced.
+    """
+    if path is not None:
+        return load_index(path)
+    rel = CLAIMS_INDEX_PATH.relative_to(ROOT).as_posix()
+    try:
+        out = subprocess.run(
+            ["git", "show", f"{rev}:{rel}"], cwd=ROOT, capture_output=True, check=True, timeout=60,
+        ).stdout
+        return _as_index(json.loads(out))
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        print(f"WARNING: no committed claim index at {rev} ({type(e).__name__}); using {rel} on disk", file=sys.stderr)
+        return load_index()
+
+
+class ClaimDelta(NamedTuple):
+    changed: dict[str, set[str]]     # slug -> fingerprints new since the baseline (added or edited claims)
+    removed: dict[str, set[str]]     # slug -> baseline fingerprints no longer present
+    unchanged: int                   # claims whose fingerprint is in the baseline
+
+    @property
+    def slugs(self) -> list[str]:
+        """Peptides with any changed or removed claim."""
+        return sorted(set(self.changed) | set(self.removed))
+
+
+def changed_since(baseline: dict[str, Any], current: dict[str, Any]) -> ClaimDelta:
+    """Claims of `current` not in `baseline` (both claim-index dicts); peptides with an equal set hash are skipped outright."""
+    base = baseline.get("peptides") or {}
+    changed: dict[str, set[str]] = {}
+    removed: dict[str, set[str]] = {}
+    unchanged = 0
+    for slug, entry in (current.get("peptides") or {}).items():
+        old = base.get(slug)
+        now = [c["fp"] for c in entry["claims"]]
+        if isinstance(old, dict) and old.get("set") == entry["set"]:
+            unchanged += len(now)
+            continue
+        old_fps = {c.get("fp") for c in (old or {}).get("claims") or [] if isinstance(c, dict)}
+        new = {fp for fp in now if fp not in old_fps}
+        unchanged += len(now) - sum(1 for fp in now if fp in new)
+        gone = old_fps - set(now)
+        if new:
+            changed[slug] = new
+        if gone:
+            removed[slug] = gone
+    for slug, old in base.items():
+        if slug not in (current.get("peptides") or {}) and isinstance(old, dict):
+            gone = {c.get("fp") for c in old.get("claims") or [] if isinstance(c, dict)}
+            if gone:
+                removed[slug] = gone
+    return ClaimDelta(changed, removed, unchanged)
+
+
+def changed_slugs(since: Path | None = None) -> list[str]:
+    """Peptides with any claim changed or removed since the baseline (for whole-document validators)."""
+    return changed_since(load_baseline(since), build_index()).slugs
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Shared content access for scripts/ (peptides, blends, topics, taxonomy, indexes).
+
+- One place for the content paths and the "_*.json is a registry, not a document" rule.
+- ContentLoader: memoized JSON loader keyed on (resolved path, mtime_ns, size). Every
+  load returns a fresh, mutable copy (stored as marshal blobs; marshal.loads is several
+  times cheaper than json.loads), so callers may edit what they load.
+- Optional on-disk parsed cache (scripts/_cache/content/, untracked): repeat runs skip
+  JSON parsing for unchanged files. Off by default; enable with ContentLoader(disk_cache=True)
+  or PEPTIDE_CONTENT_CACHE=1 (or =<dir>) in the environment.
+- PeptideDoc / BlendDoc: thin typed accessors over pdp_json_v1 / blend documents. They
+  never validate; missing or malformed fields read as empty values.
+- scripts/lib/peptide_facts.py builds the per-peptide facts table the index builders
+  share on top of this loader.
+
+Usage (from any script):
+  sys.path.insert(0, str(ROOT))
+  from scripts.lib.content import iter_peptides, list_peptide_files  # type: ignore
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import struct
+from pathlib import Path
+from typing import Any, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+CONTENT_DIR = ROOT / "content"
+PEPTIDES_DIR = CONTENT_DIR / "peptides"
+BLENDS_DIR = CONTENT_DIR / "blends"
+TOPICS_DIR = CONTENT_DIR / "topics"
+TOPIC_PAGES_DIR = TOPICS_DIR / "pages"
+TAXONOMY_DIR = CONTENT_DIR / "_taxonomy"
+GOVERNANCE_DIR = CONTENT_DIR / "_governance"
+INDEX_DIR = CONTENT_DIR / "_index"
+SAFETY_DIR = CONTENT_DIR / "safety"
+
+PEPTIDE_INDEX_PATH = PEPTIDES_DIR / "_index.json"
+PEPTIDE_SEARCH_INDEX_PATH = PEPTIDES_DIR / "_search_index.json"
+BLENDS_INDEX_PATH = BLENDS_DIR / "_index.json"
+TOPICS_INDEX_PATH = TOPICS_DIR / "_topics_index.json"
+SAFETY_INDEX_PATH = SAFETY_DIR / "_safety_index.json"
+GOVERNANCE_PATH = GOVERNANCE_DIR / "coverage_checklist_v1.json"
+ENTITIES_PATH = INDEX_DIR / "entities_v1.json"
+
+DISK_CACHE_DIR = ROOT / "scripts" / "_cache" / "content"
+DISK_CACHE_ENV = "PEPTIDE_CONTENT_CACHE"
+_DISK_MAGIC = b"PTC1"
+_DISK_HEADER = struct.Struct("<4sHqq")  # magic, marshal version, mtime_ns, size
+
+_MISS = object()
+
+
+def is_registry(p: Path) -> bool:
+    """_index.json, _search_index.json, _queue.csv, ... live next to documents but are not documents."""
+    return p.name.startswith("_")
+
+
+def _list_docs(d: Path) -> list[Path]:
+    return sorted(p for p in d.glob("*.json") if not is_registry(p))
+
+
+def list_peptide_files() -> list[Path]:
+    return _list_docs(PEPTIDES_DIR)
+
+
+def list_blend_files() -> list[Path]:
+    return _list_docs(BLENDS_DIR)
+
+
+def list_topic_page_files() -> list[Path]:
+    return _list_docs(TOPIC_PAGES_DIR)
+
+
+def _disk_cache_dir_from_env() -> Path | None:
+    v = os.environ.get(DISK_CACHE_ENV, "").strip()
+    if not v or v == "0":
+        return None
+    return DISK_CACHE_DIR if v == "1" else Path(v)
+
+
+class ContentLoader:
+    """
+    Memoized JSON loader. Entries are validated against (mtime_ns, size) on every access,
+    so a file rewritten mid-run is re-read automatically.
+    """
+
+    def __init__(self, disk_cache: bool | Path | None = None) -> None:
+        self._entries: dict[str, tuple[int, int, bytes]] = {}
+        if disk_cache is None:
+            self.disk_cache_dir = _disk_cache_dir_from_env()
+        elif disk_cache is True:
+            self.disk_cache_dir = DISK_CACHE_DIR
+        elif disk_cache is False:
+            self.disk_cache_dir = None
+        else:
+            self.disk_cache_dir = Path(disk_cache)
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(p: Path | str) -> str:
+        return os.path.abspath(p)
+
+    # --- on-disk parsed cache ---
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_cache_dir is not None
+        name = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self.disk_cache_dir / f"{name}.marshal"
+
+    def _disk_get(self, key: str, mtime_ns: int, size: int) -> bytes | None:
+        try:
+            raw = self._disk_path(key).read_bytes()
+        except OSError:
+            return None
+        if len(raw) < _DISK_HEADER.size:
+            return None
+        magic, mver, m, s = _DISK_HEADER.unpack_from(raw)
+        if magic != _DISK_MAGIC or mver != marshal.version or m != mtime_ns or s != size:
+            return None
+        return raw[_DISK_HEADER.size:]
+
+    def _disk_put(self, key: str, mtime_ns: int, size: int, blob: bytes) -> None:
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(_DISK_HEADER.pack(_DISK_MAGIC, marshal.version, mtime_ns, size) + blob)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # the cache is an optimization only
+
+    # --- memo ---
+
+    def _read(self, p: Path | str) -> Any:
+        """Parse from disk (or the on-disk cache) and memoize. Raises like json.loads/open."""
+        key = self._key(p)
+        st = os.stat(key)
+        if self.disk_cache_dir is not None:
+            blob = self._disk_get(key, st.st_mtime_ns, st.st_size)
+            if blob is not None:
+                try:
+                    obj = marshal.loads(blob)
+                except Exception:
+                    obj = _MISS
+                if obj is not _MISS:
+                    self.disk_hits += 1
+                    self._entries[key] = (st.st_mtime_ns, st.st_size, blob)
+                    return obj
+        with open(key, "rb") as f:
+            obj = json.loads(f.read().decode("utf-8"))
+        blob = marshal.dumps(obj)
+        self._entries[key] = (st.st_mtime_ns, st.st_size, blob)
+        if self.disk_cache_dir is not None:
+            self._disk_put(key, st.st_mtime_ns, st.st_size, blob)
+        return obj
+
+    def get(self, p: Path | str) -> Any:
+        """Fresh copy of a memoized document, or _MISS when absent/stale."""
+        key = self._key(p)
+        e = self._entries.get(key)
+        if e is None:
+            return _MISS
+        try:
+            st = os.stat(key)
+        except OSError:
+            self._entries.pop(key, None)
+            return _MISS
+        if (st.st_mtime_ns, st.st_size) != (e[0], e[1]):
+            self._entries.pop(key, None)
+            return _MISS
+        return marshal.loads(e[2])
+
+    def put(self, p: Path | str, obj: Any) -> None:
+        """Memoize an object already parsed by someone else (e.g. a script's own loader)."""
+        key = self._key(p)
+        try:
+            st = os.stat(key)
+            self._entries[key] = (st.st_mtime_ns, st.st_size, marshal.dumps(obj))
+        except (OSError, ValueError):
+            # ValueError: not marshal-able (never the case for JSON data)
+            self._entries.pop(key, None)
+
+    def load_json(self, p: Path | str) -> Any:
+        obj = self.get(p)
+        if obj is not _MISS:
+            self.hits += 1
+            return obj
+        self.misses += 1
+        return self._read(p)
+
+
+_DEFAULT: ContentLoader | None = None
+
+
+def default_loader() -> ContentLoader:
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = ContentLoader()
+    return _DEFAULT
+
+
+def set_default_loader(loader: ContentLoader | None) -> None:
+    """Route the process-wide loader through another memo (e.g. the rebuild snapshot); None resets it."""
+    global _DEFAULT
+    _DEFAULT = loader
+
+
+def load_json(p: Path | str) -> Any:
+    """Memoized load through the process-wide loader."""
+    return default_loader().load_json(p)
+
+
+def _dict(v: Any) -> dict:
+    return v if isinstance(v, dict) else {}
+
+
+def _list(v: Any) -> list:
+    return v if isinstance(v, list) else []
+
+
+class PeptideDoc:
+    """Read accessors for a pdp_json_v1 peptide document (content/peptides/<slug>.json)."""
+
+    def __init__(self, path: Path, raw: dict) -> None:
+        self.path = path
+        self.raw = raw
+
+    @property
+    def slug(self) -> str:
+        return self.path.stem
+
+    @property
+    def schema_version(self) -> str | None:
+        v = self.raw.get("schema_version")
+        return v if isinstance(v, str) else None
+
+    @property
+    def peptide(self) -> dict:
+        return _dict(self.raw.get("peptide"))
+
+    @property
+    def canonical_name(self) -> str:
+        v = self.peptide.get("canonical_name")
+        return v.strip() if isinstance(v, str) and v.strip() else self.slug
+
+    @property
+    def aliases(self) -> list[str]:
+        return [a for a in _list(self.peptide.get("aliases")) if isinstance(a, str)]
+
+    @property
+    def classification(self) -> dict:
+        return _dict(self.peptide.get("classification"))
+
+    @property
+    def status(self) -> dict:
+        return _dict(self.peptide.get("status"))
+
+    @property
+    def risk(self) -> dict:
+        return _dict(self.peptide.get("risk"))
+
+    @property
+    def sections(self) -> dict:
+        return _dict(self.peptide.get("sections"))
+
+    def section(self, name: str) -> list:
+        return _list(self.sections.get(name))
+
+    @property
+    def evidence(self) -> list[dict]:
+        return [e for e in _list(self.peptide.get("evidence")) if isinstance(e, dict)]
+
+    @property
+    def topics(self) -> list[str]:
+        return [t for t in _list(_dict(self.peptide.get("topics")).get("primary")) if isinstance(t, str)]
+
+    @property
+    def appears_in_blends(self) -> list[str]:
+        return [b for b in _list(_dict(self.peptide.get("meta")).get("appears_in_blends")) if isinstance(b, str)]
+
+    @property
+    def interactions(self) -> dict:
+        # Top-level since migrate_interactions_to_top_level_v1.
+        return _dict(self.raw.get("interactions"))
+
+    def interaction_list(self, kind: str) -> list:
+        """kind: drug_classes | supplement_classes | peptides"""
+        return _list(self.interactions.get(kind))
+
+    @property
+    def practical(self) -> dict:
+        return _dict(self.raw.get("practical"))
+
+
+class BlendDoc:
+    """Read accessors for a blend document (content/blends/<slug>.json)."""
+
+    def __init__(self, path: Path, raw: dict) -> None:
+        self.path = path
+        self.raw = raw
+
+    @property
+    def slug(self) -> str:
+        return self.path.stem
+
+    @property
+    def blend(self) -> dict:
+        return _dict(self.raw.get("blend"))
+
+    @property
+    def display_name(self) -> str:
+        v = self.blend.get("display_name")
+        return v.strip() if isinstance(v, str) and v.strip() else self.slug
+
+    @property
+    def components(self) -> list[str]:
+        return [c for c in _list(self.blend.get("components")) if isinstance(c, str)]
+
+    @property
+    def taxonomy_keys(self) -> list[str]:
+        return [k for k in _list(self.blend.get("taxonomy_keys")) if isinstance(k, str)]
+
+    @property
+    def sections(self) -> dict:
+        return _dict(self.blend.get("sections"))
+
+    def section(self, name: str) -> list:
+        return _list(self.sections.get(name))
+
+    @property
+    def practical(self) -> dict:
+        return _dict(self.blend.get("practical"))
+
+
+def iter_peptides(loader: ContentLoader | None = None) -> Iterator[PeptideDoc]:
+    """Every peptide document in slug order. Parse errors propagate (callers decide how to die())."""
+    ld = loader if loader is not None else default_loader()
+    for p in list_peptide_files():
+        raw = ld.load_json(p)
+        yield PeptideDoc(p, raw if isinstance(raw, dict) else {})
+
+
+def iter_blends(loader: ContentLoader | None = None) -> Iterator[BlendDoc]:
+    ld = loader if loader is not None else default_loader()
+    for p in list_blend_files():
+        raw = ld.load_json(p)
+        yield BlendDoc(p, raw if isinstance(raw, dict) else {})
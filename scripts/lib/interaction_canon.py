@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Interaction-term canonicalizer compiled once from content/_taxonomy/interaction_classes_v1.json.
+
+Resolves a free-form interaction token ("Blood thinners", "anticoagulants-antiplatelets",
+{"slug": ...} values, ...) to a canonical class slug:
+  1) exact class slug
+  2) normalized (stripped, lower-cased, whitespace-collapsed) slug / title / aka
+     (later taxonomy entries win on collisions)
+  3) slugified token ([^a-z0-9]+ -> "-") that is a class slug
+Results are memoized per token, so repeat tokens are one dict probe; unresolved tokens
+are counted per source list for report().
+
+Usage (from any script):
+  sys.path.insert(0, str(ROOT))
+  from scripts.lib.interaction_canon import load_canonicalizer  # type: ignore
+  canon = load_canonicalizer()
+  canon.resolve("Blood thinners")     # -> "anticoagulants-antiplatelets"
+  canon.display_terms("anticoagulants-antiplatelets", "drug_classes")  # -> [title, *aka, slug]
+  canon.report()                      # -> ["Unresolved interaction tokens: ..."]
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib import content  # type: ignore
+
+TAXONOMY_PATH = content.TAXONOMY_DIR / "interaction_classes_v1.json"
+CLASS_BUCKETS = ("drug_classes", "supplement_classes")
+
+_WS = re.compile(r"\s+")
+_NON_SLUG = re.compile(r"[^a-z0-9]+")
+_DASHES = re.compile(r"-+")
+
+
+def norm_term(s: str) -> str:
+    return _WS.sub(" ", (s or "").strip().lower())
+
+
+def slugify(s: str) -> str:
+    s = _NON_SLUG.sub("-", (s or "").strip().lower())
+    return _DASHES.sub("-", s).strip("-")
+
+
+def iter_tokens(items: Any) -> Iterator[str]:
+    """Interaction list entries ("slug-or-term" or {"slug"/"name": ...}) as stripped, non-empty strings."""
+    if not isinstance(items, list):
+        return
+    for it in items:
+        if isinstance(it, str):
+            tok = it.strip()
+        elif isinstance(it, dict):
+            tok = str(it.get("slug") or it.get("name") or "").strip()
+        else:
+            continue
+        if tok:
+            yield tok
+
+
+class InteractionCanonicalizer:
+    def __init__(self, taxonomy: Any) -> None:
+        tax = taxonomy if isinstance(taxonomy, dict) else {}
+        self.class_slugs: list[str] = []  # taxonomy order: drug classes, then supplement classes
+        self.terms: dict[str, str] = {}
+        # bucket -> {slug: {"title": str, "aka": [str...]}} (display data for term expansion)
+        self.buckets: dict[str, dict[str, dict[str, Any]]] = {}
+
+        for bucket in CLASS_BUCKETS:
+            items = tax.get(bucket)
+            items = items if isinstance(items, list) else []
+            shown: dict[str, dict[str, Any]] = {}
+            for c in items:
+                if not isinstance(c, dict):
+                    continue
+                slug = c.get("slug")
+                if not isinstance(slug, str) or not slug.strip():
+                    continue
+                slug = slug.strip()
+                if slug not in self.class_slugs:
+                    self.class_slugs.append(slug)
+                aka = c.get("aka") or []
+                aka = [a for a in aka if isinstance(a, str)] if isinstance(aka, list) else []
+                for term in (slug, c.get("title") or "", *aka):
+                    t = norm_term(term) if isinstance(term, str) else ""
+                    if t:
+                        self.terms[t] = slug
+                title = c.get("title") if isinstance(c.get("title"), str) else slug
+                shown[slug] = {"title": title.strip(), "aka": [a.strip() for a in aka if a.strip()]}
+            self.buckets[bucket] = shown
+
+        self.slugs = frozenset(self.class_slugs)
+        self._memo: dict[str, str | None] = {}
+        self.resolved = 0
+        self.unresolved: Counter[tuple[str, str]] = Counter()
+
+    def _compile(self, raw: str) -> str | None:
+        if raw in self.slugs:
+            return raw
+        hit = self.terms.get(norm_term(raw))
+        if hit:
+            return hit
+        cand = slugify(raw)
+        return cand if cand in self.slugs else None
+
+    def resolve(self, token: str, where: str = "") -> str | None:
+        """
+        Canonical class slug for token, or None. Misses are counted for report() when
+        `where` names the source list (e.g. "drug_classes").
+        """
+        raw = (token or "").strip()
+        if not raw:
+            return None
+        try:
+            hit = self._memo[raw]
+        except KeyError:
+            hit = self._memo[raw] = self._compile(raw)
+        if hit is not None:
+            self.resolved += 1
+        elif where:
+            self.unresolved[(where, raw)] += 1
+        return hit
+
+    def display_terms(self, slug: str | None, bucket: str) -> list[str]:
+        """[title, *aka, slug] for a class slug of this bucket (e.g. from resolve()), else []."""
+        shown = self.buckets.get(bucket, {}).get(slug) if slug else None
+        return [shown["title"], *shown["aka"], slug] if shown else []
+
+    def report(self, limit: int = 20) -> list[str]:
+        """Lines describing unresolved tokens (empty when everything resolved)."""
+        if not self.unresolved:
+            return []
+        lines = [
+            f"Unresolved interaction tokens: {len(self.unresolved)} distinct, "
+            f"{sum(self.unresolved.values())} occurrence(s) ({self.resolved} resolved)"
+        ]
+        for (where, raw), n in sorted(self.unresolved.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]:
+            lines.append(f"  {where}: {raw!r}" + (f" x{n}" if n > 1 else ""))
+        if len(self.unresolved) > limit:
+            lines.append(f"  ... {len(self.unresolved) - limit} more")
+        return lines
+
+
+def load_canonicalizer(path: Path = TAXONOMY_PATH) -> InteractionCanonicalizer:
+    """Canonicalizer for the taxonomy file; a missing/unreadable taxonomy gives an empty one (best-effort, like the builders)."""
+    try:
+        tax = content.load_json(path)
+    except Exception:
+        tax = {}
+    return InteractionCanonicalizer(tax)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Structural rule engine for parsed content JSON.
+
+iter_leaves() walks a document once (depth-first, document order, explicit stack) and
+yields every scalar with its JSON path ("$.sections.overview[0].text") and the key or
+index holding it. Rules are checked against those leaves, and allowances are predicates
+on the leaf (key, path, value), so nothing has to rescan the raw file text to learn where
+a string sits.
+
+  Rule(code, matcher, allow={pattern: predicate})
+    matcher   PhraseMatcher over the rule's phrases/tokens
+    allow     per-pattern exemptions: predicate(leaf) -> True when the hit is allowed
+
+  RuleEngine(rules).check(doc) -> [Finding(code, pattern, leaf), ...]
+    one traversal for all rules; findings in document order, then rule order
+
+Usage:
+  sys.path.insert(0, str(ROOT))
+  from scripts.lib.json_rules import Rule, RuleEngine, key_is  # type: ignore
+  ENGINE = RuleEngine([
+      Rule("banned", PhraseMatcher(BANNED), allow={"mechanistic_only": key_is("evidence_grade", "mechanistic_only")}),
+  ])
+  for f in ENGINE.check(doc): print(f.code, f.pattern, f.leaf.path)
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, NamedTuple
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.phrase_matcher import PhraseMatcher  # type: ignore
+
+
+class Leaf(NamedTuple):
+    path: str                 # JSON path: $.a.b[0]
+    key: str | int | None     # dict key or list index holding the value (None for a scalar root)
+    value: Any
+
+
+LeafPredicate = Callable[[Leaf], bool]
+
+
+def iter_leaves(doc: Any, path: str = "$") -> Iterator[Leaf]:
+    """Every scalar (str, number, bool, None) in doc, in document order."""
+    stack: list[tuple[str, str | int | None, Any]] = [(path, None, doc)]
+    while stack:
+        p, k, x = stack.pop()
+        if isinstance(x, dict):
+            stack.extend((f"{p}.{ck}", ck, v) for ck, v in reversed(list(x.items())))
+        elif isinstance(x, list):
+            stack.extend((f"{p}[{i}]", i, x[i]) for i in range(len(x) - 1, -1, -1))
+        else:
+            yield Leaf(p, k, x)
+
+
+def iter_strings(doc: Any, path: str = "$") -> Iterator[Leaf]:
+    """String leaves only."""
+    return (leaf for leaf in iter_leaves(doc, path) if isinstance(leaf.value, str))
+
+
+def key_is(key: str, value: str | None = None) -> LeafPredicate:
+    """Leaf held under `key` (optionally with exactly `value`), e.g. key_is("evidence_grade", "mechanistic_only")."""
+    if value is None:
+        return lambda leaf: leaf.key == key
+    return lambda leaf: leaf.key == key and leaf.value == value
+
+
+class Rule(NamedTuple):
+    code: str
+    matcher: PhraseMatcher
+    allow: Mapping[str, LeafPredicate] = {}
+
+
+class Finding(NamedTuple):
+    code: str
+    pattern: str
+    leaf: Leaf
+
+
+class RuleEngine:
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        self.rules: tuple[Rule, ...] = tuple(rules)
+
+    def check_leaf(self, leaf: Leaf) -> list[Finding]:
+        out: list[Finding] = []
+        for rule in self.rules:
+            for pattern in rule.matcher.found(leaf.value):
+                ok = rule.allow.get(pattern)
+                if ok is not None and ok(leaf):
+                    continue
+                out.append(Finding(rule.code, pattern, leaf))
+        return out
+
+    def check(self, doc: Any) -> list[Finding]:
+        """Findings for every string leaf of doc, in one traversal."""
+        out: list[Finding] = []
+        for leaf in iter_strings(doc):
+            out.extend(self.check_leaf(leaf))
+        return out
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Multi-file driver for the per-document validators (validate_peptide_json.py,
+validate_blend_json.py).
+
+The validators keep their single-file behavior (same messages, exit 1 on the first
+failure). Given several paths, a directory, or a glob, they validate everything in one
+interpreter (optionally across a process pool) and report per-file pass/fail, plus an
+optional consolidated JSON result:
+
+{
+  "schema_version": "validation_results_v1",
+  "validator": "validate_peptide_json",
+  "counts": {"files": 92, "passed": 92, "failed": 0, "warnings": 3},
+  "results": [{"path": "content/peptides/bpc-157.json", "ok": true, "error": null, "warnings": []}, ...]
+}
+
+Results are always in sorted path order, regardless of --jobs.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+RESULTS_SCHEMA = "validation_results_v1"
+
+# validate(path) -> (error or None, warnings)
+ValidateFn = Callable[[Path], "tuple[str | None, list[str]]"]
+
+
+def expand_targets(targets: list[str]) -> list[Path]:
+    """Files, directories (every non-registry *.json inside) and globs -> sorted unique resolved paths."""
+    out: set[Path] = set()
+    for t in targets:
+        p = Path(t).expanduser()
+        if p.is_dir():
+            out.update(x.resolve() for x in p.glob("*.json") if not x.name.startswith("_"))
+        elif any(ch in t for ch in "*?["):
+            out.update(Path(x).resolve() for x in glob.glob(str(p)) if Path(x).is_file())
+        else:
+            # Missing files are kept so they are reported as failures.
+            out.add(p.resolve())
+    return sorted(out)
+
+
+def display_path(p: Path) -> str:
+    try:
+        return str(p.relative_to(ROOT))
+    except ValueError:
+        return str(p)
+
+
+def _run_one(args: tuple[ValidateFn, Path]) -> dict:
+    fn, p = args
+    error, warnings = fn(p)
+    return {"path": display_path(p), "ok": error is None, "error": error, "warnings": warnings}
+
+
+def validate_many(fn: ValidateFn, paths: list[Path], jobs: int = 1) -> list[dict]:
+    work = [(fn, p) for p in paths]
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            return list(ex.map(_run_one, work, chunksize=max(1, len(work) // (jobs * 4))))
+    return [_run_one(w) for w in work]
+
+
+def results_doc(validator: str, results: list[dict]) -> dict:
+    failed = sum(1 for r in results if not r["ok"])
+    return {
+        "schema_version": RESULTS_SCHEMA,
+        "validator": validator,
+        "counts": {
+            "files": len(results),
+            "passed": len(results) - failed,
+            "failed": failed,
+            "warnings": sum(len(r["warnings"]) for r in results),
+        },
+        "results": results,
+    }
+
+
+def report(validator: str, results: list[dict], json_out: str | None = None, quiet: bool = False) -> int:
+    """Print per-file lines + summary; write JSON to json_out ('-' = stdout only). Returns exit code."""
+    doc = results_doc(validator, results)
+    if json_out == "-":
+        print(json.dumps(doc, indent=2))
+    else:
+        for r in results:
+            if not r["ok"]:
+                print(f"FAIL {r['path']}: {r['error']}", file=sys.stderr)
+            elif not quiet:
+                print(f"PASS {r['path']}")
+            for w in r["warnings"]:
+                if not quiet:
+                    print(f"  WARNING: {w}", file=sys.stderr)
+        c = doc["counts"]
+        status = "PASSED" if c["failed"] == 0 else "FAILED"
+        print(f"VALIDATION {status}: {c['passed']}/{c['files']} file(s) passed, {c['failed']} failed, {c['warnings']} warning(s)")
+        if json_out:
+            out = Path(json_out)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+    return 0 if doc["counts"]["failed"] == 0 else 1
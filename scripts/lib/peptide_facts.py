@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Single-pass peptide facts table.
+
+Every peptide builder used to walk content/peptides/*.json itself and pull overlapping
+fields out of each document. PeptideFacts parses each document once (through the shared
+ContentLoader) and keeps one column per fact, row i = peptide i in slug order:
+
+  slug, path, error                      file stem, file path, parse error (str; also set for a non-object root) or None
+  has_peptide                            whether peptide is an object
+  pep_slug, canonical_name, short_name   raw peptide.* values (None when absent)
+  aliases, primary_topics                raw peptide.aliases / peptide.meta.primary_topics
+  entity_kind, taxonomy_keys             peptide.X, falling back to peptide.meta.X
+  appears_in_blends                      raw peptide.meta.appears_in_blends
+  status, classification, risk           peptide.* blocks (None unless an object)
+  evidence                               raw peptide.evidence (None when absent)
+  interactions                           top-level interactions block (None unless an object)
+  interaction_notes                      any non-empty interaction_summary string in peptide.sections
+
+Values are raw on purpose: each builder keeps applying its own normalization, so its
+output is byte-identical to walking the files itself. Columns are shared -- treat them
+as read-only.
+
+load_facts() memoizes the table on the peptide corpus fingerprint (name, mtime_ns, size
+per file), so every builder in one process (and every forked rebuild worker) reuses it
+until a peptide file changes. With PEPTIDE_CONTENT_CACHE set, the table is also kept
+on disk next to the parsed-document cache.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib import content  # type: ignore
+
+FACTS_VERSION = 1
+DISK_CACHE_NAME = "peptide_facts_v1.marshal"
+
+COLUMNS = (
+    "slug", "path", "error", "has_peptide",
+    "pep_slug", "canonical_name", "short_name", "aliases", "primary_topics",
+    "entity_kind", "taxonomy_keys", "appears_in_blends",
+    "status", "classification", "risk", "evidence",
+    "interactions", "interaction_notes",
+)
+
+
+def _dict_or_none(v: Any) -> dict | None:
+    return v if isinstance(v, dict) else None
+
+
+def has_interaction_notes(pep: dict) -> bool:
+    # Use what exists today: interaction_summary arrays embedded in sections (if present).
+    secs = pep.get("sections", [])
+    if not isinstance(secs, list):
+        return False
+    for s in secs:
+        if not isinstance(s, dict):
+            continue
+        summary = s.get("interaction_summary")
+        if isinstance(summary, list) and any(isinstance(x, str) and x.strip() for x in summary):
+            return True
+    return False
+
+
+def corpus_fingerprint(files: list[Path]) -> tuple:
+    out = []
+    for p in files:
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        out.append((p.name, st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+class PeptideFacts:
+    def __init__(self, columns: dict[str, list], fingerprint: tuple = ()) -> None:
+        self.columns = columns
+        self.fingerprint = fingerprint
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+        self._row_by_slug = {s: i for i, s in enumerate(self.slug)}
+
+    def __len__(self) -> int:
+        return len(self.slug)
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self._row_by_slug
+
+    def row_of(self, slug: str) -> int | None:
+        return self._row_by_slug.get(slug)
+
+    def rows(self) -> Iterator[int]:
+        return iter(range(len(self.slug)))
+
+    def record(self, i: int) -> dict[str, Any]:
+        """Row i as a dict (column name -> value)."""
+        return {name: self.columns[name][i] for name in COLUMNS}
+
+    @classmethod
+    def scan(cls, loader: content.ContentLoader | None = None, files: list[Path] | None = None) -> "PeptideFacts":
+        ld = loader if loader is not None else content.default_loader()
+        files = content.list_peptide_files() if files is None else files
+        fingerprint = corpus_fingerprint(files)
+        cols: dict[str, list] = {name: [] for name in COLUMNS}
+
+        for p in files:
+            error = None
+            try:
+                doc = ld.load_json(p)
+            except Exception as e:
+                doc, error = None, str(e)
+            if error is None and not isinstance(doc, dict):
+                doc, error = None, "Root JSON must be an object/dict"
+            doc = doc or {}
+            pep = doc.get("peptide")
+            has_peptide = isinstance(pep, dict)
+            pep = pep if has_peptide else {}
+            meta = _dict_or_none(pep.get("meta")) or {}
+
+            cols["slug"].append(p.stem)
+            cols["path"].append(str(p))
+            cols["error"].append(error)
+            cols["has_peptide"].append(has_peptide)
+            cols["pep_slug"].append(pep.get("slug"))
+            cols["canonical_name"].append(pep.get("canonical_name"))
+            cols["short_name"].append(pep.get("short_name"))
+            cols["aliases"].append(pep.get("aliases"))
+            cols["primary_topics"].append(meta.get("primary_topics"))
+            cols["entity_kind"].append(pep.get("entity_kind") or meta.get("entity_kind"))
+            cols["taxonomy_keys"].append(pep.get("taxonomy_keys") or meta.get("taxonomy_keys"))
+            cols["appears_in_blends"].append(meta.get("appears_in_blends"))
+            cols["status"].append(_dict_or_none(pep.get("status")))
+            cols["classification"].append(_dict_or_none(pep.get("classification")))
+            cols["risk"].append(_dict_or_none(pep.get("risk")))
+            cols["evidence"].append(pep.get("evidence"))
+            cols["interactions"].append(_dict_or_none(doc.get("interactions")))
+            cols["interaction_notes"].append(has_interaction_notes(pep))
+
+        return cls(cols, fingerprint)
+
+
+_MEMO: PeptideFacts | None = None
+
+
+def _disk_path() -> Path | None:
+    d = content.default_loader().disk_cache_dir
+    return d.parent / DISK_CACHE_NAME if d is not None else None
+
+
+def _disk_load(fingerprint: tuple) -> PeptideFacts | None:
+    path = _disk_path()
+    if path is None:
+        return None
+    try:
+        data = marshal.loads(path.read_bytes())
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("version") != FACTS_VERSION or data.get("root") != str(ROOT):
+        return None
+    if data.get("fingerprint") != fingerprint:
+        return None
+    return PeptideFacts(data["columns"], fingerprint)
+
+
+def _disk_save(facts: PeptideFacts) -> None:
+    path = _disk_path()
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(marshal.dumps({
+            "version": FACTS_VERSION,
+            "root": str(ROOT),
+            "fingerprint": facts.fingerprint,
+            "columns": facts.columns,
+        }))
+        os.replace(tmp, path)
+    except (OSError, ValueError):
+        pass
+
+
+def load_facts() -> PeptideFacts:
+    """The facts table for the current corpus, rescanned only when a peptide file changed."""
+    global _MEMO
+    files = content.list_peptide_files()
+    fingerprint = corpus_fingerprint(files)
+    if _MEMO is not None and _MEMO.fingerprint == fingerprint:
+        return _MEMO
+    facts = _disk_load(fingerprint)
+    if facts is None:
+        facts = PeptideFacts.scan(files=files)
+        _disk_save(facts)
+    _MEMO = facts
+    return facts
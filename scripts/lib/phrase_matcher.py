@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Compiled multi-pattern matcher for the content-language validators and audits.
+
+A rule set (placeholder tokens, banned phrases, assertive verbs, ...) is compiled once into
+a single prefix-factored regex wrapped in a lookahead, so one scan of a string reports every
+occurrence of every pattern with its position -- instead of one `in` test or one regex per
+pattern per string. Cost stays flat as curators add phrases.
+
+Matching is on text.lower() (patterns are lower-cased too), as the scanners always did;
+positions are offsets into text.lower(), which equal offsets into text for all but a few
+exotic characters.
+
+  PhraseMatcher(phrases)               literal substrings ("phrase" in text.lower())
+  PhraseMatcher(phrases, words=True)   whole words/phrases (r"\\bphrase\\b")
+  PhraseMatcher(patterns, regex=True)  regexes; at one position the first-listed pattern wins
+
+hits() returns every (pattern index, pattern, start, end) occurrence -- for literals, also
+overlapping ones and patterns that are prefixes of a longer pattern at the same start --
+so results equal looping over the patterns one at a time. Patterns keep their list order
+as priority: first() / found() answer "first pattern in the list that occurs".
+
+Usage:
+  sys.path.insert(0, str(ROOT))
+  from scripts.lib.phrase_matcher import PhraseMatcher  # type: ignore
+  BANNED = PhraseMatcher(BANNED_PHRASES)
+  for phrase in BANNED.found(s): ...
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, NamedTuple
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+class Hit(NamedTuple):
+    index: int      # position of the pattern in the rule list
+    pattern: str    # the pattern as given
+    start: int
+    end: int
+
+
+def _is_word(c: str) -> bool:
+    return bool(_WORD_CHAR.match(c))
+
+
+def _trie_regex(texts: Iterable[str]) -> str:
+    """
+    Regex for a set of literals, factored by shared prefix ("ab|ac" -> "a(?:b|c)"), so the
+    engine branches on one character per step instead of trying every literal at every
+    position. Longer continuations come before the end of a shorter literal (longest match).
+    """
+    trie: dict = {}
+    for t in texts:
+        node = trie
+        for ch in t:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        tails = [(ch, emit(child)) for ch, child in sorted(node.items()) if ch]
+        if not tails:
+            return ""
+        if len(tails) > 1 and not any(tail for _, tail in tails):
+            body = "[" + "".join(re.escape(ch) for ch, _ in tails) + "]"
+        elif len(tails) == 1:
+            body = re.escape(tails[0][0]) + tails[0][1]
+        else:
+            body = "(?:" + "|".join(re.escape(ch) + tail for ch, tail in tails) + ")"
+        if "" in node:  # a literal ends here: the rest is optional (greedy, so longest first)
+            return (body if body.startswith("[") or len(tails) == 1 and len(body) == 1 else f"(?:{body})") + "?"
+        return body
+
+    return emit(trie)
+
+
+class PhraseMatcher:
+    def __init__(self, patterns: Iterable[str], *, words: bool = False, regex: bool = False) -> None:
+        self.patterns: tuple[str, ...] = tuple(patterns)
+        self.words = words
+        self.regex = regex
+        self._re: re.Pattern[str] | None = None
+        if not self.patterns:
+            return
+
+        if regex:
+            alts = [f"(?P<p{i}>{p})" for i, p in enumerate(self.patterns)]
+            self._re = re.compile("(?=(?:" + "|".join(alts) + "))")
+            return
+
+        # lower-cased literal -> pattern indexes (case variants of one token stay separate rules)
+        self._by_text: dict[str, list[int]] = {}
+        for i, p in enumerate(self.patterns):
+            self._by_text.setdefault(p.lower(), []).append(i)
+        # Longest first, so each start position reports its longest literal; shorter literals
+        # that are prefixes of it (same start) are added from _prefixes.
+        texts = sorted((t for t in self._by_text if t), key=lambda t: (-len(t), t))
+        self._prefixes = {t: [u for u in texts if u != t and t.startswith(u)] for t in texts}
+        b = r"\b" if words else ""
+        self._re = re.compile("(?=" + b + "(" + _trie_regex(texts) + ")" + b + ")")
+
+    def _word_end_ok(self, lowered: str, end: int) -> bool:
+        # \b after a literal ending at `end` (the start boundary is shared with the longer hit)
+        before = _is_word(lowered[end - 1])
+        after = end < len(lowered) and _is_word(lowered[end])
+        return before != after
+
+    def hits(self, text: str) -> list[Hit]:
+        """Every occurrence of every pattern in text, by start position then pattern order."""
+        if self._re is None or not text:
+            return []
+        lowered = text.lower()
+        out: list[Hit] = []
+        if self.regex:
+            for m in self._re.finditer(lowered):
+                name = m.lastgroup
+                i = int(name[1:])
+                out.append(Hit(i, self.patterns[i], m.start(name), m.end(name)))
+            return out
+        for m in self._re.finditer(lowered):
+            start = m.start(1)
+            found = [m.group(1)]
+            for u in self._prefixes[found[0]]:
+                if not self.words or self._word_end_ok(lowered, start + len(u)):
+                    found.append(u)
+            batch = [Hit(i, self.patterns[i], start, start + len(t)) for t in found for i in self._by_text[t]]
+            out.extend(sorted(batch))
+        return out
+
+    def search(self, text: str) -> bool:
+        return self._re is not None and bool(text) and self._re.search(text.lower()) is not None
+
+    def first(self, text: str) -> Hit | None:
+        """Earliest occurrence of the first-listed pattern that occurs, or None."""
+        hits = self.hits(text)
+        return min(hits) if hits else None
+
+    def found(self, text: str) -> list[str]:
+        """Distinct patterns that occur in text, in list order."""
+        seen = sorted({h.index for h in self.hits(text)})
+        return [self.patterns[i] for i in seen]
+
+
+def hit_in_window(hits: Iterable[Hit], lo: int, hi: int) -> bool:
+    """True when some hit lies entirely inside [lo, hi) -- i.e. `pattern in text[lo:hi]`."""
+    return any(lo <= h.start and h.end <= hi for h in hits)
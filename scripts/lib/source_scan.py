@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Incremental phrase scan over a source tree (app/web leak-marker check).
+
+- iter_source_files(): os.scandir walk that prunes ignored directories (node_modules,
+  .next, ...) before descending, instead of filtering paths after a full rglob.
+- SourceScanCache: persistent (scripts/_cache/, untracked) map of
+  repo-relative path -> (size, mtime_ns, content hash, patterns found). A file whose
+  size and mtime_ns match is not read at all; a file whose stat changed but whose bytes
+  hash the same (touch, checkout) is not rescanned. The cache is keyed on the pattern
+  list, so editing the markers invalidates it.
+- Racy entries: a file modified within RACY_NS of the previous save may have been
+  rewritten without an mtime change, so its stat alone is never trusted (it is re-hashed).
+
+Usage:
+  sys.path.insert(0, str(ROOT))
+  from scripts.lib.source_scan import open_cache, scan_tree  # type: ignore
+  cache = open_cache("web_leak_scan", MATCHER.patterns)
+  for path, found in scan_tree(WEB_DIR, suffixes, ignore_dirs, MATCHER, cache): ...
+
+Set PEPTIDE_SOURCE_SCAN_CACHE=0 to scan without the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.phrase_matcher import PhraseMatcher  # type: ignore
+
+CACHE_DIR = ROOT / "scripts" / "_cache"
+CACHE_ENV = "PEPTIDE_SOURCE_SCAN_CACHE"
+CACHE_VERSION = 1
+RACY_NS = 2_000_000_000
+
+
+def iter_source_files(base: Path, suffixes: Iterable[str], ignore_dirs: Iterable[str]) -> Iterator[os.DirEntry]:
+    """
+    Files under base with one of `suffixes` (case-insensitive), depth-first in name order
+    (a directory's files before its subdirectories). Ignored dirs are never entered.
+    """
+    suffixes = {s.lower() for s in suffixes}
+    ignore = set(ignore_dirs)
+    stack = [str(base)]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                entries = sorted(it, key=lambda e: e.name, reverse=True)
+        except OSError:
+            continue
+        files = []
+        for e in entries:
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    if e.name not in ignore:
+                        stack.append(e.path)
+                elif os.path.splitext(e.name)[1].lower() in suffixes and e.is_file():
+                    files.append(e)
+            except OSError:
+                continue
+        yield from reversed(files)
+
+
+def _pattern_key(patterns: Iterable[str]) -> str:
+    return hashlib.sha256(json.dumps(list(patterns)).encode("utf-8")).hexdigest()[:16]
+
+
+class SourceScanCache:
+    def __init__(self, name: str, patterns: Iterable[str], path: Path | None = None) -> None:
+        self.path = path if path is not None else CACHE_DIR / f"{name}_v{CACHE_VERSION}.json"
+        self.key = _pattern_key(patterns)
+        self.entries: dict[str, list] = {}   # rel -> [size, mtime_ns, sha256, found]
+        self.saved_at_ns = 0
+        self.read = 0       # files read from disk this run
+        self.scanned = 0    # files actually scanned this run
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION and data.get("patterns") == self.key:
+            self.entries = data.get("files") or {}
+            self.saved_at_ns = int(data.get("saved_at_ns") or 0)
+
+    def lookup(self, rel: str, size: int, mtime_ns: int) -> list[str] | None:
+        """Cached result when the stat fingerprint matches (and is not racy), else None."""
+        e = self.entries.get(rel)
+        if e is None or e[0] != size or e[1] != mtime_ns or mtime_ns >= self.saved_at_ns - RACY_NS:
+            return None
+        return e[3]
+
+    def lookup_hash(self, rel: str, digest: str) -> list[str] | None:
+        e = self.entries.get(rel)
+        return e[3] if e is not None and e[2] == digest else None
+
+    def store(self, rel: str, size: int, mtime_ns: int, digest: str, found: list[str]) -> None:
+        self.entries[rel] = [size, mtime_ns, digest, found]
+
+    def save(self, keep: Iterable[str]) -> None:
+        """Write the cache, dropping entries for files no longer present (best-effort)."""
+        keep = set(keep)
+        data = {
+            "version": CACHE_VERSION,
+            "patterns": self.key,
+            "saved_at_ns": time.time_ns(),
+            "files": {k: v for k, v in sorted(self.entries.items()) if k in keep},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, separators=(",", ":")) + "\n", encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def open_cache(name: str, patterns: Iterable[str]) -> SourceScanCache | None:
+    """The named scan cache, or None when disabled via PEPTIDE_SOURCE_SCAN_CACHE=0."""
+    if os.environ.get(CACHE_ENV, "").strip() == "0":
+        return None
+    return SourceScanCache(name, patterns)
+
+
+def scan_tree(
+    base: Path,
+    suffixes: Iterable[str],
+    ignore_dirs: Iterable[str],
+    matcher: PhraseMatcher,
+    cache: SourceScanCache | None = None,
+) -> Iterator[tuple[Path, list[str]]]:
+    """
+    (path, patterns found) for every matching source file under base (iter_source_files order).
+    Files are decoded as UTF-8 with replacement, as the validators' read_text() did.
+    With a cache (built for matcher.patterns), unchanged files are answered from it and the
+    cache is saved once the scan completes.
+    """
+    seen: list[str] = []
+    for e in iter_source_files(base, suffixes, ignore_dirs):
+        p = Path(e.path)
+        try:
+            st = e.stat()
+        except OSError:
+            continue
+        rel = os.path.relpath(e.path, ROOT)
+        seen.append(rel)
+        found = cache.lookup(rel, st.st_size, st.st_mtime_ns) if cache is not None else None
+        if found is None:
+            try:
+                raw = p.read_bytes()
+            except OSError:
+                continue
+            digest = ""
+            if cache is not None:
+                cache.read += 1
+                digest = hashlib.sha256(raw).hexdigest()
+                found = cache.lookup_hash(rel, digest)
+            if found is None:
+                found = matcher.found(raw.decode("utf-8", errors="replace"))
+                if cache is not None:
+                    cache.scanned += 1
+            if cache is not None:
+                cache.store(rel, st.st_size, st.st_mtime_ns, digest, found)
+        yield p, found
+    if cache is not None:
+        cache.save(seen)
@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 import csv
 import json
-import subprocess
 import sys
 from pathlib import Path
 from collections import defaultdict
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.search.resolve_query import QueryResolver  # type: ignore
+
 ENTITIES = ROOT / "content/_index/entities_v1.json"
 QUEUE = ROOT / "content/peptides/_queue.csv"
-RESOLVER = ROOT / "scripts/search/resolve_query.py"
 
 def die(msg: str, code: int = 1):
     print(f"ERROR: {msg}", file=sys.stderr)
@@ -34,21 +36,21 @@ def load_queue() -> tuple[list[dict], list[str]]:
 def norm(s: str) -> str:
     return (s or "").strip().lower()
 
-def run_resolver(query: str) -> dict:
-    # Use python3 to run the resolver script
-    p = subprocess.run(
-        ["python3", str(RESOLVER), query],
-        cwd=str(ROOT),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    if p.returncode != 0:
-        return {"_error": True, "_stderr": p.stderr.strip(), "query": query}
+def run_resolver_batch(queries: list[str]) -> dict[str, dict]:
+    # One in-process resolver for the whole query set (index parsed once).
+    # Per-query failures are reported the same way the old subprocess runner did.
     try:
-        return json.loads(p.stdout)
-    except Exception:
-        return {"_error": True, "_stderr": "Non-JSON output", "_raw": p.stdout[-4000:], "query": query}
+        resolver = QueryResolver()
+    except SystemExit:
+        die("Resolver failed to load search routes index (run rebuild_all_indexes)")
+
+    out = {}
+    for q in queries:
+        try:
+            out[q] = resolver.resolve(q)
+        except (SystemExit, Exception) as e:
+            out[q] = {"_error": True, "_stderr": str(e), "query": q}
+    return out
 
 def extract_entity_map(idx: dict) -> dict[str, dict]:
     # entities_v1.json shape in your project: {"peptides":[...], "blends":[...]}
@@ -115,8 +117,9 @@ def main() -> int:
     did_you_mean_only = []
     ok = 0
 
+    results = run_resolver_batch(queries)
     for q in queries:
-        res = run_resolver(q)
+        res = results[q]
         if res.get("_error"):
             resolver_errors.append(res)
             continue
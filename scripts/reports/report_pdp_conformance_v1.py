@@ -3,6 +3,11 @@
 from pathlib import Path
 import json
 import re
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scripts.lib.json_rules import iter_leaves  # type: ignore
 
 ROOT = Path(".").resolve()
 
@@ -35,24 +40,18 @@ def is_entity_file(p: Path) -> bool:
 
 def find_pending_paths(obj, path="$"):
   hits = []
-  if isinstance(obj, dict):
-    for k, v in obj.items():
-      hits += find_pending_paths(v, f"{path}.{k}")
-  elif isinstance(obj, list):
-    for i, v in enumerate(obj):
-      hits += find_pending_paths(v, f"{path}[{i}]")
-  else:
-    if obj is None:
-      return hits
+  for leaf in iter_leaves(obj, path):
+    if leaf.value is None:
+      continue
     try:
-      s = str(obj)
+      s = str(leaf.value)
     except Exception:
-      return hits
+      continue
     if s and PENDING_RE.search(s):
       snippet = s.strip().replace("\n", " ")
       if len(snippet) > 120:
         snippet = snippet[:117] + "..."
-      hits.append((path, snippet))
+      hits.append((leaf.path, snippet))
   return hits
 
 def summarize_peptide(doc: dict):
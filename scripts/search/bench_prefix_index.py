@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark typeahead prefix lookup (resolver step 3).
+
+Compares the old linear scan over all terms with PrefixIndex (bisect range lookup)
+for per-keystroke latency: every prefix of a sample of terms is looked up, the way
+a user typing character by character would hit the resolver.
+
+Indexes measured:
+- current: terms from content/_index/search_routes_v1.json
+- synthetic: deterministic random index (default 100k terms) to model catalog growth
+
+Usage:
+  python3 scripts/search/bench_prefix_index.py
+  python3 scripts/search/bench_prefix_index.py --synthetic 250000 --sample 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.search.resolve_query import ROUTES_PATH, PrefixIndex, build_term_map, load_json  # type: ignore
+
+LIMIT = 15  # same cap the resolver applies to prefix hits
+
+
+def linear_lookup(all_terms: list[str], prefix: str) -> list[str]:
+    return [t for t in all_terms if t.startswith(prefix)][:LIMIT]
+
+
+def synthetic_terms(n: int, seed: int = 1337) -> list[str]:
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + string.digits
+    out = set()
+    while len(out) < n:
+        words = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(2, 9)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        out.add("-".join(words) if rng.random() < 0.3 else " ".join(words))
+    return sorted(out)
+
+
+def keystrokes(terms: list[str], sample: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    picked = rng.sample(terms, min(sample, len(terms)))
+    out = []
+    for t in picked:
+        for i in range(1, len(t) + 1):
+            out.append(t[:i])
+    return out
+
+
+def time_per_call(fn, queries: list[str]) -> float:
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - t0) / max(1, len(queries))
+
+
+def bench(label: str, terms: list[str], sample: int) -> None:
+    idx = PrefixIndex(terms)
+    all_terms = idx.terms
+    queries = keystrokes(all_terms, sample)
+
+    # Sanity: both paths must agree before timings mean anything.
+    for q in queries[:500]:
+        if linear_lookup(all_terms, q) != idx.lookup(q, limit=LIMIT):
+            print(f"ERROR: prefix mismatch for {q!r}", file=sys.stderr)
+            raise SystemExit(1)
+
+    lin = time_per_call(lambda q: linear_lookup(all_terms, q), queries)
+    bis = time_per_call(lambda q: idx.lookup(q, limit=LIMIT), queries)
+    speedup = lin / bis if bis else float("inf")
+    print(
+        f"{label:<10} terms={len(all_terms):>7}  keystrokes={len(queries):>6}  "
+        f"linear={lin * 1e6:10.1f}us  bisect={bis * 1e6:8.2f}us  speedup={speedup:8.1f}x"
+    )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--synthetic", type=int, default=100_000, help="Synthetic index size (0 to skip)")
+    ap.add_argument("--sample", type=int, default=100, help="Terms typed per index (every prefix is timed)")
+    args = ap.parse_args()
+
+    if ROUTES_PATH.exists():
+        term_map = build_term_map(load_json(ROUTES_PATH))
+        bench("current", list(term_map.keys()), args.sample)
+    else:
+        print(f"SKIP: current (missing {ROUTES_PATH})")
+
+    if args.synthetic > 0:
+        bench("synthetic", synthetic_terms(args.synthetic), args.sample)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
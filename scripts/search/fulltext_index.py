@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Full-text BM25 index over peptide and blend text (sections, practical block, interaction
+summaries) -- the text resolve_query() never looks at.
+
+Output: content/_index/fulltext_v1.pack
+
+Build: every text passage (a non-placeholder string under peptide.sections, the top-level
+sections/practical blocks, blend.sections, blend.practical) is tokenized into an inverted
+index. Postings are per (term, document) with the BM25 impact precomputed at build time
+(k1=1.2, b=0.75, idf = ln(1 + (N - df + 0.5) / (df + 0.5))), so a query is one sum over the
+postings of its terms. Each posting also keeps the passage and character span of the term's
+first occurrence for snippets.
+
+Tokens: word runs, lower-cased, stopwords dropped, simple plural folding ("effects" ->
+"effect", "therapies" -> "therapy"); the same rules apply to queries.
+
+File layout (same framing as search_routes_v1.pack):
+  MAGIC (4 bytes) | format version (u16) | marshal version (u16) | sha256 of the inputs (32 bytes) | marshal payload
+Payload: docs (kind, slug, name, route), passages (doc, field, text), sorted terms, and flat
+little-endian u32 / float32 arrays: post_offsets, post_docs, post_weights, post_passages,
+post_starts, post_ends.
+
+Usage:
+  python3 scripts/search/fulltext_index.py                  # build the pack
+  python3 scripts/search/fulltext_index.py --check          # exit 1 if missing or stale
+  python3 scripts/search/fulltext_index.py --query "nausea"  # ranked results as JSON
+
+Staleness: the header digest covers the raw bytes of every source document. FullTextIndex.load()
+recomputes it (a few ms, once per process) and refuses a pack built from other content with
+a warning, rather than serving outdated postings and snippet offsets. With no source documents
+present (pack-only deploy) the pack is trusted as-is, like search_routes_v1.pack.
+
+Resolver fallback (opt-in): QueryResolver(fulltext=True) (or resolve_query.py --fulltext)
+attaches "fulltext" results when a query resolves to no route.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import marshal
+import math
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib import content  # type: ignore
+from scripts.lib.atomic_io import write_bytes_if_changed  # type: ignore
+from scripts.search.routes_pack import _from_u32, _u32  # type: ignore
+
+PACK_PATH = content.INDEX_DIR / "fulltext_v1.pack"
+
+MAGIC = b"PTFT"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHH32s")
+
+K1 = 1.2
+B = 0.75
+SNIPPET_RADIUS = 80
+
+_WORD = re.compile(r"[^\W_]+")
+STOPWORDS = frozenset("""
+a an and are as at be been being but by can could did do does for from had has have how if in into
+is it its may might more most no not of on or other our over own same should so some such than that
+the their them then there these they this those through to too under until up very was we were what
+when where which while who why will with within without would you your
+""".split())
+
+# Keys that hold labels/enums/refs rather than prose.
+SKIP_KEYS = frozenset({
+    "claim_type", "population_group", "confidence", "evidence_grade", "evidence_refs",
+    "schema_version", "route", "unit", "min", "max", "id",
+})
+
+
+def die(msg: str, code: int = 1) -> None:
+    print(f"ERROR: {msg}", file=sys.stderr)
+    raise SystemExit(code)
+
+
+def fold(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> Iterator[tuple[str, int, int]]:
+    """(term, start, end) for each indexable word; offsets are into `text`."""
+    for m in _WORD.finditer(text):
+        w = m.group().lower()
+        if w in STOPWORDS or (len(w) < 2 and not w.isdigit()):
+            continue
+        yield fold(w), m.start(), m.end()
+
+
+def _placeholder(s: str) -> bool:
+    return "curation pending" in s.lower()
+
+
+def iter_passages(obj: Any, field: str) -> Iterator[tuple[str, str]]:
+    """(field path, text) for every prose string under obj."""
+    if isinstance(obj, str):
+        s = obj.strip()
+        if s and not _placeholder(s):
+            yield field, s
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from iter_passages(v, field)
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            if k not in SKIP_KEYS:
+                yield from iter_passages(v, f"{field}.{k}")
+
+
+def entity_sources() -> Iterator[tuple[str, str, str, list[tuple[str, Any]], Path]]:
+    """(kind, slug, name, [(field, block)...], path) for every peptide and blend."""
+    for d in content.iter_peptides():
+        blocks = [("sections", d.sections), ("practical", d.practical), ("sections", d.raw.get("sections"))]
+        yield "peptide", d.slug, d.canonical_name, blocks, d.path
+    for d in content.iter_blends():
+        yield "blend", d.slug, d.display_name, [("sections", d.sections), ("practical", d.practical)], d.path
+
+
+def source_digest(paths: list[Path] | None = None) -> bytes | None:
+    """sha256 over the source documents (entity_sources() order); None when there are none."""
+    if paths is None:
+        paths = content.list_peptide_files() + content.list_blend_files()
+    if not paths:
+        return None
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode("utf-8") + b"\0" + path.read_bytes() + b"\0")
+    return digest.digest()
+
+
+# --- build ---
+
+def build_payload() -> tuple[dict[str, Any], bytes]:
+    docs: list[tuple[str, str, str, str]] = []
+    passages: list[tuple[int, str, str]] = []
+    doc_len: list[int] = []
+    # term -> {doc: [tf, passage, start, end]} (first occurrence kept for the snippet)
+    postings: dict[str, dict[int, list[int]]] = {}
+    paths: list[Path] = []
+
+    for kind, slug, name, blocks, path in entity_sources():
+        paths.append(path)
+        doc = len(docs)
+        docs.append((kind, slug, name, f"{kind}:{slug}"))
+        n = 0
+        for label, block in blocks:
+            for field, text in iter_passages(block, label):
+                pid = len(passages)
+                passages.append((doc, field, text))
+                for term, start, end in tokenize(text):
+                    n += 1
+                    hit = postings.setdefault(term, {}).get(doc)
+                    if hit is None:
+                        postings[term][doc] = [1, pid, start, end]
+                    else:
+                        hit[0] += 1
+        doc_len.append(n)
+
+    n_docs = len(docs)
+    avgdl = (sum(doc_len) / n_docs) if n_docs else 0.0
+    terms = sorted(postings)
+    offsets = [0]
+    post_docs: list[int] = []
+    weights = array("f")
+    post_passages: list[int] = []
+    starts: list[int] = []
+    ends: list[int] = []
+    for term in terms:
+        plist = postings[term]
+        df = len(plist)
+        idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        for doc in sorted(plist):
+            tf, pid, start, end = plist[doc]
+            norm = K1 * (1.0 - B + B * doc_len[doc] / avgdl) if avgdl else K1
+            post_docs.append(doc)
+            weights.append(idf * tf * (K1 + 1.0) / (tf + norm))
+            post_passages.append(pid)
+            starts.append(start)
+            ends.append(end)
+        offsets.append(len(post_docs))
+    if sys.byteorder != "little":
+        weights.byteswap()
+
+    payload = {
+        "version": "v1",
+        "params": {"k1": K1, "b": B, "docs": n_docs, "avgdl": avgdl},
+        "docs": tuple(docs),
+        "passages": tuple(passages),
+        "terms": tuple(terms),
+        "post_offsets": _u32(offsets),
+        "post_docs": _u32(post_docs),
+        "post_weights": weights.tobytes(),
+        "post_passages": _u32(post_passages),
+        "post_starts": _u32(starts),
+        "post_ends": _u32(ends),
+    }
+    return payload, source_digest(paths) or hashlib.sha256().digest()
+
+
+def encode_pack(payload: dict[str, Any], digest: bytes) -> bytes:
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, marshal.version, digest) + marshal.dumps(payload)
+
+
+def decode_pack(blob: bytes, expected_sha256: bytes | None = None) -> dict | None:
+    """Decoded payload, or None when the pack is unusable."""
+    if len(blob) < _HEADER.size:
+        return None
+    magic, fmt, mver, digest = _HEADER.unpack_from(blob)
+    if magic != MAGIC or fmt != FORMAT_VERSION or mver != marshal.version:
+        return None
+    if expected_sha256 is not None and digest != expected_sha256:
+        return None
+    try:
+        payload = marshal.loads(blob[_HEADER.size:])
+    except Exception:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    for k in ("post_offsets", "post_docs", "post_passages", "post_starts", "post_ends"):
+        payload[k] = _from_u32(payload[k])
+    w = array("f")
+    w.frombytes(payload["post_weights"])
+    if sys.byteorder != "little":
+        w.byteswap()
+    payload["post_weights"] = w
+    return payload
+
+
+def write_pack(pack_path: Path = PACK_PATH) -> tuple[int, bool, dict]:
+    payload, digest = build_payload()
+    blob = encode_pack(payload, digest)
+    changed = write_bytes_if_changed(pack_path, blob)
+    return len(blob), changed, payload
+
+
+# --- query ---
+
+class FullTextIndex:
+    """BM25 search over a decoded pack. Terms are looked up by dict; scoring sums precomputed impacts."""
+
+    def __init__(self, payload: dict) -> None:
+        self.p = payload
+        self.docs: tuple = payload["docs"]
+        self.passages: tuple = payload["passages"]
+        self._pos = {t: n for n, t in enumerate(payload["terms"])}
+
+    @classmethod
+    def load(cls, pack_path: Path = PACK_PATH, verify: bool = True) -> "FullTextIndex | None":
+        """The index, or None when the pack is missing, unreadable or (verify) stale."""
+        if not pack_path.exists():
+            return None
+        blob = pack_path.read_bytes()
+        expected = source_digest() if verify else None
+        if expected is not None and blob[_HEADER.size - 32:_HEADER.size] != expected:
+            print(f"WARNING: {pack_path.name} is stale (content changed since it was built); "
+                  "full-text search is off until scripts/search/fulltext_index.py is rerun", file=sys.stderr)
+            return None
+        payload = decode_pack(blob, expected)
+        return cls(payload) if payload is not None else None
+
+    def snippet(self, passage: int, start: int, end: int, radius: int = SNIPPET_RADIUS) -> dict[str, Any]:
+        _, field, text = self.passages[passage]
+        lo = max(0, start - radius)
+        hi = min(len(text), end + radius)
+        return {"field": field, "start": start, "end": end, "text": text[lo:hi], "text_start": lo}
+
+    def search(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
+        """BM25-ranked peptides/blends for query (OR over its terms), best first."""
+        p = self.p
+        offs, pdocs, pw = p["post_offsets"], p["post_docs"], p["post_weights"]
+        scores: dict[int, float] = {}
+        best: dict[int, tuple[float, int]] = {}  # doc -> (impact, posting) of its strongest term
+        for term in dict.fromkeys(t for t, _, _ in tokenize(query)):
+            n = self._pos.get(term)
+            if n is None:
+                continue
+            for i in range(offs[n], offs[n + 1]):
+                d = pdocs[i]
+                w = pw[i]
+                scores[d] = scores.get(d, 0.0) + w
+                if w > best.get(d, (-1.0, 0))[0]:
+                    best[d] = (w, i)
+        top = heapq.nlargest(limit, scores.items(), key=lambda kv: (kv[1], -kv[0]))
+        out = []
+        for d, score in top:
+            kind, slug, name, route = self.docs[d]
+            i = best[d][1]
+            out.append({
+                "route": route,
+                "kind": kind,
+                "slug": slug,
+                "name": name,
+                "score": round(score, 4),
+                "snippet": self.snippet(p["post_passages"][i], p["post_starts"][i], p["post_ends"][i]),
+            })
+        return out
+
+
+_DEFAULT_INDEX: FullTextIndex | None = None
+
+
+def get_index() -> FullTextIndex | None:
+    """Process-wide index (lazy); None when the pack is missing or unreadable."""
+    global _DEFAULT_INDEX
+    if _DEFAULT_INDEX is None:
+        _DEFAULT_INDEX = FullTextIndex.load()
+    return _DEFAULT_INDEX
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build or query the BM25 full-text index.")
+    ap.add_argument("--check", action="store_true", help="Fail if the pack is missing or does not match content/")
+    ap.add_argument("--query", help="Search the pack and print ranked results as JSON")
+    ap.add_argument("--limit", type=int, default=10)
+    args = ap.parse_args()
+
+    if args.query is not None:
+        idx = get_index()
+        if idx is None:
+            die(f"Missing, unreadable or stale {PACK_PATH} (run scripts/search/fulltext_index.py)")
+        print(json.dumps(idx.search(args.query, args.limit), indent=2, ensure_ascii=False))
+        return 0
+
+    if args.check:
+        blob = PACK_PATH.read_bytes() if PACK_PATH.exists() else b""
+        if decode_pack(blob, source_digest() or hashlib.sha256().digest()) is None:
+            die(f"Stale or missing {PACK_PATH} (run scripts/search/fulltext_index.py)")
+        print(f"OK: {PACK_PATH} matches content/")
+        return 0
+
+    size, changed, payload = write_pack()
+    print(f"{'Wrote' if changed else 'Unchanged'}: {PACK_PATH} ({size} bytes, {len(payload['docs'])} docs, "
+          f"{len(payload['terms'])} terms, {len(payload['post_docs'])} postings)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,6 +15,16 @@ Outputs (JSON):
 This resolver:
 - NEVER invents entities
 - ONLY routes to known deep links from content/_index/search_routes_v1.json
+
+Long-lived callers (QA jobs, services) should hold a QueryResolver (or use
+get_resolver()) so the routes index is parsed once, not per query.
+
+Batch mode: `--batch` reads JSONL queries on stdin and writes one JSON result per line.
+
+`--fulltext` (QueryResolver(fulltext=True)) adds BM25 section-text matches
+(scripts/search/fulltext_index.py) as "fulltext" when a query resolves to no route.
+It is opt-in so the default output stays the routes-only JSON; a stale or missing
+full-text pack yields "fulltext": [] (with a warning for a stale one).
 """
 
 from __future__ import annotations
@@ -22,34 +32,31 @@ from __future__ import annotations
 import json
 import re
 import sys
+from bisect import bisect_left
 from dataclasses import dataclass
-from difflib import get_close_matches
 from pathlib import Path
+from collections.abc import Mapping
 from typing import Any
 
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.search.fulltext_index import FullTextIndex  # type: ignore
+from scripts.search.routes_pack import PACK_PATH, PackedTerms, load_pack  # type: ignore
+from scripts.search.spelling_index import SpellingIndex  # type: ignore
+
 ROUTES_PATH = ROOT / "content" / "_index" / "search_routes_v1.json"
 
 SYNONYMS_PATH = ROOT / "content" / "_taxonomy" / "search_synonyms_v1.json"
 
 _ENTITY_SYNONYMS_CACHE = None
 
-def load_entity_synonyms_strict():
-    """
-    Returns dict: term_norm -> route
-    STRICT: only include rows with a non-empty route and slugs[] length == 1.
-    This is used to force direct routing for exact synonym terms.
-    """
-    global _ENTITY_SYNONYMS_CACHE
-    if _ENTITY_SYNONYMS_CACHE is not None:
-        return _ENTITY_SYNONYMS_CACHE
-
-    if not SYNONYMS_PATH.exists():
-        _ENTITY_SYNONYMS_CACHE = {}
-        return _ENTITY_SYNONYMS_CACHE
+def _load_entity_synonyms_strict_from(path: Path) -> dict[str, str]:
+    if not path.exists():
+        return {}
 
-    data = json.loads(SYNONYMS_PATH.read_text(encoding="utf-8"))
+    data = json.loads(path.read_text(encoding="utf-8"))
     rows = data.get("entity_synonyms", [])
     out = {}
     if isinstance(rows, list):
@@ -61,11 +68,23 @@ def load_entity_synonyms_strict():
                 continue
             if isinstance(slugs, list) and len(slugs) == 1 and (slugs[0] or "").strip():
                 out[term] = route
-
-    _ENTITY_SYNONYMS_CACHE = out
     return out
 
 
+def load_entity_synonyms_strict():
+    """
+    Returns dict: term_norm -> route
+    STRICT: only include rows with a non-empty route and slugs[] length == 1.
+    This is used to force direct routing for exact synonym terms.
+    """
+    global _ENTITY_SYNONYMS_CACHE
+    if _ENTITY_SYNONYMS_CACHE is not None:
+        return _ENTITY_SYNONYMS_CACHE
+
+    _ENTITY_SYNONYMS_CACHE = _load_entity_synonyms_strict_from(SYNONYMS_PATH)
+    return _ENTITY_SYNONYMS_CACHE
+
+
 
 def die(msg: str, code: int = 1) -> None:
     print(f"ERROR: {msg}", file=sys.stderr)
@@ -215,185 +234,357 @@ def candidates_from_term(term_entry: dict) -> list[Candidate]:
     return out
 
 
-def resolve_query(query_raw: str) -> dict[str, Any]:
+class PrefixIndex:
+    """
+    Sorted-array prefix index for typeahead.
 
-    # === FAST-PATH: EXACT ENTITY SYNONYM TERM -> DIRECT ENTITY ===
-    # If normalized query exactly matches a *strict* entity_synonyms term (single slug),
-    # resolve immediately to that canonical route (even if alias matching yields multiples).
-    try:
-        _q_norm = normalize_query(query_raw)
-        _syn_map = load_entity_synonyms_strict()  # term_norm -> route
-        _direct_route = _syn_map.get((_q_norm or "").strip().lower())
-        if _direct_route:
-            _kind = "blend" if _direct_route.startswith("blend:") else "peptide"
-            _slug = _direct_route.split(":", 1)[1] if ":" in _direct_route else None
-            return {
-                "version": "v1",
-                "query_raw": query_raw,
-                "query_norm": _q_norm,
-                "intent": "direct_entity",
-                "route": _direct_route,
-                "candidates": [{
-                    "route": _direct_route,
-                    "type": "entity",
-                    "kind": _kind,
-                    "slug": _slug,
-                    "taxonomy_key": None,
-                    "source_term": query_raw,
-                    "source_sources": ["entity_synonyms:exact_strict"]
-                }],
-                "did_you_mean": []
-            }
-    except Exception:
-        pass
+    Terms sharing a prefix are contiguous in sorted order, so a lookup is one
+    bisect to the first match plus a scan of the k hits: O(log n + k).
+    Order matches the old linear scan over sorted(all_terms).
+    """
 
+    def __init__(self, terms) -> None:
+        self.terms: list[str] = sorted(terms)
 
-    if not ROUTES_PATH.exists():
-        die(f"Missing search routes index: {ROUTES_PATH} (run rebuild_all_indexes)")
+    def lookup(self, prefix: str, limit: int | None = None) -> list[str]:
+        terms = self.terms
+        out: list[str] = []
+        i = bisect_left(terms, prefix)
+        n = len(terms)
+        while i < n and terms[i].startswith(prefix):
+            out.append(terms[i])
+            if limit is not None and len(out) >= limit:
+                break
+            i += 1
+        return out
 
-    routes_data = load_json(ROUTES_PATH)
-    term_map = build_term_map(routes_data)
-    all_terms = sorted(term_map.keys())
 
-    qn = normalize_query(query_raw)
-    if not qn:
-        return {
-            "version": "v1",
-            "query_raw": query_raw,
-            "query_norm": qn,
-            "intent": "empty",
-            "route": None,
-            "candidates": [],
-            "did_you_mean": [],
-        }
+def _candidate_dict(c: Candidate) -> dict[str, Any]:
+    # Candidates are cached on the resolver; hand out copies so callers can't mutate them.
+    d = dict(c.__dict__)
+    d["source_sources"] = list(c.source_sources)
+    return d
+
+
+def _dedupe_candidates(cands: list[Candidate]) -> list[Candidate]:
+    uniq = []
+    seen = set()
+    for c in cands:
+        k = (c.route, c.type, c.kind, c.slug, c.taxonomy_key)
+        if k in seen:
+            continue
+        seen.add(k)
+        uniq.append(c)
+    return uniq
+
+
+class QueryResolver:
+    """
+    In-process resolver that loads the routes index + strict synonyms once.
+
+    Keeps the term map, the sorted term list and per-term Candidate lists (memoized on
+    first use) in memory, so each resolve() only pays for normalization + lookups.
+    Loads the compiled routes pack when it matches the JSON, else the JSON itself.
+    Output is identical to the one-shot resolve_query() JSON.
+    """
+
+    def __init__(
+        self,
+        routes_path: Path = ROUTES_PATH,
+        synonyms_path: Path = SYNONYMS_PATH,
+        spelling_mode: str = "compat",
+        pack_path: Path | None = PACK_PATH,
+        fulltext: bool = False,
+    ) -> None:
+        self.routes_path = routes_path
+        self.synonyms_path = synonyms_path
+        # Prefer the compiled routes pack when it matches the JSON (see routes_pack.py);
+        # pass pack_path=None to force JSON.
+        self.pack_path = pack_path
+        self.loaded_from: str | None = None
+        # "compat" reproduces difflib.get_close_matches exactly; "trigram" is faster/approximate.
+        self.spelling_mode = spelling_mode
+        # Opt-in: unrouted queries also get BM25 section-text results (pack loaded on first use).
+        self.fulltext = fulltext
+        self._fulltext_index: FullTextIndex | None = None
+        self._fulltext_loaded = False
+
+        # Strict entity synonyms (fast-path). Failures here must never break resolution.
+        try:
+            if synonyms_path == SYNONYMS_PATH:
+                self.entity_synonyms = load_entity_synonyms_strict()
+            else:
+                self.entity_synonyms = _load_entity_synonyms_strict_from(synonyms_path)
+        except Exception:
+            self.entity_synonyms = {}
+
+        # Routes index is loaded eagerly when present; a missing index only fails on
+        # the first lookup that actually needs it (same as the one-shot resolver).
+        # term -> search_routes_v1 term entry (dict, or lazy PackedTerms when loaded from the pack)
+        self.term_map: Mapping[str, dict] | None = None
+        self.all_terms: list[str] = []
+        self.prefix_index = PrefixIndex([])
+        self._spelling_index: SpellingIndex | None = None
+        self.term_candidates: dict[str, list[Candidate]] = {}
+
+        pack = load_pack(pack_path, routes_path) if pack_path is not None else None
+        if pack is not None:
+            self._load_pack(pack)
+        elif routes_path.exists():
+            self._load_routes(load_json(routes_path))
+
+    def _load_routes(self, routes_data: dict) -> None:
+        self.term_map = build_term_map(routes_data)
+        self.prefix_index = PrefixIndex(self.term_map.keys())
+        self.all_terms = self.prefix_index.terms
+        self.loaded_from = "json"
+
+    def _load_pack(self, pack: dict) -> None:
+        self.term_map = PackedTerms(pack)
+        self.prefix_index = PrefixIndex(pack["terms"])
+        self.all_terms = self.prefix_index.terms
+        self.loaded_from = "pack"
+
+    def candidates(self, term: str) -> list[Candidate]:
+        """Candidates for an exact routes term (memoized; [] for unknown terms)."""
+        c = self.term_candidates.get(term)
+        if c is None:
+            entry = self.term_map.get(term) if self.term_map is not None else None
+            if entry is None:
+                return []
+            c = self.term_candidates[term] = candidates_from_term(entry)
+        return c
+
+    @property
+    def spelling_index(self) -> SpellingIndex:
+        # Built on first misspelled query only; keeps cold start to the routes load.
+        if self._spelling_index is None:
+            self._spelling_index = SpellingIndex(self.all_terms)
+        return self._spelling_index
+
+    def fulltext_results(self, qn: str, limit: int = 10) -> list[dict[str, Any]]:
+        if not self._fulltext_loaded:
+            # Loaded (and checked against content/) once; a missing/stale pack is not retried per query.
+            self._fulltext_index = FullTextIndex.load()
+            self._fulltext_loaded = True
+        if self._fulltext_index is None:
+            return []
+        return self._fulltext_index.search(qn, limit)
+
+    def _require_routes(self) -> Mapping[str, dict]:
+        if self.term_map is None:
+            die(f"Missing search routes index: {self.routes_path} (run rebuild_all_indexes)")
+        return self.term_map
+
+    def resolve_many(self, queries: list[str]) -> list[dict[str, Any]]:
+        return [self.resolve(q) for q in queries]
+
+    def resolve(self, query_raw: str) -> dict[str, Any]:
+
+        # === FAST-PATH: EXACT ENTITY SYNONYM TERM -> DIRECT ENTITY ===
+        # If normalized query exactly matches a *strict* entity_synonyms term (single slug),
+        # resolve immediately to that canonical route (even if alias matching yields multiples).
+        try:
+            _q_norm = normalize_query(query_raw)
+            _direct_route = self.entity_synonyms.get((_q_norm or "").strip().lower())
+            if _direct_route:
+                _kind = "blend" if _direct_route.startswith("blend:") else "peptide"
+                _slug = _direct_route.split(":", 1)[1] if ":" in _direct_route else None
+                return {
+                    "version": "v1",
+                    "query_raw": query_raw,
+                    "query_norm": _q_norm,
+                    "intent": "direct_entity",
+                    "route": _direct_route,
+                    "candidates": [{
+                        "route": _direct_route,
+                        "type": "entity",
+                        "kind": _kind,
+                        "slug": _slug,
+                        "taxonomy_key": None,
+                        "source_term": query_raw,
+                        "source_sources": ["entity_synonyms:exact_strict"]
+                    }],
+                    "did_you_mean": []
+                }
+        except Exception:
+            pass
+
+        term_map = self._require_routes()
+
+        qn = normalize_query(query_raw)
+        if not qn:
+            return {
+                "version": "v1",
+                "query_raw": query_raw,
+                "query_norm": qn,
+                "intent": "empty",
+                "route": None,
+                "candidates": [],
+                "did_you_mean": [],
+            }
 
-    # 1) Exact term match (highest confidence)
-    exact = None
-    for qtry in query_variants(qn):
-        exact = term_map.get(qtry)
+        # 1) Exact term match (highest confidence)
+        exact = None
+        for qtry in query_variants(qn):
+            if qtry in term_map:
+                exact = qtry
+                break
         if exact:
-            break
-    if exact:
-        cands = candidates_from_term(exact)
-        cands = sorted(cands, key=prefer_route_order)
-
-        # De-dupe exact-match candidates (same route may appear multiple times in search_routes_v1)
-        # If duplicates inflate len(cands), we incorrectly fall back to search_results.
-        uniq = []
-        seen = set()
-        for c in cands:
-            k = (c.route, c.type, c.kind, c.slug, c.taxonomy_key)
-            if k in seen:
-                continue
-            seen.add(k)
-            uniq.append(c)
-        cands = uniq
-
-
-        # If one clear candidate, route directly.
-        # If multiple, still return candidates but do not pick a single route.
-        # TOPIC_PRECEDENCE_EXACT_MATCH
-        # If both Topic and Category are candidates for an exact term match,
-        # choose Topic deterministically to represent the concept page.
-        if len(cands) > 1:
-            topic_only = [c for c in cands if c.type == "entity" and c.kind == "topic"]
-            if topic_only:
-                cands = [topic_only[0]]
-
-        if len(cands) == 1:
-            intent = "direct_entity" if cands[0].type == "entity" else "direct_category"
+            cands = sorted(self.candidates(exact), key=prefer_route_order)
+
+            # De-dupe exact-match candidates (same route may appear multiple times in search_routes_v1)
+            # If duplicates inflate len(cands), we incorrectly fall back to search_results.
+            cands = _dedupe_candidates(cands)
+
+            # If one clear candidate, route directly.
+            # If multiple, still return candidates but do not pick a single route.
+            # TOPIC_PRECEDENCE_EXACT_MATCH
+            # If both Topic and Category are candidates for an exact term match,
+            # choose Topic deterministically to represent the concept page.
+            if len(cands) > 1:
+                topic_only = [c for c in cands if c.type == "entity" and c.kind == "topic"]
+                if topic_only:
+                    cands = [topic_only[0]]
+
+            if len(cands) == 1:
+                intent = "direct_entity" if cands[0].type == "entity" else "direct_category"
+                return {
+                    "version": "v1",
+                    "query_raw": query_raw,
+                    "query_norm": qn,
+                    "intent": intent,
+                    "route": cands[0].route,
+                    "candidates": [_candidate_dict(c) for c in cands],
+                    "did_you_mean": [],
+                }
+
+            # If multiple, prefer entity routes for display; UI decides.
             return {
                 "version": "v1",
                 "query_raw": query_raw,
                 "query_norm": qn,
-                "intent": intent,
-                "route": cands[0].route,
-                "candidates": [c.__dict__ for c in cands],
+                "intent": "search_results",
+                "route": None,
+                "candidates": [_candidate_dict(c) for c in cands],
                 "did_you_mean": [],
             }
 
-        # If multiple, prefer entity routes for display; UI decides.
-        return {
-            "version": "v1",
-            "query_raw": query_raw,
-            "query_norm": qn,
-            "intent": "search_results",
-            "route": None,
-            "candidates": [c.__dict__ for c in cands],
-            "did_you_mean": [],
-        }
+        # 2) Token-assisted category detection (e.g., "sleep peptide", "immune support")
+        tokens = [t for t in qn.split(" ") if t]
+        category_hits: list[Candidate] = []
+        for tok in tokens:
+            for c in self.candidates(tok):
+                if c.type == "category":
+                    category_hits.append(c)
+        if category_hits:
+            # De-dupe category hits (prevents duplicated category routes from token overlap)
+            category_hits = sorted(_dedupe_candidates(category_hits), key=prefer_route_order)
+            # Deterministically pick first category hit as primary route
+            primary = category_hits[0]
+            return {
+                "version": "v1",
+                "query_raw": query_raw,
+                "query_norm": qn,
+                "intent": "direct_category",
+                "route": primary.route,
+                "candidates": [_candidate_dict(c) for c in category_hits],
+                "did_you_mean": [],
+            }
 
-    # 2) Token-assisted category detection (e.g., "sleep peptide", "immune support")
-    tokens = [t for t in qn.split(" ") if t]
-    category_hits: list[Candidate] = []
-    for tok in tokens:
-        te = term_map.get(tok)
-        if not te:
-            continue
-        for c in candidates_from_term(te):
-            if c.type == "category":
-                category_hits.append(c)
-    if category_hits:
-        # De-dupe category hits (prevents duplicated category routes from token overlap)
-        uniq = []
+        # 3) Prefix suggestions (typeahead use-case)
+        prefix_hits = self.prefix_index.lookup(qn, limit=15)
+
+        cand_accum: list[Candidate] = []
+        for t in prefix_hits:
+            cand_accum.extend(self.candidates(t))
+
+        # 4) Did-you-mean (spelling) — limited, deterministic
+        dym = self.spelling_index.suggest(qn, n=5, cutoff=0.78, mode=self.spelling_mode)
+
+        cand_accum = sorted(cand_accum, key=prefer_route_order)
+        # Deduplicate by route
         seen = set()
-        for c in category_hits:
-            k = (c.route, c.type, c.kind, c.slug, c.taxonomy_key)
-            if k in seen:
+        unique = []
+        for c in cand_accum:
+            if c.route in seen:
                 continue
-            seen.add(k)
-            uniq.append(c)
-        category_hits = sorted(uniq, key=prefer_route_order)
-        # Deterministically pick first category hit as primary route
-        primary = category_hits[0]
-        return {
+            seen.add(c.route)
+            unique.append(c)
+
+        out = {
             "version": "v1",
             "query_raw": query_raw,
             "query_norm": qn,
-            "intent": "direct_category",
-            "route": primary.route,
-            "candidates": [c.__dict__ for c in category_hits],
-            "did_you_mean": [],
+            "intent": "search_results",
+            "route": None,
+            "candidates": [_candidate_dict(c) for c in unique[:25]],
+            "did_you_mean": dym,
         }
+        if self.fulltext:
+            out["fulltext"] = self.fulltext_results(qn)
+        return out
 
-    # 3) Prefix suggestions (typeahead use-case)
-    prefix_hits = [t for t in all_terms if t.startswith(qn)]
-    prefix_hits = prefix_hits[:15]
 
-    cand_accum: list[Candidate] = []
-    for t in prefix_hits:
-        cand_accum.extend(candidates_from_term(term_map[t]))
+_DEFAULT_RESOLVER: QueryResolver | None = None
 
-    # 4) Did-you-mean (spelling) — limited, deterministic
-    dym = get_close_matches(qn, all_terms, n=5, cutoff=0.78)
 
-    cand_accum = sorted(cand_accum, key=prefer_route_order)
-    # Deduplicate by route
-    seen = set()
-    unique = []
-    for c in cand_accum:
-        if c.route in seen:
-            continue
-        seen.add(c.route)
-        unique.append(c)
+def get_resolver() -> QueryResolver:
+    """Process-wide resolver (lazy). Long-lived callers should reuse this."""
+    global _DEFAULT_RESOLVER
+    if _DEFAULT_RESOLVER is None:
+        _DEFAULT_RESOLVER = QueryResolver()
+    return _DEFAULT_RESOLVER
+
+
+def resolve_query(query_raw: str) -> dict[str, Any]:
+    return get_resolver().resolve(query_raw)
+
 
-    return {
-        "version": "v1",
-        "query_raw": query_raw,
-        "query_norm": qn,
-        "intent": "search_results",
-        "route": None,
-        "candidates": [c.__dict__ for c in unique[:25]],
-        "did_you_mean": dym,
-    }
+def parse_batch_line(line: str) -> str | None:
+    """
+    One batch input line -> raw query.
+    Accepts a JSON string ("pt141") or object ({"query": "pt141"}); blank lines are skipped.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        v = json.loads(line)
+    except Exception:
+        die(f"Batch input must be JSONL (string or {{\"query\": ...}} per line): {line[:200]!r}")
+    if isinstance(v, str):
+        return v
+    if isinstance(v, dict) and isinstance(v.get("query"), str):
+        return v["query"]
+    die(f"Batch input line must be a JSON string or object with 'query': {line[:200]!r}")
+
+
+def run_batch(lines, out, resolver: QueryResolver | None = None) -> int:
+    # Stream: one resolver for the whole set, one compact JSON line per query (input order).
+    resolver = resolver if resolver is not None else get_resolver()
+    for line in lines:
+        q = parse_batch_line(line)
+        if q is None:
+            continue
+        out.write(json.dumps(resolver.resolve(q), ensure_ascii=False) + "\n")
+    out.flush()
+    return 0
 
 
 def main() -> int:
-    if len(sys.argv) < 2:
-        print("Usage: scripts/search/resolve_query.py \"<query>\"")
+    args = sys.argv[1:]
+    fulltext = "--fulltext" in args
+    args = [a for a in args if a != "--fulltext"]
+    if not args:
+        print("Usage: scripts/search/resolve_query.py [--fulltext] \"<query>\"")
+        print("       scripts/search/resolve_query.py [--fulltext] --batch < queries.jsonl")
         return 2
-    query_raw = " ".join(sys.argv[1:])
-    out = resolve_query(query_raw)
+    resolver = QueryResolver(fulltext=True) if fulltext else get_resolver()
+    if args[0] == "--batch":
+        return run_batch(sys.stdin, sys.stdout, resolver)
+    query_raw = " ".join(args)
+    out = resolver.resolve(query_raw)
     print(json.dumps(out, indent=2, ensure_ascii=False))
     return 0
 
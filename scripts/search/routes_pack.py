@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Load-optimized companion artifact for search_routes_v1.json.
+
+Output: content/_index/search_routes_v1.pack
+
+The JSON stays authoritative (UI, web generator, validators all read it). The pack is
+a compact, versioned, columnar copy for Python consumers that care about cold start:
+- terms[]: pre-normalized, sorted (same keys the resolver builds from terms[].term)
+- routes[]: interned route table (type, kind, slug, taxonomy_key, label, route)
+- sources[]: interned source labels
+- term -> route ids / source ids as flat uint32 arrays + offsets
+
+File layout:
+  MAGIC (4 bytes) | format version (u16) | marshal version (u16) | sha256 of JSON source (32 bytes) | marshal payload
+
+The checksum ties the pack to the exact JSON bytes it was compiled from; loaders must
+fall back to the JSON when it does not match (or when the format/marshal version differs).
+
+Usage:
+  python3 scripts/search/routes_pack.py            # compile from content/_index/search_routes_v1.json
+  python3 scripts/search/routes_pack.py --check    # exit 1 if the pack is missing or stale
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import marshal
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.atomic_io import write_bytes_if_changed  # type: ignore
+
+JSON_PATH = ROOT / "content" / "_index" / "search_routes_v1.json"
+PACK_PATH = ROOT / "content" / "_index" / "search_routes_v1.pack"
+
+MAGIC = b"PTSR"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHH32s")
+
+ROUTE_FIELDS = ("type", "kind", "slug", "taxonomy_key", "label", "route")
+
+
+def die(msg: str, code: int = 1) -> None:
+    print(f"ERROR: {msg}", file=sys.stderr)
+    raise SystemExit(code)
+
+
+def _u32(values: list[int]) -> bytes:
+    a = array("I", values)
+    if a.itemsize != 4:
+        a = array("L", values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+
+def _from_u32(b: bytes) -> array:
+    a = array("I")
+    if a.itemsize != 4:
+        a = array("L")
+    a.frombytes(b)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+
+def _str_or_none(v: Any) -> str | None:
+    return v if isinstance(v, str) else None
+
+
+def encode_pack(routes_data: dict, source_bytes: bytes) -> bytes:
+    terms = routes_data.get("terms")
+    if not isinstance(terms, list):
+        die("search_routes_v1.json missing terms[]")
+
+    # Same keying as the resolver's build_term_map(): stripped term, last entry wins.
+    by_term: dict[str, dict] = {}
+    for t in terms:
+        if not isinstance(t, dict):
+            continue
+        term = t.get("term")
+        if not isinstance(term, str) or not term.strip():
+            continue
+        by_term[term.strip()] = t
+
+    route_ids: dict[tuple, int] = {}
+    source_ids: dict[str, int] = {}
+    route_flat: list[int] = []
+    route_offsets: list[int] = [0]
+    source_flat: list[int] = []
+    source_offsets: list[int] = [0]
+    out_terms = sorted(by_term)
+
+    for term in out_terms:
+        entry = by_term[term]
+        routes = entry.get("routes")
+        if isinstance(routes, list):
+            for r in routes:
+                if not isinstance(r, dict):
+                    continue
+                row = tuple(_str_or_none(r.get(k)) for k in ROUTE_FIELDS)
+                route_flat.append(route_ids.setdefault(row, len(route_ids)))
+        route_offsets.append(len(route_flat))
+
+        sources = entry.get("sources")
+        if isinstance(sources, list):
+            for s in sources:
+                if isinstance(s, str):
+                    source_flat.append(source_ids.setdefault(s, len(source_ids)))
+        source_offsets.append(len(source_flat))
+
+    payload = {
+        "version": routes_data.get("version"),
+        "terms": tuple(out_terms),
+        "routes": tuple(route_ids),
+        "sources": tuple(source_ids),
+        "route_offsets": _u32(route_offsets),
+        "route_ids": _u32(route_flat),
+        "source_offsets": _u32(source_offsets),
+        "source_ids": _u32(source_flat),
+    }
+    digest = hashlib.sha256(source_bytes).digest()
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, marshal.version, digest) + marshal.dumps(payload)
+
+
+def decode_pack(blob: bytes, expected_sha256: bytes | None = None) -> dict | None:
+    """Returns the decoded payload, or None when the pack is unusable (caller falls back to JSON)."""
+    if len(blob) < _HEADER.size:
+        return None
+    magic, fmt, mver, digest = _HEADER.unpack_from(blob)
+    if magic != MAGIC or fmt != FORMAT_VERSION or mver != marshal.version:
+        return None
+    if expected_sha256 is not None and digest != expected_sha256:
+        return None
+    try:
+        payload = marshal.loads(blob[_HEADER.size:])
+    except Exception:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    for k in ("route_offsets", "route_ids", "source_offsets", "source_ids"):
+        payload[k] = _from_u32(payload[k])
+    return payload
+
+
+def load_pack(pack_path: Path = PACK_PATH, json_path: Path = JSON_PATH) -> dict | None:
+    """
+    Load the pack if it is present and matches the JSON source.
+    If the JSON is absent (pack-only deploy), the pack is trusted as-is.
+    """
+    if not pack_path.exists():
+        return None
+    expected = hashlib.sha256(json_path.read_bytes()).digest() if json_path.exists() else None
+    return decode_pack(pack_path.read_bytes(), expected)
+
+
+class PackedTerms(Mapping):
+    """
+    Read-only term -> entry mapping over a decoded pack.
+
+    Entries ({"term", "routes", "sources"}, same shape as search_routes_v1 terms[])
+    are materialized on first access; route dicts are shared across terms.
+    """
+
+    def __init__(self, payload: dict) -> None:
+        self.terms: tuple[str, ...] = payload["terms"]
+        self._pos = {t: n for n, t in enumerate(self.terms)}
+        self._payload = payload
+        self._route_dicts: list[dict] | None = None
+        self._entries: dict[str, dict] = {}
+
+    def __getitem__(self, term: str) -> dict:
+        e = self._entries.get(term)
+        if e is not None:
+            return e
+        n = self._pos[term]
+        p = self._payload
+        if self._route_dicts is None:
+            self._route_dicts = [
+                {k: v for k, v in zip(ROUTE_FIELDS, row) if v is not None}
+                for row in p["routes"]
+            ]
+        ro, so = p["route_offsets"], p["source_offsets"]
+        e = {
+            "term": term,
+            "routes": [self._route_dicts[i] for i in p["route_ids"][ro[n]:ro[n + 1]]],
+            "sources": [p["sources"][i] for i in p["source_ids"][so[n]:so[n + 1]]],
+        }
+        self._entries[term] = e
+        return e
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._pos
+
+    def __iter__(self):
+        return iter(self.terms)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+def write_pack(json_path: Path = JSON_PATH, pack_path: Path = PACK_PATH) -> tuple[int, bool]:
+    """(pack size, whether the file was (re)written)."""
+    source_bytes = json_path.read_bytes()
+    try:
+        routes_data = json.loads(source_bytes.decode("utf-8"))
+    except Exception as e:
+        die(f"Failed to parse JSON: {json_path} ({e})")
+    blob = encode_pack(routes_data, source_bytes)
+    changed = write_bytes_if_changed(pack_path, blob)
+    return len(blob), changed
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--check", action="store_true", help="Fail if the pack is missing or does not match the JSON")
+    args = ap.parse_args()
+
+    if not JSON_PATH.exists():
+        die(f"Missing search routes index: {JSON_PATH} (run rebuild_all_indexes)")
+
+    if args.check:
+        if load_pack() is None:
+            die(f"Stale or missing {PACK_PATH} (run scripts/search/routes_pack.py)")
+        print(f"OK: {PACK_PATH} matches {JSON_PATH.name}")
+        return 0
+
+    size, changed = write_pack()
+    print(f"{'Wrote' if changed else 'Unchanged'} {PACK_PATH} ({size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
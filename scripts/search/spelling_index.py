@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Did-you-mean (spelling suggestion) index for the Pep-Talk resolver.
+
+Replaces a full difflib.get_close_matches() scan over every routes term.
+
+Modes:
+- compat (default): byte-for-byte the same result as
+  difflib.get_close_matches(query, terms, n, cutoff), including ordering
+  (score desc, then term desc). Uses exact pruning only:
+    1) length window implied by real_quick_ratio >= cutoff
+    2) prefix filtering over character-occurrence postings: a term whose
+       quick_ratio can reach the cutoff must share at least one of the query's
+       rarest (|q| - T_min + 1) character occurrences (pigeonhole)
+    3) quick_ratio from precomputed character counts
+  Survivors are scored with SequenceMatcher (query set once as seq2, like difflib).
+- trigram: faster approximate mode. Candidates must share a character trigram
+  with the query; scoring/cutoff/ordering are the same as compat. May miss
+  matches for very short or heavily mangled queries.
+
+All ordering is deterministic.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from heapq import nlargest
+from itertools import chain
+
+_EPS = 1e-9
+
+
+def _occurrences(s: str) -> list[tuple[str, int]]:
+    # "banana" -> (b,1) (a,1) (n,1) (a,2) (n,2) (a,3): multiset as set of (char, k)
+    seen: dict[str, int] = defaultdict(int)
+    out = []
+    for ch in s:
+        seen[ch] += 1
+        out.append((ch, seen[ch]))
+    return out
+
+
+def _trigrams(s: str) -> set[str]:
+    p = f"  {s} "
+    return {p[i:i + 3] for i in range(len(p) - 2)}
+
+
+class SpellingIndex:
+    def __init__(self, terms) -> None:
+        self.terms: list[str] = sorted(set(terms))
+        self.lengths: list[int] = [len(t) for t in self.terms]
+
+        # (char, k) -> term ids whose text contains char at least k times
+        self.occ_postings: dict[tuple[str, int], list[int]] = defaultdict(list)
+        # trigram -> term ids
+        self.tri_postings: dict[str, list[int]] = defaultdict(list)
+        for i, t in enumerate(self.terms):
+            for ck in set(_occurrences(t)):
+                self.occ_postings[ck].append(i)
+            for g in _trigrams(t):
+                self.tri_postings[g].append(i)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @staticmethod
+    def _length_window(lb: int, cutoff: float) -> tuple[int, int]:
+        # real_quick_ratio = 2*min(la, lb) / (la + lb) >= cutoff
+        if cutoff <= 0:
+            return 0, 1 << 30
+        lo = math.ceil(cutoff * lb / (2.0 - cutoff) - _EPS)
+        hi = math.floor(lb * (2.0 - cutoff) / cutoff + _EPS)
+        return max(0, lo), hi
+
+    def _compat_candidates(self, q: str, cutoff: float) -> list[int]:
+        lb = len(q)
+        lo, hi = self._length_window(lb, cutoff)
+        lengths = self.lengths
+
+        # Shared character multiset size (the quick_ratio numerator) for every term that
+        # shares anything with the query, counted in C over the occurrence postings.
+        occ = _occurrences(q)
+        inter = Counter(chain.from_iterable(self.occ_postings.get(ck, ()) for ck in occ))
+
+        # Smallest shared-multiset size any in-window term needs for quick_ratio >= cutoff;
+        # when it is 0, terms sharing nothing with the query can still qualify.
+        t_min = math.ceil(cutoff * (lo + lb) / 2.0 - _EPS)
+        ids = range(len(self.terms)) if t_min <= 0 else inter.keys()
+
+        out = []
+        for i in ids:
+            la = lengths[i]
+            if lo <= la <= hi and (la + lb == 0 or 2.0 * inter.get(i, 0) / (la + lb) >= cutoff):
+                out.append(i)
+        return out
+
+    def _trigram_candidates(self, q: str, cutoff: float) -> list[int]:
+        lo, hi = self._length_window(len(q), cutoff)
+        ids: set[int] = set()
+        for g in _trigrams(q):
+            ids.update(self.tri_postings.get(g, ()))
+        lengths = self.lengths
+        return [i for i in ids if lo <= lengths[i] <= hi]
+
+    def suggest(self, word: str, n: int = 3, cutoff: float = 0.6, mode: str = "compat") -> list[str]:
+        if not n > 0:
+            raise ValueError("n must be > 0: %r" % (n,))
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError("cutoff must be in [0.0, 1.0]: %r" % (cutoff,))
+        if mode == "compat":
+            ids = self._compat_candidates(word, cutoff)
+        elif mode == "trigram":
+            ids = self._trigram_candidates(word, cutoff)
+        else:
+            raise ValueError(f"unknown mode: {mode!r}")
+
+        s = SequenceMatcher()
+        s.set_seq2(word)
+        result = []
+        for i in ids:
+            x = self.terms[i]
+            s.set_seq1(x)
+            if s.real_quick_ratio() >= cutoff and s.quick_ratio() >= cutoff and s.ratio() >= cutoff:
+                result.append((s.ratio(), x))
+
+        # Same tie-breaking as difflib.get_close_matches: (score, term) descending.
+        return [x for score, x in nlargest(n, result)]
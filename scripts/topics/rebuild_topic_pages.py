@@ -2,11 +2,16 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
 from datetime import date
 from typing import Any, Dict, List, Tuple
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.atomic_io import write_json_if_changed  # type: ignore
+from scripts.lib.peptide_facts import load_facts  # type: ignore
 
 TOPICS_INDEX = ROOT / "content" / "topics" / "_topics_index.json"
 TOPIC_PAGES_DIR = ROOT / "content" / "topics" / "pages"
@@ -51,8 +56,8 @@ HUMAN_GRADES = {
 def load_json(p: Path) -> Any:
     return json.loads(p.read_text(encoding="utf-8"))
 
-def save_json(p: Path, obj: Any) -> None:
-    p.write_text(json.dumps(obj, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+def save_json(p: Path, obj: Any) -> bool:
+    return write_json_if_changed(p, obj)
 
 def today_iso() -> str:
     return date.today().isoformat()
@@ -95,21 +100,24 @@ def compute_evidence_snapshot(pep: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 def read_peptide_summary(slug: str) -> Dict[str, Any]:
-    p = peptide_path(slug)
-    if not p.exists():
-        raise FileNotFoundError(f"Missing peptide file: {p}")
-    d = load_json(p)
-    pep = d["peptide"]
-
-    canonical_name = pep.get("canonical_name", "")
-    status = pep.get("status", {}) if isinstance(pep.get("status", {}), dict) else {}
-    risk = pep.get("risk", {}) if isinstance(pep.get("risk", {}), dict) else {}
+    facts = load_facts()
+    i = facts.row_of(slug)
+    if i is None:
+        raise FileNotFoundError(f"Missing peptide file: {peptide_path(slug)}")
+    if facts.error[i] is not None:
+        raise ValueError(f"Failed to parse {peptide_path(slug)}: {facts.error[i]}")
+    if not facts.has_peptide[i]:
+        raise KeyError("peptide")
+
+    canonical_name = facts.canonical_name[i] or ""
+    status = facts.status[i] or {}
+    risk = facts.risk[i] or {}
 
     status_category = status.get("category", "unknown")
     risk_score = risk.get("current_score", None)
     developmental_risk = bool(risk.get("developmental_risk", False))
 
-    ev_snap = compute_evidence_snapshot(pep)
+    ev_snap = compute_evidence_snapshot({"evidence": facts.evidence[i], "risk": risk})
 
     return {
         "canonical_name": canonical_name,
@@ -237,7 +245,7 @@ def main() -> int:
 
     TOPIC_PAGES_DIR.mkdir(parents=True, exist_ok=True)
 
-    written = 0
+    written = unchanged = 0
     for t in topics:
         tid = t["topic_id"]
         fname = TOPIC_ID_TO_FILENAME.get(tid)
@@ -246,10 +254,12 @@ def main() -> int:
         out_path = TOPIC_PAGES_DIR / fname
         mapped = by_topic.get(tid, [])
         doc = build_page(t, mapped)
-        save_json(out_path, doc)
-        written += 1
+        if save_json(out_path, doc):
+            written += 1
+        else:
+            unchanged += 1
 
-    print(f"OK: wrote/updated {written} topic page(s) in {TOPIC_PAGES_DIR}")
+    print(f"OK: wrote/updated {written} topic page(s) in {TOPIC_PAGES_DIR} ({unchanged} unchanged)")
     return 0
 
 if __name__ == "__main__":
@@ -1,28 +1,44 @@
 #!/usr/bin/env python3
+"""
+Validate blend JSON documents (blend_json_v1).
+
+Usage:
+  python3 scripts/validate/validate_blend_json.py <path-to-blend.json>
+  python3 scripts/validate/validate_blend_json.py content/blends [--jobs N] [--json out.json|-]
+
+One path: stops at the first problem (exit 1). Several paths / a directory / a glob:
+validates every file in one process and reports per-file pass/fail (exit 1 if any failed).
+"""
+import argparse
 import json
 import sys
 from pathlib import Path
-from typing import NoReturn
+from typing import List, NoReturn, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.multi_validate import expand_targets, report, validate_many  # type: ignore
 
 ALLOWED_EVIDENCE_GRADE = {
   "rct_meta", "rct", "human_interventional", "human_observational",
   "animal", "in_vitro", "mechanistic_only", "regulatory_label"
 }
 
+class ValidationFailed(Exception):
+  pass
+
 def fail(msg: str) -> NoReturn:
-  print(f"VALIDATION FAILED: {msg}", file=sys.stderr)
-  sys.exit(1)
+  raise ValidationFailed(msg)
 
-def main():
-  if len(sys.argv) != 2:
-    print("Usage: python3 scripts/validate/validate_blend_json.py <path-to-blend.json>")
-    sys.exit(2)
+def load_json(path: Path):
+  return json.loads(path.read_text(encoding="utf-8"))
 
-  path = Path(sys.argv[1]).expanduser().resolve()
+def validate_doc(path: Path) -> None:
   if not path.exists():
     fail(f"File not found: {path}")
 
-  data = json.loads(path.read_text(encoding="utf-8"))
+  data = load_json(path)
   if not isinstance(data, dict):
     fail("Root JSON must be an object/dict")
 
@@ -79,7 +95,37 @@ def main():
   if len(overview[0]["evidence_refs"]) == 0:
     fail("blend.sections.overview[0].evidence_refs cannot be empty")
 
-  print("BLEND JSON VALIDATION PASSED")
+def validate_path(path: Path) -> Tuple[Optional[str], List[str]]:
+  """(error or None, warnings) for one file; never exits."""
+  try:
+    validate_doc(path)
+    return None, []
+  except ValidationFailed as e:
+    return str(e), []
+  except Exception as e:  # unparseable JSON / malformed shapes fail that file only
+    return f"{type(e).__name__}: {e}", []
+
+def main(argv: Optional[List[str]] = None) -> int:
+  ap = argparse.ArgumentParser(description="Validate blend JSON (blend_json_v1) files.")
+  ap.add_argument("paths", nargs="+", help="Blend JSON file(s), directories, or globs")
+  ap.add_argument("--jobs", type=int, default=1, help="Worker processes for multi-file runs")
+  ap.add_argument("--json", dest="json_out", help="Write consolidated results JSON to this path ('-' = stdout)")
+  ap.add_argument("--quiet", action="store_true", help="Multi-file mode: only print failures and the summary")
+  args = ap.parse_args(argv)
+
+  if len(args.paths) == 1 and not args.json_out and not Path(args.paths[0]).expanduser().is_dir() \
+      and not any(ch in args.paths[0] for ch in "*?["):
+    path = Path(args.paths[0]).expanduser().resolve()
+    try:
+      validate_doc(path)
+    except ValidationFailed as e:
+      print(f"VALIDATION FAILED: {e}", file=sys.stderr)
+      return 1
+    print("BLEND JSON VALIDATION PASSED")
+    return 0
+
+  results = validate_many(validate_path, expand_targets(args.paths), jobs=args.jobs)
+  return report("validate_blend_json", results, json_out=args.json_out, quiet=args.quiet)
 
 if __name__ == "__main__":
-  main()
+  raise SystemExit(main())
@@ -2,11 +2,16 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, Set
 
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.interaction_canon import InteractionCanonicalizer  # type: ignore
+
 TAX_FP = ROOT / "content" / "_taxonomy" / "interaction_classes_v1.json"
 REV_FP = ROOT / "content" / "_index" / "interactions_to_peptides_v1.json"
 
@@ -15,21 +20,6 @@ def load_json(fp: Path) -> Any:
     return json.loads(fp.read_text(encoding="utf-8"))
 
 
-def canon_slugs(tax: Dict[str, Any]) -> Set[str]:
-    out: Set[str] = set()
-    for bucket in ("drug_classes", "supplement_classes"):
-        items = tax.get(bucket, [])
-        if not isinstance(items, list):
-            continue
-        for it in items:
-            if not isinstance(it, dict):
-                continue
-            slug = it.get("slug")
-            if isinstance(slug, str) and slug.strip():
-                out.add(slug.strip())
-    return out
-
-
 def main() -> int:
     if not TAX_FP.exists():
         raise SystemExit(f"ERROR: missing taxonomy file: {TAX_FP}")
@@ -46,7 +36,7 @@ def main() -> int:
     if not isinstance(mapping, dict):
         raise SystemExit("ERROR: reverse index missing/invalid mapping")
 
-    canon = canon_slugs(tax)
+    canon = InteractionCanonicalizer(tax).slugs
     if not canon:
         raise SystemExit("ERROR: taxonomy has zero canonical slugs (unexpected)")
 
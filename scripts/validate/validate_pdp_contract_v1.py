@@ -18,16 +18,21 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import Any, Iterable
-
-import re
+from typing import Any
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.json_rules import Rule, RuleEngine, key_is  # type: ignore
+from scripts.lib.phrase_matcher import PhraseMatcher  # type: ignore
+from scripts.lib.source_scan import open_cache, scan_tree  # type: ignore
+
 PEPTIDES_DIR = ROOT / "content" / "peptides"
 BLENDS_DIR = ROOT / "content" / "blends"
 WEB_DIR = ROOT / "app" / "web"
 
 IGNORE_DIRS = {".next", "node_modules"}
+WEB_SUFFIXES = (".ts", ".tsx", ".js", ".jsx", ".md", ".mdx")
 
 FAIL = False
 
@@ -55,30 +60,26 @@ BANNED_PHRASES = [
     "mechanistic_only",  # evidence-grade leakage into user-facing copy is not allowed
 ]
 
-# Allowed internal enum string when used ONLY as a structured JSON value for evidence_grade.
-ALLOW_MECHANISTIC_ONLY_EVIDENCE_GRADE_RE = re.compile(r'\"evidence_grade\"\s*:\s*\"mechanistic_only\"')
+# Each rule set is compiled once; every string is scanned in one pass per set.
+LEAK_MATCHER = PhraseMatcher(LEAK_MARKERS)
+
+# Content rules, checked in one traversal of each parsed document.
+CONTENT_RULES = RuleEngine([
+    Rule("placeholder", PhraseMatcher(PLACEHOLDER_TOKENS)),
+    Rule(
+        "banned",
+        PhraseMatcher(BANNED_PHRASES),
+        # Allowed internal enum string when used ONLY as a structured JSON value for
+        # evidence_grade; UI must map this to friendly labels.
+        allow={"mechanistic_only": key_is("evidence_grade", "mechanistic_only")},
+    ),
+])
 
 def die(msg: str) -> None:
     global FAIL
     FAIL = True
     print(f"FAIL: {msg}")
 
-def iter_json_strings(x: Any, path: str = "$") -> Iterable[tuple[str, str]]:
-    """Yield (json_path, string_value) for any string in nested JSON structures."""
-    if isinstance(x, str):
-        yield (path, x)
-        return
-    if isinstance(x, dict):
-        for k, v in x.items():
-            kp = f"{path}.{k}"
-            yield from iter_json_strings(v, kp)
-        return
-    if isinstance(x, list):
-        for i, v in enumerate(x):
-            kp = f"{path}[{i}]"
-            yield from iter_json_strings(v, kp)
-        return
-
 def load_json(p: Path) -> Any:
     import json
     try:
@@ -87,6 +88,16 @@ def load_json(p: Path) -> Any:
         die(f"Could not parse JSON: {p} ({e})")
         return None
 
+def content_rule_errors(data: Any, label: str, p: Path) -> list[str]:
+    """Contract violations in one parsed document (also used to check patches before writing)."""
+    out = []
+    for f in CONTENT_RULES.check(data):
+        if f.code == "placeholder":
+            out.append(f"{label} placeholder token '{f.pattern}' found in {p} at {f.leaf.path}")
+        else:
+            out.append(f"{label} banned phrase '{f.pattern}' found in {p} at {f.leaf.path}")
+    return out
+
 def scan_content_json_files(files: list[Path], label: str) -> None:
     for p in files:
         if p.name.startswith("_"):
@@ -94,40 +105,24 @@ def scan_content_json_files(files: list[Path], label: str) -> None:
         data = load_json(p)
         if data is None:
             continue
-        for jp, s in iter_json_strings(data):
-            s_l = s.lower()
-
-            for tok in PLACEHOLDER_TOKENS:
-                if tok.lower() in s_l:
-                    die(f"{label} placeholder token '{tok}' found in {p} at {jp}")
-
-            for phrase in BANNED_PHRASES:
-                if phrase.lower() in s_l:
-                    # Allow internal enum in structured data; UI must map this to friendly labels.
-                    if phrase == "mechanistic_only":
-                        if jp.endswith(".evidence_grade") and ALLOW_MECHANISTIC_ONLY_EVIDENCE_GRADE_RE.search(p.read_text(encoding="utf-8", errors="replace")):
-                            continue
-                    die(f"{label} banned phrase '{phrase}' found in {p} at {jp}")
-
-def scan_web_for_leaks() -> None:
+        for msg in content_rule_errors(data, label, p):
+            die(msg)
+
+def scan_web_for_leaks() -> tuple[int, int]:
+    """
+    Scan typical source + templates under app/web. Ignored dirs are pruned during the walk,
+    and files unchanged since the last run are answered from scripts/_cache/.
+    Returns (files, files read this run).
+    """
     if not WEB_DIR.exists():
-        return
-    for p in WEB_DIR.rglob("*"):
-        if any(part in IGNORE_DIRS for part in p.parts):
-            continue
-        if not p.is_file():
-            continue
-        # Only scan typical source + templates
-        if p.suffix.lower() not in {".ts", ".tsx", ".js", ".jsx", ".md", ".mdx"}:
-            continue
-        try:
-            txt = p.read_text(encoding="utf-8", errors="replace")
-        except Exception:
-            continue
-        t_l = txt.lower()
-        for m in LEAK_MARKERS:
-            if m.lower() in t_l:
-                die(f"UI leak marker '{m}' found in {p}")
+        return 0, 0
+    cache = open_cache("web_leak_scan", LEAK_MATCHER.patterns)
+    files = 0
+    for p, found in scan_tree(WEB_DIR, WEB_SUFFIXES, IGNORE_DIRS, LEAK_MATCHER, cache):
+        files += 1
+        for m in found:
+            die(f"UI leak marker '{m}' found in {p}")
+    return files, cache.read if cache is not None else files
 
 def main() -> int:
     pep_files = sorted([
@@ -149,7 +144,7 @@ def main() -> int:
     if blend_files:
         scan_content_json_files(blend_files, "blend")
 
-    scan_web_for_leaks()
+    web_files, web_read = scan_web_for_leaks()
 
     if FAIL:
         return 1
@@ -157,6 +152,7 @@ def main() -> int:
     print("PDP CONTRACT VALIDATION PASSED")
     print(f"Peptides scanned: {len(pep_files)}")
     print(f"Blends scanned: {len(blend_files)}")
+    print(f"Web sources scanned: {web_files} ({web_read} read, {web_files - web_read} unchanged)")
     return 0
 
 if __name__ == "__main__":
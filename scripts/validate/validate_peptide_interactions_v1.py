@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 import json
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.interaction_canon import iter_tokens, load_canonicalizer  # type: ignore
+
 ENTITIES_FP = ROOT / "content" / "_index" / "entities_v1.json"
 PEPTIDES_DIR = ROOT / "content" / "peptides"
 
@@ -32,6 +37,7 @@ def is_token_ok(x: Any) -> bool:
 
 def main() -> int:
     ents = governed_peptide_entities()
+    canon = load_canonicalizer()
     checked = 0
     with_any = 0
     errors = []
@@ -72,10 +78,17 @@ def main() -> int:
             for item in val:
                 if not is_token_ok(item):
                     errors.append(f"Bad token in interactions.{key}: {fp} -> {repr(item)}")
+            if key != "peptides":
+                # Class tokens outside the taxonomy are left out of interactions_to_peptides_v1; report them.
+                for token in iter_tokens(val):
+                    canon.resolve(token, key)
 
         if (isinstance(dc, list) and len(dc) > 0) or (isinstance(sc, list) and len(sc) > 0) or (isinstance(pc, list) and len(pc) > 0):
             with_any += 1
 
+    for line in canon.report():
+        print(f"WARN: {line}")
+
     if errors:
         print("PEPTIDE INTERACTIONS VALIDATION FAILED")
         for e in errors[:200]:
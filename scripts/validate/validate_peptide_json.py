@@ -1,9 +1,30 @@
 #!/usr/bin/env python3
+"""
+Validate peptide JSON documents (pdp_json_v1).
+
+Usage:
+  python3 scripts/validate/validate_peptide_json.py <path-to-peptide.json>
+  python3 scripts/validate/validate_peptide_json.py content/peptides [--jobs N] [--json out.json|-]
+  python3 scripts/validate/validate_peptide_json.py content/peptides --changed-claims [CLAIMS_INDEX]
+
+One path: stops at the first problem (exit 1). Several paths / a directory / a glob:
+validates every file in one process and reports per-file pass/fail (exit 1 if any failed).
+--changed-claims keeps only the peptides with a claim changed since the committed claim
+index (scripts/lib/claims.py), e.g. for a pre-commit check of one curation batch.
+"""
+import argparse
 import json
 import sys
 from pathlib import Path
 
-from typing import NoReturn, Any, Dict
+from typing import NoReturn, Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.lib.claims import changed_slugs  # type: ignore
+from scripts.lib.multi_validate import expand_targets, report, validate_many  # type: ignore
+
 ALLOWED_STATUS = {"approved_human", "investigational_human", "preclinical", "theoretical_unmanufactured"}
 ALLOWED_CONFIDENCE = {"high", "moderate", "low", "hypothesis", "unknown"}
 ALLOWED_EVIDENCE_GRADE = {
@@ -23,11 +44,19 @@ REQUIRED_PEPTIDE = ["canonical_name", "status", "risk", "sections", "evidence"]
 REQUIRED_STATUS_FIELDS = ["category", "human_use_note"]
 REQUIRED_RISK_FIELDS = ["current_score", "severity", "likelihood", "evidence_grade", "rationale", "unknowns_penalty", "developmental_risk"]
 
+class ValidationFailed(Exception):
+    pass
+
+# Set by validate_path(): warnings are collected per file instead of printed.
+_WARNINGS: Optional[List[str]] = None
+
 def fail(msg: str) -> NoReturn:
-    print(f"VALIDATION FAILED: {msg}", file=sys.stderr)
-    sys.exit(1)
+    raise ValidationFailed(msg)
 
 def warn(msg: str) -> None:
+    if _WARNINGS is not None:
+        _WARNINGS.append(msg)
+        return
     print(f"WARNING: {msg}", file=sys.stderr)
 
 def load_json(path: Path) -> dict:
@@ -57,17 +86,14 @@ def validate_claim(claim, ctx):
     if not isinstance(claim["evidence_refs"], list):
         fail(f"evidence_refs must be a list in {ctx}")
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 scripts/validate/validate_peptide_json.py <path-to-peptide.json>")
-        sys.exit(2)
-
-    path = Path(sys.argv[1]).expanduser().resolve()
+def validate_doc(path: Path) -> None:
     if not path.exists():
         fail(f"File not found: {path}")
 
-    data = load_json(path)
+    validate_data(load_json(path))
 
+def validate_data(data: dict) -> None:
+    """Validate an already-parsed peptide document (raises ValidationFailed)."""
     require_keys(data, REQUIRED_TOP, "root")
     if data["schema_version"] != "pdp_json_v1":
         fail(f"schema_version must be 'pdp_json_v1' (found '{data['schema_version']}')")
@@ -154,7 +180,57 @@ def main():
                 fail(f"Duplicate evidence id '{e['id']}'")
             ids.add(e["id"])
 
-    print("VALIDATION PASSED")
+def validate_path(path: Path) -> Tuple[Optional[str], List[str]]:
+    """(error or None, warnings) for one file; never exits."""
+    return _collect(validate_doc, path)
+
+def check_data(data: dict) -> Tuple[Optional[str], List[str]]:
+    """(error or None, warnings) for an in-memory document (e.g. a patch not yet written); never exits."""
+    return _collect(validate_data, data)
+
+def _collect(fn, arg) -> Tuple[Optional[str], List[str]]:
+    global _WARNINGS
+    _WARNINGS = []
+    try:
+        fn(arg)
+        return None, _WARNINGS
+    except ValidationFailed as e:
+        return str(e), _WARNINGS
+    except Exception as e:  # malformed shapes (e.g. a non-dict section) fail that file only
+        return f"{type(e).__name__}: {e}", _WARNINGS
+    finally:
+        _WARNINGS = None
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Validate peptide JSON (pdp_json_v1) files.")
+    ap.add_argument("paths", nargs="+", help="Peptide JSON file(s), directories, or globs")
+    ap.add_argument("--jobs", type=int, default=1, help="Worker processes for multi-file runs")
+    ap.add_argument("--json", dest="json_out", help="Write consolidated results JSON to this path ('-' = stdout)")
+    ap.add_argument("--quiet", action="store_true", help="Multi-file mode: only print failures and the summary")
+    ap.add_argument("--changed-claims", nargs="?", const="", metavar="CLAIMS_INDEX",
+                    help="Only peptides with claims changed since a claim index (default: the committed one)")
+    args = ap.parse_args(argv)
+
+    if args.changed_claims is not None:
+        slugs = set(changed_slugs(Path(args.changed_claims) if args.changed_claims else None))
+        targets = [p for p in expand_targets(args.paths) if p.stem in slugs]
+        print(f"Changed-claim peptides: {len(targets)}")
+        return report("validate_peptide_json", validate_many(validate_path, targets, jobs=args.jobs),
+                      json_out=args.json_out, quiet=args.quiet)
+
+    if len(args.paths) == 1 and not args.json_out and not Path(args.paths[0]).expanduser().is_dir() \
+            and not any(ch in args.paths[0] for ch in "*?["):
+        path = Path(args.paths[0]).expanduser().resolve()
+        try:
+            validate_doc(path)
+        except ValidationFailed as e:
+            print(f"VALIDATION FAILED: {e}", file=sys.stderr)
+            return 1
+        print("VALIDATION PASSED")
+        return 0
+
+    results = validate_many(validate_path, expand_targets(args.paths), jobs=args.jobs)
+    return report("validate_peptide_json", results, json_out=args.json_out, quiet=args.quiet)
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
 PEPTIDES_DIR = ROOT / "content" / "peptides"
 
+from scripts.lib.claims import changed_slugs  # type: ignore
+
 MAX_BULLETS = 8   # keep it tight
 MAX_CHARS = 180   # per bullet
 
@@ -36,50 +41,63 @@ def check_list(name: str, arr):
         if PHARMA.search(t):
             fail(f"{name}[{i}] contains pharma boilerplate: '{t}'")
 
+def validate_practical(fp: Path, doc) -> None:
+    """Checks one parsed peptide document; fp is only used in messages."""
+    if not isinstance(doc, dict):
+        fail(f"{fp}: not a JSON object")
+
+    pr = doc.get("practical")
+    if not isinstance(pr, dict):
+        fail(f"{fp}: missing practical object")
+
+    if pr.get("schema_version") != "practical_block_v1":
+        fail(f"{fp}: practical.schema_version must be practical_block_v1")
+
+    benefits = pr.get("benefits", [])
+    common = pr.get("side_effects_common", [])
+    serious = pr.get("side_effects_serious", [])
+    cautious = pr.get("who_should_be_cautious", [])
+    bottom = pr.get("bottom_line", "")
+
+    # enforce types + caps + wording
+    check_list(f"{fp.name}:practical.benefits", benefits)
+    check_list(f"{fp.name}:practical.side_effects_common", common)
+    check_list(f"{fp.name}:practical.side_effects_serious", serious)
+    check_list(f"{fp.name}:practical.who_should_be_cautious", cautious)
+
+    if not isinstance(bottom, str) or not bottom.strip():
+        fail(f"{fp}: practical.bottom_line must be a non-empty string")
+
+    b = bottom.strip()
+    if len(b) > 420:
+        fail(f"{fp}: bottom_line too long (>420 chars)")
+    if WEASEL.search(b):
+        fail(f"{fp}: bottom_line contains weasel wording")
+    if PHARMA.search(b):
+        fail(f"{fp}: bottom_line contains pharma boilerplate")
+
+    # If everything is empty, bottom_line must clearly indicate curation pending
+    if (len(benefits) + len(common) + len(serious) + len(cautious)) == 0:
+        if not CURATION_OK.search(b):
+            fail(f"{fp}: empty practical lists require bottom_line to indicate curation pending")
+
 def main() -> int:
+    ap = argparse.ArgumentParser(description="Validate practical_block_v1 in every peptide JSON.")
+    ap.add_argument("--changed-claims", nargs="?", const="", metavar="CLAIMS_INDEX",
+                    help="Only peptides with claims changed since a claim index (default: the committed one)")
+    args = ap.parse_args()
+    only = None
+    if args.changed_claims is not None:
+        only = set(changed_slugs(Path(args.changed_claims) if args.changed_claims else None))
+
     scanned = 0
     for fp in sorted(PEPTIDES_DIR.glob("*.json")):
         if fp.name.startswith("_"):
             continue
+        if only is not None and fp.stem not in only:
+            continue
         scanned += 1
-        doc = json.loads(fp.read_text("utf-8"))
-        if not isinstance(doc, dict):
-            fail(f"{fp}: not a JSON object")
-
-        pr = doc.get("practical")
-        if not isinstance(pr, dict):
-            fail(f"{fp}: missing practical object")
-
-        if pr.get("schema_version") != "practical_block_v1":
-            fail(f"{fp}: practical.schema_version must be practical_block_v1")
-
-        benefits = pr.get("benefits", [])
-        common = pr.get("side_effects_common", [])
-        serious = pr.get("side_effects_serious", [])
-        cautious = pr.get("who_should_be_cautious", [])
-        bottom = pr.get("bottom_line", "")
-
-        # enforce types + caps + wording
-        check_list(f"{fp.name}:practical.benefits", benefits)
-        check_list(f"{fp.name}:practical.side_effects_common", common)
-        check_list(f"{fp.name}:practical.side_effects_serious", serious)
-        check_list(f"{fp.name}:practical.who_should_be_cautious", cautious)
-
-        if not isinstance(bottom, str) or not bottom.strip():
-            fail(f"{fp}: practical.bottom_line must be a non-empty string")
-
-        b = bottom.strip()
-        if len(b) > 420:
-            fail(f"{fp}: bottom_line too long (>420 chars)")
-        if WEASEL.search(b):
-            fail(f"{fp}: bottom_line contains weasel wording")
-        if PHARMA.search(b):
-            fail(f"{fp}: bottom_line contains pharma boilerplate")
-
-        # If everything is empty, bottom_line must clearly indicate curation pending
-        if (len(benefits) + len(common) + len(serious) + len(cautious)) == 0:
-            if not CURATION_OK.search(b):
-                fail(f"{fp}: empty practical lists require bottom_line to indicate curation pending")
+        validate_practical(fp, json.loads(fp.read_text("utf-8")))
 
     print("VALIDATION PASSED")
     print(f"Peptides scanned: {scanned}")